@@ -4,22 +4,41 @@ import argparse
 import json
 import logging
 import os.path
+import pathlib
 import sys
-from typing import IO, AnyStr, Callable, assert_never
+import time
+import types
+from typing import IO, AnyStr, Callable, TextIO
 
+import concat.bytecode_cache
 import concat.execute
 import concat.lex
+import concat.optimize
+import concat.parse
 import concat.parser_combinators
 import concat.stdlib.repl
 import concat.typecheck
 from concat.error_reporting import (
-    create_indentation_error_message,
-    create_lexical_error_message,
     create_parsing_failure_message,
-    get_line_at,
+    print_parse_error,
+    print_static_analysis_error,
+    tokenize_printing_errors,
 )
 from concat.logging.json import JSONFormatter
-from concat.transpile import parse, transpile_ast, typecheck
+from concat.transpile import (
+    parse,
+    transpile_ast,
+    typecheck,
+    write_ast_dump,
+    write_python_source,
+)
+from concat.typecheck.incremental import IncrementalTypeChecker
+from concat.typecheck.result_cache import (
+    TypeCheckResultCache,
+    default_cache_dir,
+)
+from concat.typecheck.statistics import TypeCheckStatistics
+from concat.typecheck.stubs import StubIndex, StubResolver
 
 _log_handler = logging.StreamHandler(sys.stderr)
 _log_handler.setFormatter(JSONFormatter())
@@ -41,7 +60,13 @@ def file_type(mode: str) -> Callable[[str], IO[AnyStr]]:
     return func
 
 
-arg_parser = argparse.ArgumentParser(description='Run a Concat program.')
+arg_parser = argparse.ArgumentParser(
+    description='Run a Concat program.',
+    epilog=(
+        'To compile a program to a standalone Python module instead, see '
+        '`python -m concat compile --help`.'
+    ),
+)
 arg_parser.add_argument(
     'file',
     nargs='?',
@@ -70,67 +95,208 @@ arg_parser.add_argument(
         'array'
     ),
 )
+arg_parser.add_argument(
+    '--typecheck-workers',
+    type=int,
+    default=1,
+    metavar='N',
+    help=(
+        'check the function bodies of large programs in N processes '
+        '(default: 1)'
+    ),
+)
+arg_parser.add_argument(
+    '--stub-index',
+    type=pathlib.Path,
+    metavar='PATH',
+    help=(
+        'find the type stubs of imported modules using an index built with '
+        '`python -m concat.typecheck.build_stub_index`'
+    ),
+)
+arg_parser.add_argument(
+    '--typecheck-stats',
+    action='store_true',
+    default=False,
+    help=(
+        'print statistics about type checking the program as JSON to stderr; '
+        'work done in other processes (see --typecheck-workers) is not '
+        'included'
+    ),
+)
+arg_parser.add_argument(
+    '--no-cache',
+    action='store_true',
+    default=False,
+    help=(
+        'type check and compile the program even if it was checked and '
+        "compiled before with the same source and stubs, and don't "
+        'remember the result'
+    ),
+)
+arg_parser.add_argument(
+    '-O',
+    dest='optimize',
+    action='count',
+    default=0,
+    help=(
+        'optimize the generated Python code (see concat.optimize); give '
+        'twice to also compile function bodies to straight-line code and '
+        'constant quotations to functions'
+    ),
+)
+arg_parser.add_argument(
+    '--emit-python',
+    metavar='PATH',
+    help='write the Python equivalent of the transpiled program to PATH',
+)
+arg_parser.add_argument(
+    '--dump-ast',
+    metavar='PATH',
+    help='write a dump of the Python AST of the transpiled program to PATH',
+)
+arg_parser.add_argument(
+    '--watch',
+    action='store_true',
+    default=False,
+    help=(
+        'type check the given file again whenever it changes, without '
+        'running it'
+    ),
+)
 
 
-def tokenize_printing_errors() -> list[concat.lex.Token]:
-    token_results = concat.lex.tokenize(args.file.read())
-    tokens = list[concat.lex.Token]()
-    for r in token_results:
-        if r.type == 'token':
-            tokens.append(r.token)
-        elif r.type == 'indent-err':
-            position = (r.err.lineno or 1, r.err.offset or 0)
-            message = r.err.msg
-            print('Indentation error:')
-            print(
-                create_indentation_error_message(args.file, position, message)
-            )
-        elif r.type == 'token-err':
-            position = r.location
-            message = str(r.err)
-            print('Lexical error:')
-            print(create_lexical_error_message(args.file, position, message))
-        else:
-            assert_never(r)
-    return tokens
+def print_typecheck_statistics(statistics: TypeCheckStatistics) -> None:
+    json.dump(statistics.to_json(), sys.stderr, indent=2)
+    print(file=sys.stderr)
+
+
+def print_skipped_typecheck_note() -> None:
+    if args.typecheck_stats:
+        print(
+            'Type checking was skipped because the program type checked '
+            'before; pass --no-cache to check it again.',
+            file=sys.stderr,
+        )
+
+
+def check_types(
+    concat_ast: concat.parse.TopLevelNode,
+    code: str,
+    source_dir: str,
+    stub_index: StubIndex | None,
+) -> None:
+    result_cache = None
+    if not args.no_cache:
+        result_cache = TypeCheckResultCache(default_cache_dir())
+        if result_cache.is_checked(
+            code, pathlib.Path(source_dir), StubResolver(stub_index)
+        ):
+            print_skipped_typecheck_note()
+            return
+    statistics = TypeCheckStatistics() if args.typecheck_stats else None
+    try:
+        context = typecheck(
+            concat_ast,
+            source_dir,
+            workers=args.typecheck_workers,
+            statistics=statistics,
+            stub_index=stub_index,
+        )
+    finally:
+        if statistics is not None:
+            print_typecheck_statistics(statistics)
+    # Stubs read by worker processes aren't known here.
+    if result_cache is not None and args.typecheck_workers == 1:
+        result_cache.record(code, pathlib.Path(source_dir), context)
+
+
+def should_cache_program() -> bool:
+    # Debugging output needs the Python AST, so the program is compiled from
+    # scratch when it's asked for.
+    return not (
+        args.no_cache
+        or filename == '<stdin>'
+        or args.emit_python is not None
+        or args.dump_ast is not None
+    )
+
+
+def load_cached_program(
+    code: str, source_dir: str, stub_index: StubIndex | None
+) -> types.CodeType | None:
+    if not should_cache_program():
+        return None
+    program = concat.bytecode_cache.load(
+        pathlib.Path(filename), code, args.optimize
+    )
+    if program is None:
+        return None
+    # The stubs the program was checked against might have changed.
+    if not TypeCheckResultCache(default_cache_dir()).is_checked(
+        code, pathlib.Path(source_dir), StubResolver(stub_index)
+    ):
+        return None
+    print_skipped_typecheck_note()
+    return program
+
+
+def compile_program(
+    tokens: list[concat.lex.Token],
+    code: str,
+    source_dir: str,
+    stub_index: StubIndex | None,
+) -> tuple[types.CodeType, bool]:
+    """Compile the program, printing the parsing failures recovered from.
+
+    Returns the code and whether there were any such failures."""
+    concat_ast = parse(tokens)
+    recovered_parsing_failures = list(concat_ast.parsing_failures)
+    for failure in recovered_parsing_failures:
+        print('Parse Error:')
+        print(create_parsing_failure_message(args.file, tokens, failure))
+    has_parsing_failures = bool(recovered_parsing_failures)
+    check_types(concat_ast, code, source_dir, stub_index)
+    python_ast = transpile_ast(concat_ast)
+    if args.optimize:
+        python_ast = concat.optimize.optimize(
+            python_ast,
+            straight_line=args.optimize >= 2,
+            compile_quotations=args.optimize >= 2,
+        )
+    if args.emit_python is not None:
+        write_python_source(python_ast, args.emit_python)
+    if args.dump_ast is not None:
+        write_ast_dump(python_ast, args.dump_ast)
+    program = concat.execute.compile_module(filename, python_ast)
+    if should_cache_program() and not has_parsing_failures:
+        concat.bytecode_cache.store(
+            pathlib.Path(filename), code, program, args.optimize
+        )
+    return program, has_parsing_failures
 
 
 def batch_main():
     try:
-        tokens = tokenize_printing_errors()
-        concat_ast = parse(tokens)
-        recovered_parsing_failures = concat_ast.parsing_failures
-        for failure in recovered_parsing_failures:
-            print('Parse Error:')
-            print(create_parsing_failure_message(args.file, tokens, failure))
+        code = args.file.read()
         source_dir = os.path.dirname(filename)
-        typecheck(concat_ast, source_dir)
-        python_ast = transpile_ast(concat_ast)
+        stub_index = None
+        if args.stub_index is not None:
+            stub_index = StubIndex.load(args.stub_index)
+        has_parsing_failures = False
+        program = load_cached_program(code, source_dir, stub_index)
+        if program is None:
+            tokens, _ = tokenize_printing_errors(args.file, code)
+            program, has_parsing_failures = compile_program(
+                tokens, code, source_dir, stub_index
+            )
     except concat.typecheck.StaticAnalysisError as e:
-        if e.path is None:
-            in_path = ''
-        else:
-            in_path = ' in file ' + str(e.path)
-        print(f'Static Analysis Error{in_path}:\n')
-        print(e, end='')
-        if e.location:
-            print(' in line:')
-            if e.path is not None:
-                with e.path.open() as f:
-                    print(get_line_at(f, e.location), end='')
-            else:
-                print(get_line_at(args.file, e.location), end='')
-            print(' ' * e.location[1] + '^')
+        print_static_analysis_error(e, args.file)
         if args.verbose:
             print('error repr:', repr(e))
             raise
     except concat.parser_combinators.ParseError as e:
-        print('Parse Error:')
-        print(
-            create_parsing_failure_message(
-                args.file, tokens, e.args[0].failures
-            )
-        )
+        print_parse_error(e, args.file, tokens)
     except Exception:
         print('An internal error has occurred.')
         print('This is a bug in Concat.')
@@ -138,28 +304,73 @@ def batch_main():
     else:
         concat.execute.execute(
             filename,
-            python_ast,
+            program,
             {},
             should_log_stacks=args.debug,
             import_resolution_start_directory=source_dir,
         )
-        if list(concat_ast.parsing_failures):
+        if has_parsing_failures:
             sys.exit(1)
     finally:
         args.file.close()
 
 
+_watch_poll_interval = 0.5
+
+
+def watch_main() -> None:
+    args.file.close()
+    type_checker = IncrementalTypeChecker()
+    source_dir = os.path.dirname(filename)
+    last_modified_time = None
+    while True:
+        modified_time = os.stat(filename).st_mtime_ns
+        if modified_time != last_modified_time:
+            last_modified_time = modified_time
+            with open(filename) as file:
+                watch_check(type_checker, file, source_dir)
+        time.sleep(_watch_poll_interval)
+
+
+def watch_check(
+    type_checker: IncrementalTypeChecker, file: TextIO, source_dir: str
+) -> None:
+    code = file.read()
+    tokens, _ = tokenize_printing_errors(file, code)
+    try:
+        concat_ast = parse(tokens)
+        concat_ast.assert_no_parse_errors()
+        type_checker.check(code, concat_ast, source_dir)
+    except concat.typecheck.StaticAnalysisError as e:
+        print_static_analysis_error(e, file)
+    except concat.parser_combinators.ParseError as e:
+        print_parse_error(e, file, tokens)
+    else:
+        print(
+            'No type errors. Checked:',
+            ', '.join(type_checker.rechecked_definitions) or 'nothing new',
+        )
+    sys.stdout.flush()
+
+
 def main():
     if args.verbose:
         _logger.setLevel(logging.DEBUG)
 
+    if args.watch:
+        watch_main()
     # interactive mode
-    if args.file.isatty():
+    elif args.file.isatty():
         concat.stdlib.repl.repl([], [], args.debug)
     else:
         batch_main()
 
 
+if sys.argv[1:2] == ['compile']:
+    import concat.standalone
+
+    sys.exit(concat.standalone.main(sys.argv[2:]))
+
 # We should pass any unknown args onto the program we're about to run.
 # FIXME: There might be a better way to go about this, but I think this is fine
 # for now.
@@ -52,7 +52,7 @@ def to_transpiled_quotation(
     location = list(words)[0].location if words else default_location
     end_location = list(words)[-1].end_location if words else default_location
     quote = concat.parse.QuoteWordNode(list(words), location, end_location)
-    py_quote = visitors['quote-word'].visit(quote)
+    py_quote = visitors.ref_visitor('quote-word').visit(quote)
     return cast(ast.expr, py_quote)
 
 
@@ -71,11 +71,8 @@ def copy_location(py_node: ast.AST, node: concat.parse.Node) -> None:
 def to_python_decorator(
     word: 'concat.parse.WordNode', visitors: _TranspilerDict
 ) -> ast.Lambda:
-    push_func = cast(
-        ast.Expression, ast.parse('stack.append(func)', mode='eval')
-    ).body
-    clear_locations(push_func)
-    py_word = cast(ast.expr, visitors['word'].visit(word))
+    push_func = append_to_stack(ast.Name(id='func', ctx=ast.Load()))
+    py_word = cast(ast.expr, visitors.ref_visitor('word').visit(word))
     body = pack_expressions([push_func, py_word, pop_stack()])
     func_arg = ast.arg('func', None)
     arguments = ast.arguments(
@@ -118,11 +115,15 @@ def statementfy(node: Union[ast.expr, ast.stmt]) -> ast.stmt:
 
 
 def parse_py_qualified_name(name: str) -> Union[ast.Name, ast.Attribute]:
-    py_node = cast(
-        Union[ast.Name, ast.Attribute],
-        cast(ast.Expression, ast.parse(name, mode='eval')).body,
-    )
-    clear_locations(py_node)
+    """Build the expression for a dotted name, without locations.
+
+    This is done directly instead of through ast.parse because the transpiler
+    does it for every quotation and import."""
+    first, *attributes = name.strip().split('.')
+    py_node: Union[ast.Name, ast.Attribute]
+    py_node = ast.Name(id=first, ctx=ast.Load())
+    for attribute in attributes:
+        py_node = ast.Attribute(value=py_node, attr=attribute, ctx=ast.Load())
     return py_node
 
 
@@ -176,12 +177,15 @@ def assign_self_pushing_module_type_to_all_components(
     for i in range(1, len(components) + 1):
         target = '.'.join(components[:i])
         assert target
-        assignment = '{}.__class__ = concat.stdlib.importlib.Module'.format(
-            target
+        class_store = ast.Attribute(
+            value=parse_py_qualified_name(target),
+            attr='__class__',
+            ctx=ast.Store(),
+        )
+        yield ast.Assign(
+            targets=[class_store],
+            value=parse_py_qualified_name('concat.stdlib.importlib.Module'),
         )
-        py_node: ast.Assign = ast.parse(assignment, mode='exec').body[0]  # type: ignore
-        clear_locations(py_node)
-        yield py_node
 
 
 def append_to_stack(expr: ast.expr) -> ast.expr:
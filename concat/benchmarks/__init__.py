@@ -0,0 +1,42 @@
+"""Benchmarks for the Concat implementation.
+
+Each module in this package can be run with `python -m
+concat.benchmarks.<name>` from the project root.
+"""
+
+import os
+import pathlib
+import time
+from collections.abc import Callable, Iterator
+
+import concat.lex
+import concat.parse
+import concat.transpile
+
+example_dir = pathlib.Path(__file__).parent / '../examples'
+
+
+def example_programs() -> Iterator[tuple[pathlib.Path, str]]:
+    """Yield the path and source of each example that isn't ignored."""
+    for path in sorted(example_dir.resolve().glob('*.cat')):
+        source = path.read_text()
+        if source.startswith('# IGNORE'):
+            continue
+        yield path, source
+
+
+def parse(source: str) -> concat.parse.TopLevelNode:
+    tokens = [
+        r.token for r in concat.lex.tokenize(source) if r.type == 'token'
+    ]
+    return concat.transpile.parse(tokens)
+
+
+def timed[T](f: Callable[[], T]) -> tuple[T, float]:
+    start = time.perf_counter()
+    result = f()
+    return result, time.perf_counter() - start
+
+
+def source_dir_of(path: pathlib.Path) -> str:
+    return os.fspath(path.parent)
@@ -0,0 +1,56 @@
+"""Measure the cost of writing debugging output while transpiling.
+
+Each example program is transpiled with and without also writing the Python
+equivalent (--emit-python) and the AST dump (--dump-ast) of the result. Type
+checking isn't included.
+
+Usage: python -m concat.benchmarks.debug_output [REPEAT]
+"""
+
+import ast
+import os
+import sys
+import tempfile
+from collections.abc import Callable
+
+import concat.parse
+from concat.benchmarks import example_programs, parse, timed
+from concat.transpile import (
+    transpile_ast,
+    write_ast_dump,
+    write_python_source,
+)
+
+
+def best_time(repeat: int, f: Callable[[], object]) -> float:
+    return min(timed(f)[1] for _ in range(repeat))
+
+
+def transpile_with_debug_output(
+    concat_ast: concat.parse.TopLevelNode, output_dir: str
+) -> ast.Module:
+    module = transpile_ast(concat_ast)
+    write_python_source(module, os.path.join(output_dir, 'debug.py'))
+    write_ast_dump(module, os.path.join(output_dir, 'ast.out'))
+    return module
+
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f'{"program":<24}{"plain ms":>10}{"debug ms":>10}{"ratio":>8}')
+    with tempfile.TemporaryDirectory() as output_dir:
+        for path, source in example_programs():
+            concat_ast = parse(source)
+            plain = best_time(repeat, lambda: transpile_ast(concat_ast))
+            debug = best_time(
+                repeat,
+                lambda: transpile_with_debug_output(concat_ast, output_dir),
+            )
+            print(
+                f'{path.name:<24}{plain * 1000:>10.2f}{debug * 1000:>10.2f}'
+                f'{debug / plain:>8.2f}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Measure hash consing of closed types on the preamble and the examples.
+
+The preamble and each example are type checked once with interning enabled
+and once with it disabled, using a fresh type checker each time. For each
+run, the number of type objects created and the subtyping cache hits are
+reported, along with how many types were replaced by canonical ones.
+
+Usage: python -m concat.benchmarks.interning
+"""
+
+from collections.abc import Callable
+
+from concat.benchmarks import (
+    example_programs,
+    parse,
+    source_dir_of,
+)
+from concat.typecheck import TypeChecker
+from concat.typecheck.types import Type, TypeInterner
+
+
+def new_type_checker(use_interning: bool) -> TypeChecker:
+    context = TypeChecker()
+    context.type_interner = TypeInterner(enabled=use_interning)
+    return context
+
+
+def check_preamble(use_interning: bool) -> TypeChecker:
+    context = new_type_checker(use_interning)
+    context.load_builtins_and_preamble()
+    return context
+
+
+def check(source: str, source_dir: str, use_interning: bool) -> TypeChecker:
+    context = new_type_checker(use_interning)
+    env = context.load_builtins_and_preamble()
+    context.check(env, parse(source).children, source_dir)
+    return context
+
+
+def counted(f: Callable[[], TypeChecker]) -> tuple[TypeChecker, int]:
+    first_id = Type._next_type_id
+    context = f()
+    return context, Type._next_type_id - first_id
+
+
+def report(name: str, run: Callable[[bool], TypeChecker]) -> None:
+    plain, plain_types = counted(lambda: run(False))
+    interned, interned_types = counted(lambda: run(True))
+    print(
+        f'{name:<24}{plain_types:>8}{interned_types:>8}'
+        f'{plain.subtyping_cache.hits:>8}{interned.subtyping_cache.hits:>8}'
+        f'{interned.type_interner.hits:>8}{interned.type_interner.size:>8}'
+    )
+
+
+def main() -> None:
+    print(
+        f'{"":<24}{"types":>16}{"subtyping hits":>16}{"interner":>16}\n'
+        f'{"program":<24}{"plain":>8}{"intern":>8}{"plain":>8}{"intern":>8}'
+        f'{"hits":>8}{"size":>8}'
+    )
+    report('(preamble)', check_preamble)
+    for path, source in example_programs():
+        source_dir = source_dir_of(path)
+        report(
+            path.name,
+            lambda use_interning: check(source, source_dir, use_interning),
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""Compare sequential and parallel checking of function bodies.
+
+The program is a module with hundreds of independent function definitions.
+
+Usage: python -m concat.benchmarks.parallel_bodies [DEFINITIONS [WORKERS]]
+"""
+
+import os
+import sys
+
+from concat.benchmarks import parse, timed
+from concat.typecheck import TypeChecker
+
+
+def generate_module(definition_count: int) -> str:
+    return ''.join(
+        f'def f{i}(x:int -- y:int): dup + {i} + dup + 1 +\n'
+        for i in range(definition_count)
+    )
+
+
+def main() -> None:
+    definition_count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    program = parse(generate_module(definition_count)).children
+    print(f'{definition_count} definitions, {workers} workers')
+    for label, worker_count in [('sequential', 1), ('parallel', workers)]:
+        context = TypeChecker()
+        env = context.load_builtins_and_preamble()
+        _, time = timed(
+            lambda: context.check(env, program, workers=worker_count)
+        )
+        print(f'{label:<12}{time:>8.3f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Measure the runtime speedup from the optimizer.
+
+Three functions are compiled without optimization, with the peephole
+optimizer (-O), and with straight-line function bodies and compiled
+quotations too (-OO), and then each is called many times. The first is made
+of constant pushes, shuffle words, pushed attributes and a quotation of
+constants. The second does arithmetic on small numbers. The third makes and
+calls quotations.
+
+Usage: python -m concat.benchmarks.peephole [CALLS]
+"""
+
+import ast
+import sys
+from collections.abc import Callable
+from typing import cast
+
+import concat.execute
+from concat.benchmarks import parse, timed
+from concat.optimize import optimize
+from concat.transpile import transpile_ast
+
+program = """def words(x:int -- y:int):
+  1 swap dup drop over nip 2 swap drop dup 3 swap nip drop drop
+  $(1 2 'a' drop drop) drop
+  'abc' $.join drop
+
+def arithmetic(x:int -- y:int):
+  dup 1 + swap 2 + + dup 3 + over + nip 4 + dup + 5 + 1 swap + 0 +
+  drop 1
+
+def quotations(x:int -- y:int):
+  True $(1 + dup drop) $(2 +) choose (1 + $(3 drop) drop) $(4 +) drop
+"""
+
+
+def compile_program(mode: str) -> ast.Module:
+    module = transpile_ast(parse(program))
+    if mode == '-O':
+        return optimize(module)
+    if mode == '-OO':
+        return optimize(module, straight_line=True, compile_quotations=True)
+    return module
+
+
+def run(module: ast.Module, function: str, calls: int) -> float:
+    globals: dict[str, object] = {}
+    concat.execute.execute('<benchmark>', module, globals)
+    f = cast(Callable[[list[object], list[object]], None], globals[function])
+    stack: list[object] = [0]
+    stash: list[object] = []
+
+    def call_repeatedly() -> None:
+        for _ in range(calls):
+            f(stack, stash)
+
+    return timed(call_repeatedly)[1]
+
+
+def main() -> None:
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    modes = ['plain', '-O', '-OO']
+    print(f'{calls} calls')
+    print(f'{"function":<12}' + ''.join(f'{mode:>10}' for mode in modes))
+    for function in ['words', 'arithmetic', 'quotations']:
+        times = [run(compile_program(mode), function, calls) for mode in modes]
+        print(
+            f'{function:<12}'
+            + ''.join(f'{time:>9.3f}s' for time in times)
+            + f'  ({times[0] / times[-1]:.1f}x)'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,36 @@
+"""Measure how long the REPL takes to transpile each line it reads.
+
+Each line is parsed once, outside of the measurement, like the REPL does
+before transpiling it. Type checking and running the line aren't included.
+
+Usage: python -m concat.benchmarks.repl [REPEAT]
+"""
+
+import sys
+
+from concat.benchmarks import timed
+from concat.stdlib.repl import _parse, _transpile
+
+lines = [
+    '1 2 +',
+    '$(dup) drop',
+    '"hello" $.upper',
+    '[1, 2, 3] len',
+    'import os.path',
+    'def f(x:int -- y:int):\n  1 +',
+]
+
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    print(f'{"line":<32}{"us":>10}')
+    for line in lines:
+        concat_ast = _parse(line)
+        seconds = min(
+            timed(lambda: _transpile(concat_ast))[1] for _ in range(repeat)
+        )
+        print(f'{line.splitlines()[0]:<32}{seconds * 1e6:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
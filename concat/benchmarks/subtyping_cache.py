@@ -0,0 +1,41 @@
+"""Measure the subtyping cache on the example programs.
+
+Each example is type checked once with the cache enabled and once with it
+disabled, using a fresh type checker each time.
+
+Usage: python -m concat.benchmarks.subtyping_cache
+"""
+
+from concat.benchmarks import (
+    example_programs,
+    parse,
+    source_dir_of,
+    timed,
+)
+from concat.typecheck import TypeChecker
+from concat.typecheck.types import SubtypingCache
+
+
+def check(source: str, source_dir: str, use_cache: bool) -> TypeChecker:
+    context = TypeChecker()
+    context.subtyping_cache = SubtypingCache(enabled=use_cache)
+    env = context.load_builtins_and_preamble()
+    context.check(env, parse(source).children, source_dir)
+    return context
+
+
+def main() -> None:
+    print(f'{"example":<24}{"uncached":>10}{"cached":>10}{"hit rate":>10}')
+    for path, source in example_programs():
+        source_dir = source_dir_of(path)
+        _, uncached_time = timed(lambda: check(source, source_dir, False))
+        context, cached_time = timed(lambda: check(source, source_dir, True))
+        hit_rate = context.subtyping_cache.hit_rate
+        print(
+            f'{path.name:<24}{uncached_time:>10.3f}{cached_time:>10.3f}'
+            f'{hit_rate:>10.1%}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Measure how long the transpiler takes to turn Concat ASTs into Python ASTs.
+
+Besides the example programs, there are synthetic programs full of
+quotations, push words, attribute words, and imports, which are the words
+the transpiler builds the most boilerplate for. Parsing and type checking
+aren't included.
+
+Usage: python -m concat.benchmarks.transpile [REPEAT]
+"""
+
+import sys
+from collections.abc import Iterator
+
+import concat.parse
+from concat.benchmarks import example_programs, parse, timed
+from concat.transpile import transpile_ast
+
+
+def quotations(count: int) -> str:
+    return (
+        'def f(--):\n  '
+        + ' '.join(f'(({i} $({i}) $.real) $.imag) drop' for i in range(count))
+        + '\n'
+    )
+
+
+def imports(count: int) -> str:
+    return ''.join(f'import os.path as p{i}\n' for i in range(count))
+
+
+def programs() -> Iterator[tuple[str, concat.parse.TopLevelNode]]:
+    yield 'quotations', parse(quotations(1000))
+    yield 'imports', parse(imports(1000))
+    for path, source in example_programs():
+        yield path.name, parse(source)
+
+
+def main() -> None:
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f'{"program":<24}{"ms":>10}')
+    for name, concat_ast in programs():
+        seconds = min(
+            timed(lambda: transpile_ast(concat_ast))[1] for _ in range(repeat)
+        )
+        print(f'{name:<24}{seconds * 1000:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
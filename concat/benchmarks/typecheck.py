@@ -0,0 +1,301 @@
+"""Measure the throughput of the type checker.
+
+There are three kinds of workload:
+
+  * synthetic programs that stress one part of the type checker each: long
+    straight-line word sequences, deeply nested quotations, many mutually
+    recursive classes, wide object types, and heavy use of overloads,
+  * each example program, and
+  * a cold start, which loads the builtins and the preamble into a new type
+    checker.
+
+Every program workload gets a new type checker with the preamble already
+loaded, so only checking the program itself is measured. For each workload,
+the best wall time of several runs is reported, along with the number of
+type objects created (allocations) and the peak memory traced during one
+more run.
+
+The results can be saved as a baseline and later runs compared against it.
+Workloads that got slower by more than the threshold are marked, and the
+exit status is nonzero if there are any.
+
+Usage: python -m concat.benchmarks.typecheck [-k SUBSTRING] [--repeat N]
+           [--save BASELINE.json] [--compare BASELINE.json]
+"""
+
+import argparse
+import json
+import pathlib
+import sys
+import tracemalloc
+from collections.abc import Callable, Iterator, Sequence
+from typing import NamedTuple
+
+import concat.lex
+import concat.parse
+from concat.benchmarks import (
+    example_programs,
+    parse,
+    source_dir_of,
+    timed,
+)
+from concat.typecheck import TypeChecker
+from concat.typecheck.types import Type
+
+
+class Workload(NamedTuple):
+    name: str
+    # Does the setup that shouldn't be measured, then returns the thing to
+    # measure.
+    prepare: Callable[[], Callable[[], object]]
+
+
+class Measurement(NamedTuple):
+    seconds: float
+    types: int
+    peak_bytes: int
+
+
+def straight_line(words: int) -> str:
+    return 'def f(x:int -- y:int):\n  ' + 'dup drop ' * words + '\n'
+
+
+def mutually_recursive_classes(count: int) -> str:
+    return '\n'.join(
+        f'class C{i}:\n'
+        f'  def next(self:C{i} -- c:C{(i + 1) % count}):\n'
+        f'    cast (C{(i + 1) % count})\n'
+        for i in range(count)
+    )
+
+
+def wide_object_type(attributes: int) -> str:
+    object_type = '{' + ', '.join(f'a{i}:int' for i in range(attributes)) + '}'
+    return (
+        f'def f(o:{object_type} -- x:int):\n  $.a{attributes - 1}\n\n'
+        f'def g(o:{object_type} -- x:int):\n  f\n'
+    )
+
+
+def overload_use(overloads: int, uses: int) -> str:
+    def parameters(i: int) -> str:
+        return ' '.join(['int'] * (i % 3) + ['str'])
+
+    overload_types = ', '.join(
+        f'py_function[({parameters(i)}), int]' for i in range(overloads)
+    )
+    source = f'def f(--) @cast (py_overloaded[{overload_types}]):\n  ()\n\n'
+    for arity in range(3):
+        source += (
+            f'def use{arity}(p:py_function[({parameters(arity)}), int] --):\n'
+            '  drop\n\n'
+        )
+    return (
+        source
+        + 'def g(--):\n  '
+        + ' '.join(f'$f use{i % 3}' for i in range(uses))
+        + '\n'
+    )
+
+
+def nested_quotations(depth: int) -> list[concat.parse.Node]:
+    # The parser can't handle nesting this deep, so build the tree directly.
+    [number] = [
+        r.token
+        for r in concat.lex.tokenize('0')
+        if r.type == 'token' and r.token.type == 'NUMBER'
+    ]
+    word: concat.parse.WordNode = concat.parse.NumberWordNode(number)
+    for _ in range(depth):
+        word = concat.parse.QuoteWordNode([word], (1, 0), (1, 0))
+    return [word]
+
+
+def program_workload(
+    name: str,
+    nodes: Callable[[], Sequence[concat.parse.Node]],
+    source_dir: str = '.',
+    check_bodies: bool = True,
+) -> Workload:
+    def prepare() -> Callable[[], object]:
+        context = TypeChecker()
+        env = context.load_builtins_and_preamble()
+        program = nodes()
+        return lambda: context.check(
+            env, program, source_dir, _should_check_bodies=check_bodies
+        )
+
+    return Workload(name, prepare)
+
+
+def workloads() -> Iterator[Workload]:
+    yield Workload(
+        '(cold start)',
+        lambda: lambda: TypeChecker().load_builtins_and_preamble(),
+    )
+    yield program_workload(
+        'straight-line',
+        lambda: parse(straight_line(500)).children,
+    )
+    yield program_workload(
+        'nested-quotations', lambda: nested_quotations(1000)
+    )
+    # Class bodies are only checked in stubs.
+    yield program_workload(
+        'recursive-classes',
+        lambda: parse(mutually_recursive_classes(50)).children,
+        check_bodies=False,
+    )
+    yield program_workload(
+        'wide-object', lambda: parse(wide_object_type(100)).children
+    )
+    yield program_workload(
+        'overloads', lambda: parse(overload_use(30, 60)).children
+    )
+    for path, source in example_programs():
+        yield program_workload(
+            path.name, parsed_nodes(source), source_dir_of(path)
+        )
+
+
+def parsed_nodes(source: str) -> Callable[[], Sequence[concat.parse.Node]]:
+    return lambda: parse(source).children
+
+
+def measure(workload: Workload, repeat: int) -> Measurement:
+    best = float('inf')
+    types = 0
+    for _ in range(repeat):
+        run = workload.prepare()
+        first_id = Type._next_type_id
+        _, seconds = timed(run)
+        best = min(best, seconds)
+        types = Type._next_type_id - first_id
+    # Tracing slows everything down, so memory is measured in its own run.
+    run = workload.prepare()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Measurement(best, types, peak_bytes)
+
+
+def report(
+    name: str,
+    measurement: Measurement,
+    baseline: Measurement | None,
+    threshold: float,
+) -> bool:
+    """Print a row and return whether the workload regressed."""
+    row = (
+        f'{name:<24}{measurement.seconds * 1000:>10.1f}'
+        f'{measurement.types:>10}{measurement.peak_bytes / 1024:>10.0f}'
+    )
+    if baseline is None:
+        print(row)
+        return False
+    ratios = [
+        measurement.seconds / baseline.seconds,
+        measurement.types / max(baseline.types, 1),
+        measurement.peak_bytes / max(baseline.peak_bytes, 1),
+    ]
+    regressed = ratios[0] > 1 + threshold
+    print(
+        row
+        + ''.join(f'{ratio:>8.2f}x' for ratio in ratios)
+        + ('  slower' if regressed else '')
+    )
+    return regressed
+
+
+def load_baseline(path: pathlib.Path) -> dict[str, Measurement]:
+    with path.open() as file:
+        return {
+            name: Measurement(**measurement)
+            for name, measurement in json.load(file).items()
+        }
+
+
+def save_baseline(
+    path: pathlib.Path, measurements: dict[str, Measurement]
+) -> None:
+    with path.open('w') as file:
+        json.dump(
+            {
+                name: measurement._asdict()
+                for name, measurement in measurements.items()
+            },
+            file,
+            indent=2,
+        )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        description='Measure the throughput of the type checker.'
+    )
+    arg_parser.add_argument(
+        '-k',
+        dest='pattern',
+        default='',
+        help='only run workloads whose names contain this',
+    )
+    arg_parser.add_argument(
+        '--repeat',
+        type=int,
+        default=3,
+        help='number of timed runs of each workload, of which the best is '
+        'reported',
+    )
+    arg_parser.add_argument(
+        '--save',
+        type=pathlib.Path,
+        metavar='BASELINE',
+        help='save the measurements to this file',
+    )
+    arg_parser.add_argument(
+        '--compare',
+        type=pathlib.Path,
+        metavar='BASELINE',
+        help='compare the measurements to the ones saved in this file',
+    )
+    arg_parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.1,
+        help='how much slower than the baseline a workload can be before it '
+        'counts as a regression (default: 0.1, i.e. 10%%)',
+    )
+    args = arg_parser.parse_args(argv)
+
+    baselines = {} if args.compare is None else load_baseline(args.compare)
+    header = f'{"workload":<24}{"ms":>10}{"types":>10}{"peak KiB":>10}'
+    if args.compare is not None:
+        header += f'{"ms":>9}{"types":>9}{"peak":>9}'
+    print(header)
+    measurements = {}
+    regressions = 0
+    for workload in workloads():
+        if args.pattern not in workload.name:
+            continue
+        measurement = measure(workload, args.repeat)
+        measurements[workload.name] = measurement
+        if report(
+            workload.name,
+            measurement,
+            baselines.get(workload.name),
+            args.threshold,
+        ):
+            regressions += 1
+    if args.save is not None:
+        save_baseline(args.save, measurements)
+    if regressions:
+        print(f'{regressions} workload(s) slower than the baseline')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
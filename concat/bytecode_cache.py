@@ -0,0 +1,96 @@
+"""A cache of compiled Concat programs, like CPython's .pyc files.
+
+The code object compiled from a program is marshalled to a file in a
+__pycache__ directory next to the program. The file name includes the
+Concat version, the cache tag of the Python implementation, and the level of
+optimization (see concat.optimize), and the file
+starts with the Python bytecode magic number, a fingerprint of the compiler
+(see concat.fingerprint) and a hash of the source, so a cached program is
+only used when it was compiled from the same source by the same compiler for
+the same Python.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import importlib.util
+import marshal
+import os
+import pathlib
+import sys
+import tempfile
+import types
+
+import concat
+import concat.fingerprint
+
+
+def cache_path(
+    source_path: pathlib.Path, optimization_level: int = 0
+) -> pathlib.Path:
+    """Return where the compiled form of a program is cached."""
+    optimization = f'.opt-{optimization_level}' if optimization_level else ''
+    return (
+        source_path.parent
+        / '__pycache__'
+        / (
+            f'{source_path.stem}.concat-{concat.version}.'
+            f'{sys.implementation.cache_tag}{optimization}.pyc'
+        )
+    )
+
+
+def load(
+    source_path: pathlib.Path, source: str, optimization_level: int = 0
+) -> types.CodeType | None:
+    """Return the cached code object of a program, or None."""
+    try:
+        data = cache_path(source_path, optimization_level).read_bytes()
+    except OSError:
+        return None
+    header = _header(source)
+    if data[: len(header)] != header:
+        return None
+    try:
+        code = marshal.loads(data[len(header) :])
+    except (EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(code, types.CodeType):
+        return None
+    return code
+
+
+def store(
+    source_path: pathlib.Path,
+    source: str,
+    code: types.CodeType,
+    optimization_level: int = 0,
+) -> None:
+    """Cache the code object compiled from a program."""
+    if sys.dont_write_bytecode:
+        return
+    path = cache_path(source_path, optimization_level)
+    temp_path = None
+    try:
+        path.parent.mkdir(exist_ok=True)
+        # Write atomically so that concurrent runs never load a partial file.
+        with tempfile.NamedTemporaryFile(
+            'wb', dir=path.parent, suffix='.tmp', delete=False
+        ) as file:
+            temp_path = file.name
+            file.write(_header(source) + marshal.dumps(code))
+        os.replace(temp_path, path)
+    except OSError:
+        # The cache is only an optimization.
+        if temp_path is not None:
+            with contextlib.suppress(OSError):
+                os.unlink(temp_path)
+
+
+def _header(source: str) -> bytes:
+    return (
+        importlib.util.MAGIC_NUMBER
+        + concat.fingerprint.compiler_fingerprint()
+        + hashlib.sha256(source.encode()).digest()
+    )
@@ -1,11 +1,17 @@
+from __future__ import annotations
+
 import io
 import textwrap
-from typing import Sequence, TextIO
+from typing import TYPE_CHECKING, Sequence, TextIO, assert_never
 
 import concat.astutils
+import concat.lex
 import concat.parser_combinators
 from concat.location import Location
 
+if TYPE_CHECKING:
+    from concat.typecheck import StaticAnalysisError
+
 
 def get_line_at(file: TextIO, location: Location) -> str:
     file.seek(0, io.SEEK_SET)
@@ -58,3 +64,64 @@ def create_indentation_error_message(
         f'{line.rstrip()}\n'
     )
     return message
+
+
+def tokenize_printing_errors(
+    file: TextIO, code: str | None = None
+) -> tuple[list[concat.lex.Token], bool]:
+    """Tokenize code (or the file), printing every error found.
+
+    Returns the tokens and whether there were any errors."""
+    token_results = concat.lex.tokenize(file.read() if code is None else code)
+    tokens = list[concat.lex.Token]()
+    has_errors = False
+    for r in token_results:
+        if r.type == 'token':
+            tokens.append(r.token)
+            continue
+        has_errors = True
+        if r.type == 'indent-err':
+            position = (r.err.lineno or 1, r.err.offset or 0)
+            message = r.err.msg
+            print('Indentation error:')
+            print(create_indentation_error_message(file, position, message))
+        elif r.type == 'token-err':
+            position = r.location
+            message = str(r.err)
+            print('Lexical error:')
+            print(create_lexical_error_message(file, position, message))
+        else:
+            assert_never(r)
+    return tokens, has_errors
+
+
+def print_parse_error(
+    e: concat.parser_combinators.ParseError,
+    file: TextIO,
+    tokens: Sequence[concat.lex.Token],
+) -> None:
+    # The parser raises ParseError with its result, while
+    # TopLevelNode.assert_no_parse_errors raises it with the failures.
+    [failures] = e.args
+    if isinstance(failures, concat.parser_combinators.Result):
+        failures = [failures.failures]
+    for failure in failures:
+        print('Parse Error:')
+        print(create_parsing_failure_message(file, tokens, failure))
+
+
+def print_static_analysis_error(e: StaticAnalysisError, file: TextIO) -> None:
+    if e.path is None:
+        in_path = ''
+    else:
+        in_path = ' in file ' + str(e.path)
+    print(f'Static Analysis Error{in_path}:\n')
+    print(e, end='')
+    if e.location:
+        print(' in line:')
+        if e.path is not None:
+            with e.path.open() as f:
+                print(get_line_at(f, e.location), end='')
+        else:
+            print(get_line_at(file, e.location), end='')
+        print(' ' * e.location[1] + '^')
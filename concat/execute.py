@@ -2,6 +2,7 @@
 
 import ast
 import concat.astutils
+import concat.importer
 import concat.stdlib.compositional
 import concat.stdlib.execution
 import concat.stdlib.importlib
@@ -56,7 +57,7 @@ class LoggableStack(List[object]):
         return res
 
 
-def _compile(filename: str, ast_: ast.Module) -> types.CodeType:
+def compile_module(filename: str, ast_: ast.Module) -> types.CodeType:
     return compile(ast_, filename, 'exec')
 
 
@@ -203,7 +204,7 @@ def _do_preamble(globals: Dict[str, object], should_log_stacks=False) -> None:
 
 def execute(
     filename: str,
-    ast: ast.Module,
+    ast: Union[ast.Module, types.CodeType],
     globals: Dict[str, object],
     locals: Optional[Dict[str, object]] = None,
     should_log_stacks=False,
@@ -211,9 +212,12 @@ def execute(
     import_resolution_start_directory: Union[os.PathLike, str] = '',
 ) -> None:
     _do_preamble(globals, should_log_stacks)
+    concat.importer.install()
 
+    if not isinstance(ast, types.CodeType):
+        ast = compile_module(filename, ast)
     _run(
-        _compile(filename, ast),
+        ast,
         import_resolution_start_directory,
         globals,
         locals,
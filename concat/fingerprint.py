@@ -0,0 +1,29 @@
+"""A fingerprint of the compiler itself.
+
+The on-disk caches of type check results and compiled programs are keyed on
+it. The version alone isn't enough, since in a checkout or a development
+install the compiler can change without the version changing.
+"""
+
+import functools
+import hashlib
+import pathlib
+
+import concat
+
+_package_dir = pathlib.Path(__file__).parent
+
+
+@functools.cache
+def compiler_fingerprint() -> bytes:
+    """Return a hash of the Concat version and the source of the compiler.
+
+    The tests are left out since they don't affect what the compiler does."""
+    fingerprint = hashlib.sha256(concat.version.encode())
+    for path in sorted(_package_dir.rglob('*.py')):
+        relative_path = path.relative_to(_package_dir)
+        if relative_path.parts[0] == 'tests':
+            continue
+        fingerprint.update(relative_path.as_posix().encode() + b'\0')
+        fingerprint.update(hashlib.sha256(path.read_bytes()).digest())
+    return fingerprint.digest()
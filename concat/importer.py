@@ -0,0 +1,183 @@
+"""Importing Concat modules (.cat files) with the import statement.
+
+Once the path hook is installed on sys.path_hooks, `import foo` finds
+foo.cat (or foo/__init__.cat for a package) on sys.path. Like Python, the
+entries of sys.path are searched in order, so a Concat module only takes the
+place of a Python module of the same name in the same directory. The module is
+type checked, transpiled, compiled, and run in a new self-pushing module
+object, with the same globals a Concat program gets.
+
+Like the batch CLI, the loader saves the compiled module in __pycache__ (see
+concat.bytecode_cache) and remembers that it type checked, so importing an
+unchanged module in another process only has to run it. Neither is written
+when sys.dont_write_bytecode is set. In one process, each module is only
+compiled once, since it stays in sys.modules.
+
+The type checker finds modules the same way, even before the hook is
+installed, so a Concat module serves as its own type stubs.
+"""
+
+from __future__ import annotations
+
+import importlib.abc
+import importlib.machinery
+import pathlib
+import sys
+import types
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+import concat.bytecode_cache
+import concat.stdlib.importlib
+
+if TYPE_CHECKING:
+    from _typeshed.importlib import MetaPathFinderProtocol
+
+source_suffix = '.cat'
+
+
+class CatLoader(importlib.abc.FileLoader):
+    def create_module(
+        self, spec: importlib.machinery.ModuleSpec
+    ) -> concat.stdlib.importlib.Module:
+        return concat.stdlib.importlib.Module(spec.name)
+
+    def get_source(self, fullname: str) -> str:
+        return self.get_data(self.get_filename(fullname)).decode()
+
+    def exec_module(self, module: types.ModuleType) -> None:
+        import concat.execute
+
+        path = pathlib.Path(self.get_filename(module.__name__))
+        code = compile_file(path, self.get_source(module.__name__))
+        concat.execute._do_preamble(module.__dict__)
+        exec(code, module.__dict__)
+
+
+# The Concat loader comes first, so in each directory, foo.cat is imported
+# instead of foo.py. The others are in the order of the default FileFinder.
+path_hook = importlib.machinery.FileFinder.path_hook(
+    (CatLoader, [source_suffix]),
+    (
+        importlib.machinery.ExtensionFileLoader,
+        importlib.machinery.EXTENSION_SUFFIXES,
+    ),
+    (
+        importlib.machinery.SourceFileLoader,
+        importlib.machinery.SOURCE_SUFFIXES,
+    ),
+    (
+        importlib.machinery.SourcelessFileLoader,
+        importlib.machinery.BYTECODE_SUFFIXES,
+    ),
+)
+
+
+def install() -> None:
+    """Allow Concat modules to be imported. Doing this again does nothing."""
+    if path_hook in sys.path_hooks:
+        return
+    # The hook rejects anything that isn't a directory, so zip files are
+    # still left to zipimport.
+    sys.path_hooks.insert(0, path_hook)
+    # The directories that have been searched already have finders that
+    # don't know about Concat modules.
+    sys.path_importer_cache.clear()
+
+
+class _PathFinder(importlib.abc.MetaPathFinder):
+    """Finds modules on sys.path like PathFinder does with the hook installed.
+
+    The type checker uses this to find modules without installing the
+    hook."""
+
+    def __init__(self) -> None:
+        self._file_finders: dict[str, importlib.abc.PathEntryFinder] = {}
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None,
+        target: types.ModuleType | None = None,
+    ) -> importlib.machinery.ModuleSpec | None:
+        namespace_path: list[str] = []
+        for entry in sys.path if path is None else path:
+            file_finder = self._file_finder(entry)
+            if file_finder is None:
+                spec = importlib.machinery.PathFinder.find_spec(
+                    fullname, [entry]
+                )
+            else:
+                spec = file_finder.find_spec(fullname)
+            if spec is None:
+                continue
+            if spec.loader is not None:
+                return spec
+            namespace_path.extend(spec.submodule_search_locations or [])
+        if namespace_path:
+            spec = importlib.machinery.ModuleSpec(
+                fullname, None, is_package=True
+            )
+            spec.submodule_search_locations = namespace_path
+            return spec
+        return None
+
+    def _file_finder(self, entry: str) -> importlib.abc.PathEntryFinder | None:
+        # FileFinders remember the contents of their directories until they
+        # change.
+        if entry not in self._file_finders:
+            try:
+                self._file_finders[entry] = path_hook(entry)
+            except ImportError:
+                return None
+        return self._file_finders[entry]
+
+
+_path_finder = _PathFinder()
+
+
+def meta_path() -> list[MetaPathFinderProtocol]:
+    """Return sys.meta_path, finding Concat modules on sys.path."""
+    return [
+        _path_finder if f is importlib.machinery.PathFinder else f
+        for f in sys.meta_path
+    ]
+
+
+def compile_file(path: pathlib.Path, source: str) -> types.CodeType:
+    """Type check and compile a Concat module, using the caches if possible.
+
+    Raises StaticAnalysisError if the module doesn't type check."""
+    import concat.lex
+    from concat.execute import compile_module
+    from concat.transpile import parse, transpile_ast, typecheck
+    from concat.typecheck import StaticAnalysisError
+    from concat.typecheck.result_cache import (
+        TypeCheckResultCache,
+        default_cache_dir,
+    )
+    from concat.typecheck.stubs import StubResolver
+
+    source_dir = path.parent
+    result_cache = TypeCheckResultCache(default_cache_dir())
+    code = concat.bytecode_cache.load(path, source)
+    if code is not None and result_cache.is_checked(
+        source, source_dir, StubResolver()
+    ):
+        return code
+    tokens = []
+    for r in concat.lex.tokenize(source):
+        if r.type != 'token':
+            raise r.err
+        tokens.append(r.token)
+    concat_ast = parse(tokens)
+    concat_ast.assert_no_parse_errors()
+    try:
+        context = typecheck(concat_ast, str(source_dir))
+    except StaticAnalysisError as e:
+        e.set_path_if_missing(path)
+        raise
+    result_cache.record(source, source_dir, context)
+    code = compile_module(str(path), transpile_ast(concat_ast))
+    concat.bytecode_cache.store(path, source, code)
+    return code
@@ -74,14 +74,26 @@ class LinkedList(Sequence[_T_co]):
         return other
 
     def filter(self, p: Callable[[_T_co], bool]) -> 'LinkedList[_T_co]':
-        if self._val is None:
+        # Everything after the last element that is filtered out is shared
+        # with the result.
+        kept_before_last_removal: List[_T_co] = []
+        kept_since_last_removal: List[_T_co] = []
+        shared_tail: Optional[LinkedList[_T_co]] = None
+        node = self
+        while node._val is not None:
+            head, node = node._val
+            if p(head):
+                kept_since_last_removal.append(head)
+            else:
+                kept_before_last_removal += kept_since_last_removal
+                kept_since_last_removal.clear()
+                shared_tail = node
+        if shared_tail is None:
             return self
-        # FIXME: Stack safety
-        # TODO: Reuse as much of tail as possible
-        if p(self._val[0]):
-            tail = self._val[1].filter(p)
-            return LinkedList((self._val[0], tail))
-        return self._val[1].filter(p)
+        result = shared_tail
+        for el in reversed(kept_before_last_removal):
+            result = LinkedList((el, result))
+        return result
 
     def _tails(self) -> 'List[LinkedList[_T_co]]':
         res: List[LinkedList[_T_co]] = []
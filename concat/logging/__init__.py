@@ -13,6 +13,8 @@ class ConcatLogger:
     def debug(
         self, format_string: str, *args: object, **kwargs: object
     ) -> None:
+        if not self._logger.isEnabledFor(logging.DEBUG):
+            return
         # https://stackoverflow.com/a/44164714/3455228
         # https://stackoverflow.com/a/41938216/3455228
         caller = inspect.stack()[1]
@@ -24,18 +26,24 @@ class ConcatLogger:
     def error(
         self, format_string: str, *args: object, **kwargs: object
     ) -> None:
+        if not self._logger.isEnabledFor(logging.ERROR):
+            return
         caller = inspect.stack()[1]
         _log(self._logger.error, format_string, caller, args, kwargs)
 
     def warning(
         self, format_string: str, *args: object, **kwargs: object
     ) -> None:
+        if not self._logger.isEnabledFor(logging.WARNING):
+            return
         caller = inspect.stack()[1]
         _log(self._logger.warning, format_string, caller, args, kwargs)
 
     def info(
         self, format_string: str, *args: object, **kwargs: object
     ) -> None:
+        if not self._logger.isEnabledFor(logging.INFO):
+            return
         caller = inspect.stack()[1]
         _log(self._logger.info, format_string, caller, args, kwargs)
 
@@ -22,8 +22,9 @@ from concat.lex import Token, tokenize
 from concat.location import Location
 from concat.logging import ConcatLogger
 from concat.parser_combinators import ParseError
-from concat.transpile import parse, typecheck
+from concat.transpile import parse
 from concat.typecheck import StaticAnalysisError
+from concat.typecheck.incremental import IncrementalTypeChecker
 from typing_extensions import Self
 
 _python_logger = logging.getLogger(__name__)
@@ -397,6 +398,9 @@ class _TextDocumentItem:
         self._version = cast(int, dictionary['version'])
         self._text = cast(str, dictionary['text'])
         self.diagnostics: List[_Diagnostic] = []
+        # Keep a type checker per document so that only the definitions
+        # affected by an edit are checked again.
+        self._type_checker = IncrementalTypeChecker()
 
     def update(self, version: int, text: str) -> None:
         self._version = version
@@ -468,7 +472,7 @@ class _TextDocumentItem:
             source_dir = str(
                 Path(url2pathname(urlparse(self._uri).path)).parent
             )
-            typecheck(ast, source_dir)
+            self._type_checker.check(self._text, ast, source_dir)
         except StaticAnalysisError as e:
             position = _Position.from_tokenizer_location(
                 text_lines, e.location or (1, 0)
@@ -0,0 +1,623 @@
+"""A peephole optimizer for the Python code generated by the transpiler.
+
+The transpiler turns every word into a call of a function on the stack and
+the stash. This pass rewrites the calls that can be done more cheaply:
+
+  * Words that push a constant become a direct `stack.append(constant)`,
+    instead of creating a closure with `push` and calling it.
+  * Immediately called lambda abstractions, like the ones generated for
+    attribute words and push words, are replaced by their bodies.
+  * The shuffle words dup, swap, drop, over and nip become the list
+    operations they do.
+  * `push` closures of constants that are created inside functions and
+    lambdas (e.g. as the elements of quotations), are created once when the
+    module is run, instead of every time the function runs.
+
+With straight_line=True, runs of words in function bodies whose stack effects
+are known (constant pushes, push words, shuffle words and the operators
+defined in the preamble) are compiled to straight-line code on local
+variables first. Values are only moved to the real stack before a word with
+an unknown effect and at the end of the function. For example, the body of
+
+    def f(x:int -- y:int): dup 1 + swap drop
+
+becomes
+
+    t0 = stack.pop()
+    t1 = t0 + 1
+    stack.append(t1)
+
+Each value is bound to a local variable as soon as it's computed, so
+everything is still evaluated in the same order. If an exception is raised
+in the middle of a run, the values computed so far in the run are not on the
+stack.
+
+With compile_quotations=True, quotations that don't refer to local
+variables are compiled to functions defined once at the top of the module,
+like the functions of Concat `def`s. For example, `$(1 dup) drop` becomes
+
+    def @@concat_quotation_function_0(stack, stash):
+        push(1)(stack, stash)
+        dup(stack, stash)
+    @@concat_quotation_words_0 = lambda: [push(1), dup]
+    ...
+    stack.append(concat.stdlib.types.CompiledQuotation(
+        @@concat_quotation_function_0, @@concat_quotation_words_0
+    ))
+
+which the other passes then optimize further. Each evaluation of the
+quotation still creates a new quotation, which acts like a list of its words
+when it's used as a sequence. The names in the quotation are looked up when
+it's called instead of when it's evaluated, so a quotation is only compiled if
+the module can't bind its names to something else in between: each name must
+be a global that the module either never binds or only binds with one
+top-level `def` or `class`.
+
+A word is only rewritten if the module never binds its name to something
+else. The optimizer assumes that the module is run with the globals set up
+by concat.execute, which is true for the CLI but not for the REPL.
+"""
+
+from __future__ import annotations
+
+import ast
+import collections
+import contextlib
+import copy
+from collections.abc import Iterator
+
+from concat.astutils import append_to_stack, parse_py_qualified_name
+
+# The bodies of the inlined shuffle words, written in terms of the stack like
+# in concat.stdlib.shuffle_words.
+_shuffle_word_bodies = {
+    'dup': 'stack.append(stack[-1])',
+    'swap': 'stack[-2], stack[-1] = stack[-1], stack[-2]',
+    'drop': 'stack.pop()',
+    'over': 'stack.append(stack[-2])',
+    'nip': 'stack.pop(-2)',
+}
+
+
+# The operators in the preamble of concat.execute, which pop two values and
+# push the result of the operator.
+_binary_operators: dict[str, ast.operator | ast.cmpop] = {
+    '+': ast.Add(),
+    '-': ast.Sub(),
+    '<': ast.Lt(),
+    '<=': ast.LtE(),
+    '>=': ast.GtE(),
+    'is': ast.Is(),
+}
+
+
+def optimize(
+    module: ast.Module,
+    straight_line: bool = False,
+    compile_quotations: bool = False,
+) -> ast.Module:
+    """Optimize a transpiled module in place and return it."""
+    rebound_names = _bound_names(module)
+    if compile_quotations:
+        compiler = _QuotationCompiler(
+            rebound_names - _names_defined_once(module)
+        )
+        module = compiler.visit(module)
+        module.body[:0] = compiler.definitions
+    if straight_line:
+        _StraightLineCompiler(rebound_names).visit(module)
+    hoister = _ConstantClosureHoister()
+    module = _PeepholeOptimizer(rebound_names, hoister).visit(module)
+    module.body[:0] = hoister.definitions
+    ast.fix_missing_locations(module)
+    return module
+
+
+class _PeepholeOptimizer(ast.NodeTransformer):
+    def __init__(
+        self, rebound_names: set[str], hoister: _ConstantClosureHoister
+    ) -> None:
+        self._rebound_names = rebound_names
+        self._hoister = hoister
+
+    def visit_Expr(self, node: ast.Expr) -> ast.AST | list[ast.stmt]:
+        call = node.value
+        if not _is_word_call(call):
+            return self.generic_visit(node)
+        assert isinstance(call, ast.Call)
+        word = call.func
+        if isinstance(word, ast.Lambda) and _is_word_abstraction(word):
+            body = ast.Expr(value=word.body)
+            ast.copy_location(body, node)
+            return self.visit(body)
+        constant = self._pushed_constant(word)
+        if constant is not None:
+            return ast.copy_location(
+                ast.Expr(value=append_to_stack(constant)), node
+            )
+        if (
+            isinstance(word, ast.Name)
+            and word.id in _shuffle_word_bodies
+            and word.id not in self._rebound_names
+        ):
+            return _located(
+                ast.parse(_shuffle_word_bodies[word.id]).body, node
+            )
+        return self.generic_visit(node)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> ast.AST:
+        with self._hoister.hoisting():
+            return self.generic_visit(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> ast.AST:
+        with self._hoister.hoisting():
+            return self.generic_visit(node)
+
+    def visit_Lambda(self, node: ast.Lambda) -> ast.AST:
+        with self._hoister.hoisting():
+            return self.generic_visit(node)
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        if self._pushed_constant(node) is not None:
+            return self._hoister.hoist(node)
+        return self.generic_visit(node)
+
+    def _pushed_constant(self, word: ast.expr) -> ast.Constant | None:
+        """Return the constant if word is `push(constant)`."""
+        if (
+            isinstance(word, ast.Call)
+            and isinstance(word.func, ast.Name)
+            and word.func.id == 'push'
+            and 'push' not in self._rebound_names
+            and len(word.args) == 1
+            and not word.keywords
+            and isinstance(word.args[0], ast.Constant)
+        ):
+            return word.args[0]
+        return None
+
+
+class _ConstantClosureHoister:
+    def __init__(self) -> None:
+        self._depth = 0
+        self._names: dict[tuple[type, object], str] = {}
+        self.definitions: list[ast.stmt] = []
+
+    @contextlib.contextmanager
+    def hoisting(self) -> Iterator[None]:
+        """Hoist the closures found until the end of a function or lambda."""
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+
+    def hoist(self, push_call: ast.Call) -> ast.expr:
+        """Return a global name bound to push_call if it's in a function."""
+        if not self._depth:
+            return push_call
+        constant = push_call.args[0]
+        assert isinstance(constant, ast.Constant)
+        # 1, 1.0 and True are equal, but they aren't the same constant.
+        key = (type(constant.value), constant.value)
+        if key not in self._names:
+            name = f'@@concat_constant_{len(self._names)}'
+            self._names[key] = name
+            definition = ast.Assign(
+                targets=[ast.Name(id=name, ctx=ast.Store())],
+                value=copy.deepcopy(push_call),
+            )
+            self.definitions.append(ast.copy_location(definition, push_call))
+        return ast.copy_location(
+            ast.Name(id=self._names[key], ctx=ast.Load()), push_call
+        )
+
+
+class _QuotationCompiler(ast.NodeTransformer):
+    def __init__(self, rebound_names: set[str]) -> None:
+        self._rebound_names = rebound_names
+        # The names bound in each enclosing function, lambda and class.
+        self._scopes: list[set[str]] = []
+        # The functions of the compiled quotations.
+        self._functions: set[str] = set()
+        self.definitions: list[ast.stmt] = []
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> ast.AST:
+        return self._visit_scope(node, _parameters(node.args))
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> ast.AST:
+        return self._visit_scope(node, _parameters(node.args))
+
+    def visit_Lambda(self, node: ast.Lambda) -> ast.AST:
+        return self._visit_scope(node, _parameters(node.args))
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> ast.AST:
+        return self._visit_scope(node, set())
+
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        self.generic_visit(node)
+        if _is_quotation_literal(node) and self._is_constant(node.args[0]):
+            return self._compile(node)
+        if _is_word_call(node):
+            node.func = self._direct(node.func)
+        return node
+
+    def _visit_scope(self, node: ast.AST, parameters: set[str]) -> ast.AST:
+        self._scopes.append(set(_bound_names_in(node)) | parameters)
+        try:
+            return self.generic_visit(node)
+        finally:
+            self._scopes.pop()
+
+    def _is_constant(self, elements: ast.expr) -> bool:
+        free_names = _free_names(elements)
+        return (
+            not any(
+                isinstance(node, ast.NamedExpr) for node in ast.walk(elements)
+            )
+            and free_names.isdisjoint(self._rebound_names)
+            and all(free_names.isdisjoint(scope) for scope in self._scopes)
+        )
+
+    def _compile(self, literal: ast.Call) -> ast.expr:
+        [elements] = literal.args
+        assert isinstance(elements, ast.List)
+        index = len(self._functions)
+        function_name = f'@@concat_quotation_function_{index}'
+        words_name = f'@@concat_quotation_words_{index}'
+        body: list[ast.stmt] = []
+        for element in elements.elts:
+            call = ast.Call(
+                func=self._direct(copy.deepcopy(element)),
+                args=[
+                    ast.Name(id='stack', ctx=ast.Load()),
+                    ast.Name(id='stash', ctx=ast.Load()),
+                ],
+                keywords=[],
+            )
+            ast.copy_location(call, element)
+            body.append(ast.copy_location(ast.Expr(value=call), element))
+        function = ast.FunctionDef(
+            name=function_name,
+            args=_arguments('stack', 'stash'),
+            body=body or [ast.Pass()],
+            decorator_list=[],
+            returns=None,
+            type_params=[],
+        )
+        words = ast.Assign(
+            targets=[ast.Name(id=words_name, ctx=ast.Store())],
+            value=ast.Lambda(args=_arguments(), body=elements),
+        )
+        for definition in [function, words]:
+            self.definitions.append(ast.copy_location(definition, literal))
+        self._functions.add(function_name)
+        quotation = ast.Call(
+            func=parse_py_qualified_name(
+                'concat.stdlib.types.CompiledQuotation'
+            ),
+            args=[
+                ast.Name(id=function_name, ctx=ast.Load()),
+                ast.Name(id=words_name, ctx=ast.Load()),
+            ],
+            keywords=[],
+        )
+        return ast.copy_location(quotation, literal)
+
+    def _direct(self, word: ast.expr) -> ast.expr:
+        """Call a compiled quotation's function instead of the quotation."""
+        if (
+            isinstance(word, ast.Call)
+            and isinstance(word.func, ast.Attribute)
+            and word.func.attr == 'CompiledQuotation'
+            and word.args
+            and _name_id(word.args[0]) in self._functions
+        ):
+            return word.args[0]
+        return word
+
+
+class _StraightLineCompiler(ast.NodeVisitor):
+    def __init__(self, rebound_names: set[str]) -> None:
+        self._rebound_names = rebound_names
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self.generic_visit(node)
+        node.body = _StraightLineRun(self._rebound_names).compile(node.body)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self.generic_visit(node)
+        node.body = _StraightLineRun(self._rebound_names).compile(node.body)
+
+
+class _StraightLineRun:
+    """Compiles the statements of one function body."""
+
+    def __init__(self, rebound_names: set[str]) -> None:
+        self._rebound_names = rebound_names
+        # The values on top of the stack that haven't been pushed yet, from
+        # bottom to top. Each is a constant or a local variable.
+        self._values: list[ast.expr] = []
+        self._statements: list[ast.stmt] = []
+        self._next_local = 0
+
+    def compile(self, body: list[ast.stmt]) -> list[ast.stmt]:
+        for statement in body:
+            if not self._compile_word(statement):
+                self._spill(statement)
+                self._statements.append(statement)
+        if not body:
+            return body
+        self._spill(body[-1])
+        if not self._statements:
+            # The words had no effect on the stack, e.g. `1 drop`.
+            return [ast.copy_location(ast.Pass(), body[0])]
+        return self._statements
+
+    def _compile_word(self, statement: ast.stmt) -> bool:
+        """Compile a statement if it's a word with a known stack effect.
+
+        Returns whether the statement was compiled."""
+        if not isinstance(statement, ast.Expr) or not _is_word_call(
+            statement.value
+        ):
+            return False
+        assert isinstance(statement.value, ast.Call)
+        word = statement.value.func
+        if (
+            isinstance(word, ast.Call)
+            and isinstance(word.func, ast.Name)
+            and word.func.id == 'push'
+            and 'push' not in self._rebound_names
+            and len(word.args) == 1
+            and not word.keywords
+            and isinstance(word.args[0], ast.Constant)
+        ):
+            self._values.append(word.args[0])
+            return True
+        if isinstance(word, ast.Lambda) and _is_word_abstraction(word):
+            return self._compile_push_word(word.body, statement)
+        if isinstance(word, ast.Name) and word.id not in self._rebound_names:
+            return self._compile_named_word(word.id, statement)
+        return False
+
+    def _compile_push_word(self, body: ast.expr, statement: ast.stmt) -> bool:
+        # Push words are `stack.append(expression)`, where the expression
+        # might pop the stack to get an attribute of the top.
+        if not (
+            isinstance(body, ast.Call)
+            and _is_stack_method_call(body.func, 'append')
+            and len(body.args) == 1
+            and not body.keywords
+        ):
+            return False
+        [value] = body.args
+        if isinstance(value, ast.Attribute) and _is_stack_pop(value.value):
+            [top] = self._pop(1, statement)
+            value = ast.Attribute(value=top, attr=value.attr, ctx=ast.Load())
+        elif _mentions_stack(value):
+            return False
+        self._push_local(value, statement)
+        return True
+
+    def _compile_named_word(self, name: str, statement: ast.stmt) -> bool:
+        if name == 'dup':
+            [x] = self._pop(1, statement)
+            self._values += [x, x]
+        elif name == 'swap':
+            x, y = self._pop(2, statement)
+            self._values += [y, x]
+        elif name == 'drop':
+            self._pop(1, statement)
+        elif name == 'over':
+            x, y = self._pop(2, statement)
+            self._values += [x, y, x]
+        elif name == 'nip':
+            _, y = self._pop(2, statement)
+            self._values.append(y)
+        elif name in _binary_operators:
+            x, y = self._pop(2, statement)
+            operator = _binary_operators[name]
+            if isinstance(operator, ast.operator):
+                result: ast.expr = ast.BinOp(left=x, op=operator, right=y)
+            else:
+                result = ast.Compare(left=x, ops=[operator], comparators=[y])
+            self._push_local(result, statement)
+        else:
+            return False
+        return True
+
+    def _pop(self, count: int, statement: ast.stmt) -> list[ast.expr]:
+        """Pop values, taking any that are missing from the real stack."""
+        while len(self._values) < count:
+            # The top of the real stack is right below the pending values.
+            local = self._new_local()
+            self._emit(local, _stack_pop(), statement)
+            self._values.insert(0, ast.Name(id=local, ctx=ast.Load()))
+        values = self._values[len(self._values) - count :]
+        del self._values[len(self._values) - count :]
+        return values
+
+    def _push_local(self, value: ast.expr, statement: ast.stmt) -> None:
+        local = self._new_local()
+        self._emit(local, value, statement)
+        self._values.append(ast.Name(id=local, ctx=ast.Load()))
+
+    def _spill(self, statement: ast.stmt) -> None:
+        for value in self._values:
+            self._statements.append(
+                ast.copy_location(
+                    ast.Expr(value=append_to_stack(value)), statement
+                )
+            )
+        self._values = []
+
+    def _emit(self, local: str, value: ast.expr, statement: ast.stmt) -> None:
+        assignment = ast.Assign(
+            targets=[ast.Name(id=local, ctx=ast.Store())], value=value
+        )
+        self._statements.append(ast.copy_location(assignment, statement))
+
+    def _new_local(self) -> str:
+        local = f'@@concat_local_{self._next_local}'
+        self._next_local += 1
+        return local
+
+
+def _stack_pop() -> ast.Call:
+    return ast.Call(
+        func=ast.Attribute(
+            value=ast.Name(id='stack', ctx=ast.Load()),
+            attr='pop',
+            ctx=ast.Load(),
+        ),
+        args=[],
+        keywords=[],
+    )
+
+
+def _is_stack_method_call(node: ast.expr, method: str) -> bool:
+    return (
+        isinstance(node, ast.Attribute)
+        and node.attr == method
+        and _name_id(node.value) == 'stack'
+    )
+
+
+def _is_stack_pop(node: ast.expr) -> bool:
+    return (
+        isinstance(node, ast.Call)
+        and _is_stack_method_call(node.func, 'pop')
+        and not node.args
+        and not node.keywords
+    )
+
+
+def _mentions_stack(node: ast.expr) -> bool:
+    return any(
+        _name_id(child) in ('stack', 'stash')
+        for child in ast.walk(node)
+        if isinstance(child, ast.expr)
+    )
+
+
+def _is_word_call(node: ast.expr) -> bool:
+    """Whether node is `word(stack, stash)`."""
+    return (
+        isinstance(node, ast.Call)
+        and not node.keywords
+        and [_name_id(arg) for arg in node.args] == ['stack', 'stash']
+    )
+
+
+def _is_word_abstraction(node: ast.Lambda) -> bool:
+    """Whether node is `lambda stack, stash: ...` and can be inlined."""
+    args = node.args
+    return (
+        [arg.arg for arg in args.args] == ['stack', 'stash']
+        and not args.posonlyargs
+        and args.vararg is None
+        and not args.kwonlyargs
+        and args.kwarg is None
+        and not args.defaults
+        # Assignment expressions would bind names in the enclosing scope.
+        and not any(isinstance(n, ast.NamedExpr) for n in ast.walk(node.body))
+    )
+
+
+def _is_quotation_literal(node: ast.Call) -> bool:
+    """Whether node is `concat.stdlib.types.Quotation([...])`."""
+    return (
+        isinstance(node.func, ast.Attribute)
+        and node.func.attr == 'Quotation'
+        and ast.unparse(node.func) == 'concat.stdlib.types.Quotation'
+        and len(node.args) == 1
+        and isinstance(node.args[0], ast.List)
+        and not node.keywords
+    )
+
+
+def _free_names(node: ast.AST) -> set[str]:
+    """Return the names node uses that it doesn't bind itself."""
+    if isinstance(node, ast.Name):
+        return {node.id}
+    if isinstance(node, ast.Lambda):
+        defaults = [*node.args.defaults, *node.args.kw_defaults]
+        return (_free_names(node.body) - _parameters(node.args)).union(
+            *(_free_names(default) for default in defaults if default)
+        )
+    return set().union(
+        *(_free_names(child) for child in ast.iter_child_nodes(node))
+    )
+
+
+def _parameters(args: ast.arguments) -> set[str]:
+    return {
+        arg.arg
+        for arg in [*args.posonlyargs, *args.args, *args.kwonlyargs]
+        + [args.vararg, args.kwarg]
+        if arg is not None
+    }
+
+
+def _arguments(*names: str) -> ast.arguments:
+    return ast.arguments(
+        posonlyargs=[],
+        args=[ast.arg(name, None) for name in names],
+        vararg=None,
+        kwonlyargs=[],
+        kw_defaults=[],
+        kwarg=None,
+        defaults=[],
+    )
+
+
+def _name_id(node: ast.expr) -> str | None:
+    return node.id if isinstance(node, ast.Name) else None
+
+
+def _located(statements: list[ast.stmt], node: ast.stmt) -> list[ast.stmt]:
+    for statement in statements:
+        for child in ast.walk(statement):
+            if 'lineno' in child._attributes:
+                ast.copy_location(child, node)
+    return statements
+
+
+def _bound_names(module: ast.Module) -> set[str]:
+    """Return every name the module binds, in any scope."""
+    return set(_bound_names_in(module))
+
+
+def _names_defined_once(module: ast.Module) -> set[str]:
+    """Return the names bound only by one top-level def or class."""
+    bindings = collections.Counter(_bound_names_in(module))
+    return {
+        statement.name
+        for statement in module.body
+        if isinstance(
+            statement, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+        )
+        and bindings[statement.name] == 1
+    }
+
+
+def _bound_names_in(tree: ast.AST) -> Iterator[str]:
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and not isinstance(node.ctx, ast.Load):
+            yield node.id
+        elif isinstance(
+            node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+        ):
+            yield node.name
+        elif isinstance(node, ast.arg):
+            if node.arg not in ('stack', 'stash'):
+                yield node.arg
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                if alias.name == '*':
+                    # Anything could be bound.
+                    yield from _shuffle_word_bodies
+                    yield 'push'
+                else:
+                    yield (alias.asname or alias.name).split('.')[0]
@@ -191,6 +191,13 @@ class _Tree23:
                 else:
                     t = r
 
+    def __contains__(self, d: object) -> bool:
+        try:
+            return self.search(d)[0]
+        except TypeError:
+            # d can't be ordered with the elements of the tree
+            return any(el == d for el in self)
+
     def __iter__(self) -> Iterator:
         if self.is_leaf():
             return
@@ -0,0 +1,184 @@
+"""Compiling Concat programs to standalone Python modules.
+
+`python -m concat compile program.cat -o program.py` type checks and
+transpiles the program ahead of time, then writes the Python equivalent.
+Running the output only needs the Concat runtime: the preamble of
+concat.execute and the standard library. Nothing is lexed, parsed or type
+checked at startup.
+
+The transpiler and the optimizer use names that aren't Python identifiers,
+like `@@concat_constant_0`, `+` and `is`. These are renamed in the output
+(e.g. to `_concat_constant_0` and `_concat_name_2b`). The names the
+program gets from the preamble are copied to their new names after the
+preamble runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import keyword
+import pathlib
+import sys
+from collections.abc import Sequence
+
+import concat
+import concat.lex
+import concat.optimize
+import concat.parser_combinators
+import concat.typecheck
+from concat.error_reporting import (
+    print_parse_error,
+    print_static_analysis_error,
+    tokenize_printing_errors,
+)
+
+
+def compile_program(
+    tokens: Sequence[concat.lex.Token],
+    source_dir: pathlib.Path,
+    optimization_level: int = 0,
+) -> ast.Module:
+    """Type check, transpile and optimize a program.
+
+    Raises ParseError if the program didn't parse, and StaticAnalysisError if
+    it doesn't type check."""
+    from concat.transpile import parse, transpile_ast, typecheck
+
+    concat_ast = parse(tokens)
+    concat_ast.assert_no_parse_errors()
+    typecheck(concat_ast, str(source_dir))
+    module = transpile_ast(concat_ast)
+    if optimization_level:
+        module = concat.optimize.optimize(
+            module,
+            straight_line=optimization_level >= 2,
+            compile_quotations=optimization_level >= 2,
+        )
+    return module
+
+
+def to_python_source(module: ast.Module, source_name: str) -> str:
+    """Return the source of a standalone module that runs module."""
+    import concat.execute
+
+    preamble: dict[str, object] = {}
+    concat.execute._do_preamble(preamble)
+    renames: dict[str, str] = {}
+    for node in ast.walk(module):
+        if isinstance(node, ast.Name):
+            field = 'id'
+        elif isinstance(
+            node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+        ):
+            field = 'name'
+        elif isinstance(node, ast.arg):
+            field = 'arg'
+        else:
+            continue
+        name = getattr(node, field)
+        if not _is_identifier(name):
+            renames[name] = _python_identifier(name)
+            setattr(node, field, renames[name])
+    # The names the module binds itself were renamed everywhere, so only the
+    # ones from the preamble need aliases.
+    aliases = [
+        ast.Assign(
+            targets=[ast.Name(id=renames[name], ctx=ast.Store())],
+            value=ast.Subscript(
+                value=ast.Call(
+                    func=ast.Name(id='globals', ctx=ast.Load()),
+                    args=[],
+                    keywords=[],
+                ),
+                slice=ast.Constant(name),
+                ctx=ast.Load(),
+            ),
+        )
+        for name in sorted(renames)
+        if name in preamble
+    ]
+    has_imports = any(
+        isinstance(node, (ast.Import, ast.ImportFrom))
+        for node in ast.walk(module)
+    )
+    runtime = ast.parse(
+        'import concat.execute\n'
+        + ('import concat.importer\n' if has_imports else '')
+        + '\n'
+        + 'concat.execute._do_preamble(globals())\n'
+        + ('concat.importer.install()\n' if has_imports else '')
+    )
+    body = ast.unparse(
+        ast.fix_missing_locations(
+            ast.Module(body=[*aliases, *module.body], type_ignores=[])
+        )
+    )
+    return (
+        f'# Compiled from {source_name} by Concat {concat.version}.\n'
+        f'# Do not edit.\n'
+        f'{ast.unparse(runtime)}\n\n{body}\n'
+    )
+
+
+def _is_identifier(name: str) -> bool:
+    return name.isidentifier() and not keyword.iskeyword(name)
+
+
+def _python_identifier(name: str) -> str:
+    if name.startswith('@@') and _is_identifier(name[2:]):
+        return '_' + name[2:]
+    if keyword.iskeyword(name):
+        return '_concat_name_' + name
+    return '_concat_name_' + '_'.join(f'{ord(char):x}' for char in name)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        prog='python -m concat compile',
+        description=(
+            'Compile a Concat program to a standalone Python module that '
+            'runs without the Concat compiler.'
+        ),
+    )
+    arg_parser.add_argument(
+        'source', type=pathlib.Path, help='the program to compile'
+    )
+    arg_parser.add_argument(
+        '-o',
+        '--output',
+        type=pathlib.Path,
+        help=(
+            'where to write the Python module (default: the source with a '
+            '.py suffix)'
+        ),
+    )
+    arg_parser.add_argument(
+        '-O',
+        dest='optimize',
+        action='count',
+        default=0,
+        help='optimize like `python -m concat -O` (give twice for -OO)',
+    )
+    args = arg_parser.parse_args(argv)
+    output = args.output or args.source.with_suffix('.py')
+
+    with args.source.open() as file:
+        tokens, has_lexical_errors = tokenize_printing_errors(file)
+        if has_lexical_errors:
+            return 1
+        try:
+            module = compile_program(tokens, args.source.parent, args.optimize)
+        except concat.parser_combinators.ParseError as e:
+            print_parse_error(e, file, tokens)
+            return 1
+        except concat.typecheck.StaticAnalysisError as e:
+            e.set_path_if_missing(args.source)
+            print_static_analysis_error(e, file)
+            return 1
+    output.write_text(to_python_source(module, args.source.name))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
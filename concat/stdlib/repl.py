@@ -48,9 +48,7 @@ def _parse(code: str) -> concat.parse.TopLevelNode:
 
 
 def _transpile(code: concat.parse.TopLevelNode) -> ast.Module:
-    transpiler = concat.transpile.VisitorDict[concat.parse.Node, ast.AST]()
-    transpiler.extend_with(concat.transpile.extension)
-    return cast(ast.Module, transpiler.visit(code))
+    return concat.transpile.transpile_ast(code)
 
 
 def _need_continuation(line: str) -> bool:
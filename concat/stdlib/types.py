@@ -1,7 +1,107 @@
-from typing import List
+from typing import Callable, Iterable, List, Optional
 
 
 class Quotation(list):
     def __call__(self, stack: List[object], stash: List[object]) -> None:
         for element in self:
             element(stack, stash)
+
+
+class CompiledQuotation(Quotation):
+    """A quotation whose words were compiled into one function.
+
+    The optimizer (see concat.optimize) creates these for quotations that
+    don't change. Calling one calls the function. The list of words is only
+    created, by calling words, the first time the quotation is used as a
+    sequence. Once the list has been changed, calling the quotation calls
+    each word like any other quotation."""
+
+    def __init__(
+        self,
+        function: Callable[[List[object], List[object]], None],
+        words: Callable[[], Iterable[object]],
+    ) -> None:
+        super().__init__()
+        self._function: Optional[
+            Callable[[List[object], List[object]], None]
+        ] = function
+        self._words: Optional[Callable[[], Iterable[object]]] = words
+
+    def __call__(self, stack: List[object], stash: List[object]) -> None:
+        if self._function is None:
+            super().__call__(stack, stash)
+        else:
+            self._function(stack, stash)
+
+    def __radd__(self, other: object) -> List[object]:
+        # list.__add__ reads the words of its right operand directly. Python
+        # tries this first since CompiledQuotation is a subclass of list.
+        if not isinstance(other, list):
+            return NotImplemented
+        self._create_words(False)
+        return list.__add__(other, self)
+
+    def __reduce__(self) -> tuple:
+        return Quotation, (list(self),)
+
+    def _create_words(self, changing: bool) -> None:
+        if self._words is not None:
+            words, self._words = self._words, None
+            list.extend(self, words())
+        if changing:
+            self._function = None
+
+
+def _creating_words(name: str, changing: bool) -> Callable:
+    method = getattr(list, name)
+
+    def wrapper(self: CompiledQuotation, *args, **kwargs):
+        self._create_words(changing)
+        # Methods like __add__ and __eq__ read the words of other lists
+        # directly.
+        for arg in args:
+            if isinstance(arg, CompiledQuotation):
+                arg._create_words(False)
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    return wrapper
+
+
+for _name in [
+    '__iter__',
+    '__reversed__',
+    '__len__',
+    '__getitem__',
+    '__contains__',
+    '__eq__',
+    '__ne__',
+    '__lt__',
+    '__le__',
+    '__gt__',
+    '__ge__',
+    '__repr__',
+    '__add__',
+    '__mul__',
+    '__rmul__',
+    'copy',
+    'count',
+    'index',
+]:
+    setattr(CompiledQuotation, _name, _creating_words(_name, False))
+for _name in [
+    '__setitem__',
+    '__delitem__',
+    '__iadd__',
+    '__imul__',
+    'append',
+    'clear',
+    'extend',
+    'insert',
+    'pop',
+    'remove',
+    'reverse',
+    'sort',
+]:
+    setattr(CompiledQuotation, _name, _creating_words(_name, True))
+del _name
@@ -21,3 +21,57 @@ class TestQuotations(unittest.TestCase):
         self.assertEqual(
             ['c'], stack, msg='quotations do not behave correctly when called'
         )
+
+
+class TestCompiledQuotations(unittest.TestCase):
+    def setUp(self) -> None:
+        self.words_created = 0
+
+        def words() -> List[object]:
+            self.words_created += 1
+            return [lambda stack, _: stack.append('word')]
+
+        self.quote = concat.stdlib.types.CompiledQuotation(
+            lambda stack, _: stack.append('function'), words
+        )
+
+    def test_calling_calls_the_function(self) -> None:
+        stack: List[object] = []
+        self.quote(stack, [])
+        self.assertEqual(['function'], stack)
+        self.assertEqual(0, self.words_created)
+
+    def test_words_are_created_once_when_used_as_sequence(self) -> None:
+        self.assertEqual(1, len(self.quote))
+        self.assertEqual(1, len(list(self.quote)))
+        self.assertTrue(callable(self.quote[0]))
+        self.assertEqual(1, self.words_created)
+
+    def test_changed_quotation_calls_its_words(self) -> None:
+        self.quote.append(self.quote[0])
+        stack: List[object] = []
+        self.quote(stack, [])
+        self.assertEqual(['word', 'word'], stack)
+
+    def test_quotation_plus_compiled_quotation_has_the_words(self) -> None:
+        other = concat.stdlib.types.Quotation(['other'])
+        self.assertEqual(2, len(other + self.quote))
+
+    def test_list_plus_compiled_quotation_has_the_words(self) -> None:
+        self.assertEqual(2, len(['other'] + self.quote))
+
+    def test_compiled_quotation_plus_quotation_has_the_words(self) -> None:
+        other = concat.stdlib.types.Quotation(['other'])
+        self.assertEqual(2, len(self.quote + other))
+
+    def test_compiled_quotations_plus_each_other_have_the_words(self) -> None:
+        other = concat.stdlib.types.CompiledQuotation(
+            lambda stack, _: None, lambda: [1]
+        )
+        self.assertEqual(2, len(self.quote + other))
+        self.assertEqual([1], other)
+
+    def test_copy_has_the_words(self) -> None:
+        copy = self.quote.copy()
+        self.assertNotIsInstance(copy, concat.stdlib.types.CompiledQuotation)
+        self.assertEqual(1, len(copy))
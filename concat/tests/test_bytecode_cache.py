@@ -0,0 +1,70 @@
+import pathlib
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import concat.bytecode_cache
+import concat.fingerprint
+
+source = '1 drop\n'
+
+
+class TestBytecodeCache(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.source_path = pathlib.Path(temp_dir.name) / 'program.cat'
+        self.code = compile('x = 1', str(self.source_path), 'exec')
+        patcher = mock.patch.object(sys, 'dont_write_bytecode', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_uncached_program_misses(self) -> None:
+        self.assertIsNone(concat.bytecode_cache.load(self.source_path, source))
+
+    def test_cached_program_hits(self) -> None:
+        concat.bytecode_cache.store(self.source_path, source, self.code)
+        self.assertEqual(
+            self.code, concat.bytecode_cache.load(self.source_path, source)
+        )
+
+    def test_cache_is_in_pycache(self) -> None:
+        concat.bytecode_cache.store(self.source_path, source, self.code)
+        path = concat.bytecode_cache.cache_path(self.source_path)
+        self.assertEqual('__pycache__', path.parent.name)
+        self.assertTrue(path.exists())
+
+    def test_changed_source_misses(self) -> None:
+        concat.bytecode_cache.store(self.source_path, source, self.code)
+        self.assertIsNone(
+            concat.bytecode_cache.load(self.source_path, source + 'nop\n')
+        )
+
+    def test_changed_compiler_misses(self) -> None:
+        concat.bytecode_cache.store(self.source_path, source, self.code)
+        with mock.patch.object(
+            concat.fingerprint,
+            'compiler_fingerprint',
+            return_value=bytes(32),
+        ):
+            self.assertIsNone(
+                concat.bytecode_cache.load(self.source_path, source)
+            )
+
+    def test_corrupt_cache_misses(self) -> None:
+        concat.bytecode_cache.store(self.source_path, source, self.code)
+        path = concat.bytecode_cache.cache_path(self.source_path)
+        path.write_bytes(path.read_bytes()[:40])
+        self.assertIsNone(concat.bytecode_cache.load(self.source_path, source))
+
+    def test_dont_write_bytecode_is_respected(self) -> None:
+        with mock.patch.object(sys, 'dont_write_bytecode', True):
+            concat.bytecode_cache.store(self.source_path, source, self.code)
+        self.assertIsNone(concat.bytecode_cache.load(self.source_path, source))
+
+    def test_failed_replace_removes_temporary_file(self) -> None:
+        with mock.patch('os.replace', side_effect=PermissionError):
+            concat.bytecode_cache.store(self.source_path, source, self.code)
+        path = concat.bytecode_cache.cache_path(self.source_path)
+        self.assertEqual([], list(path.parent.iterdir()))
@@ -7,8 +7,11 @@ NOTE: This must be run from project root!
 from scripttest import TestFileEnvironment  # type: ignore
 import unittest
 import os
+import subprocess
 import sys
 import os.path
+import tempfile
+from collections.abc import Iterator
 
 env = TestFileEnvironment('./test-output', cwd='.')
 example_dir = './concat/examples'
@@ -31,8 +34,74 @@ class TestExamplePrograms(unittest.TestCase):
         input as a string literal, a newline, and '# OUT: ' followed by the
         expected standard output.
         """
+        self._test_examples()
+
+    def test_optimized_examples(self):
+        """Test each example with the peephole optimizer turned on."""
+        self._test_examples('-O')
+
+    def test_straight_line_examples(self):
+        """Test each example with straight-line function bodies."""
+        self._test_examples('-OO')
+
+    def test_standalone_examples(self):
+        """Test each example compiled to a standalone Python module."""
+        environ = dict(os.environ)
+        environ['PYTHONPATH'] = os.pathsep.join(
+            [os.getcwd(), *filter(None, [environ.get('PYTHONPATH')])]
+        )
+        with tempfile.TemporaryDirectory() as output_dir:
+            for name, inp, out in self._examples():
+                with self.subTest(example=name):
+                    module = os.path.join(output_dir, 'example.py')
+                    subprocess.run(
+                        [
+                            sys.executable,
+                            '-m',
+                            'concat',
+                            'compile',
+                            '-OO',
+                            name,
+                            '-o',
+                            module,
+                        ],
+                        check=True,
+                    )
+                    actual = subprocess.run(
+                        [sys.executable, module],
+                        input=inp,
+                        capture_output=True,
+                        text=True,
+                        check=True,
+                        env=environ,
+                    )
+                    self.assertEqual(actual.stdout, out)
+
+    def _test_examples(self, *options: str) -> None:
+        for name, inp, out in self._examples():
+            with self.subTest(example=name):
+                # scripttest fails loudly if concat exits with a nonzero code.
+                # Caching is turned off so that each example is type checked
+                # by the current type checker every time.
+                actual = env.run(
+                    sys.executable,
+                    '-m',
+                    'coverage',
+                    'run',
+                    '-m',
+                    'concat',
+                    '--no-cache',
+                    *options,
+                    name,
+                    stdin=inp.encode(),
+                    expect_stderr=True,
+                )
+                self.assertEqual(actual.stdout, out)
+
+    def _examples(self) -> Iterator[tuple[str, str, str]]:
+        """Yield the name, input and expected output of each example."""
         for name in examples:
-            with open(name) as spec, self.subTest(example=name):
+            with open(name) as spec:
                 inp = spec.readline()
 
                 # Ignore the file?
@@ -51,16 +120,4 @@ class TestExamplePrograms(unittest.TestCase):
                         'No output specified for file {}'.format(name)
                     )
                 out = eval(out[len(out_start) :].strip())
-                # scripttest fails loudly if concat exits with a nonzero code
-                actual = env.run(
-                    sys.executable,
-                    '-m',
-                    'coverage',
-                    'run',
-                    '-m',
-                    'concat',
-                    name,
-                    stdin=inp.encode(),
-                    expect_stderr=True,
-                )
-                self.assertEqual(actual.stdout, out)
+            yield name, inp, out
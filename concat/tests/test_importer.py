@@ -0,0 +1,121 @@
+import os
+import pathlib
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import concat.bytecode_cache
+import concat.importer
+import concat.stdlib.importlib
+from concat.typecheck import StaticAnalysisError
+from concat.typecheck.stubs import StubResolver
+
+
+class TestImporter(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.directory = pathlib.Path(temp_dir.name).resolve()
+        (self.directory / 'cat_helper.cat').write_text(
+            'def inc(x:int -- y:int): 1 +\n'
+        )
+        (self.directory / 'cat_package').mkdir()
+        (self.directory / 'cat_package' / '__init__.cat').write_text(
+            'from cat_helper import inc\n'
+            'def twice(x:int -- y:int): dup +\n'
+            '20 inc twice\n'
+        )
+        (self.directory / 'cat_broken.cat').write_text('1 "a" +\n')
+        (self.directory / 'later').mkdir()
+        (self.directory / 'later' / 'csv.cat').write_text('1\n')
+        self.enterContext(
+            mock.patch.object(
+                sys,
+                'path',
+                [
+                    str(self.directory),
+                    *sys.path,
+                    str(self.directory / 'later'),
+                ],
+            )
+        )
+        self.enterContext(
+            mock.patch.object(sys, 'path_hooks', list(sys.path_hooks))
+        )
+        self.enterContext(mock.patch.object(sys, 'path_importer_cache', {}))
+        self.enterContext(mock.patch.object(sys, 'dont_write_bytecode', False))
+        self.enterContext(
+            mock.patch.dict(
+                os.environ, {'XDG_CACHE_HOME': str(self.directory / 'xdg')}
+            )
+        )
+        self.addCleanup(self.forget_modules)
+        concat.importer.install()
+
+    def forget_modules(self) -> None:
+        for name in ['cat_helper', 'cat_package', 'cat_broken']:
+            sys.modules.pop(name, None)
+
+    def test_module_is_self_pushing(self) -> None:
+        import cat_helper  # type: ignore
+
+        self.assertIsInstance(cat_helper, concat.stdlib.importlib.Module)
+        stack: list[object] = []
+        cat_helper(stack, [])
+        self.assertEqual([cat_helper], stack)
+
+    def test_definitions_can_be_called(self) -> None:
+        import cat_helper
+
+        stack: list[object] = [41]
+        cat_helper.inc(stack, [])
+        self.assertEqual([42], stack)
+
+    def test_package_runs_with_its_own_stack(self) -> None:
+        import cat_package  # type: ignore
+
+        self.assertEqual([42], cat_package.stack)
+
+    def test_compiled_module_is_cached(self) -> None:
+        import cat_helper  # noqa: F401
+
+        path = self.directory / 'cat_helper.cat'
+        self.assertIsNotNone(
+            concat.bytecode_cache.load(path, path.read_text())
+        )
+
+    def test_dont_write_bytecode_is_respected(self) -> None:
+        with mock.patch.object(sys, 'dont_write_bytecode', True):
+            import cat_helper  # noqa: F401
+
+        self.assertFalse((self.directory / '__pycache__').exists())
+        self.assertFalse((self.directory / 'xdg').exists())
+
+    def test_install_is_idempotent(self) -> None:
+        concat.importer.install()
+        self.assertEqual(1, sys.path_hooks.count(concat.importer.path_hook))
+
+    def test_earlier_python_module_is_imported(self) -> None:
+        with mock.patch.dict(sys.modules):
+            sys.modules.pop('csv', None)
+            import csv
+
+        self.assertEqual('.py', pathlib.Path(csv.__file__).suffix)
+
+    def test_stub_of_earlier_python_module_is_found(self) -> None:
+        self.assertEqual(
+            '.cati',
+            StubResolver().resolve('csv', self.directory).suffix,
+        )
+
+    def test_ill_typed_module_is_not_imported(self) -> None:
+        with self.assertRaises(StaticAnalysisError) as cm:
+            import cat_broken  # type: ignore # noqa: F401
+        self.assertEqual(self.directory / 'cat_broken.cat', cm.exception.path)
+
+    def test_module_is_its_own_stub(self) -> None:
+        self.assertEqual(
+            self.directory / 'cat_helper.cat',
+            StubResolver().resolve('cat_helper', self.directory),
+        )
@@ -3,8 +3,11 @@ Test the main driver that you would run with `python -m concat`.
 """
 
 import contextlib
+import os
+import pathlib
 import subprocess
 import sys
+import tempfile
 import unittest
 from typing import Iterator
 
@@ -83,3 +86,76 @@ class TestTokenizer(unittest.TestCase):
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
         )
+
+
+class TestDebugOutput(unittest.TestCase):
+    def run_concat(self, directory: pathlib.Path, *args: str) -> None:
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(
+            [os.getcwd(), *filter(None, [env.get('PYTHONPATH')])]
+        )
+        subprocess.run(
+            [sys.executable, '-m', 'concat', *args],
+            input='1 drop\n',
+            text=True,
+            check=True,
+            timeout=60,
+            cwd=directory,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def test_no_debug_output_by_default(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            self.run_concat(pathlib.Path(directory), '--no-cache')
+            self.assertEqual([], os.listdir(directory))
+
+    def test_emit_python_and_dump_ast(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory)
+            self.run_concat(
+                path,
+                '--no-cache',
+                '--emit-python',
+                'out.py',
+                '--dump-ast',
+                'ast.txt',
+            )
+            self.assertIn('drop', (path / 'out.py').read_text())
+            self.assertIn('AST DUMP', (path / 'ast.txt').read_text())
+
+
+class TestTypeCheckStatistics(unittest.TestCase):
+    def test_skipped_check_is_reported(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = pathlib.Path(directory)
+            (path / 'program.cat').write_text('1 drop\n')
+            env = dict(os.environ)
+            env['XDG_CACHE_HOME'] = str(path / 'cache')
+            env.pop('PYTHONDONTWRITEBYTECODE', None)
+            env['PYTHONPATH'] = os.pathsep.join(
+                [os.getcwd(), *filter(None, [env.get('PYTHONPATH')])]
+            )
+            outputs = [
+                subprocess.run(
+                    [
+                        sys.executable,
+                        '-m',
+                        'concat',
+                        '--typecheck-stats',
+                        'program.cat',
+                    ],
+                    stdin=subprocess.DEVNULL,
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                    timeout=60,
+                    cwd=directory,
+                    env=env,
+                )
+                for _ in range(2)
+            ]
+        self.assertIn('"total"', outputs[0].stderr)
+        self.assertIn('skipped', outputs[1].stderr)
+        self.assertNotIn('"total"', outputs[1].stderr)
@@ -0,0 +1,171 @@
+import ast
+import unittest
+
+import concat.execute
+import concat.stdlib.types
+from concat.benchmarks import parse
+from concat.optimize import optimize
+from concat.transpile import transpile_ast
+
+
+def run(module: ast.Module) -> list[object]:
+    globals: dict[str, object] = {}
+    concat.execute.execute('<test>', module, globals)
+    return list(globals['stack'])  # type: ignore
+
+
+def called_names(module: ast.Module) -> set[str]:
+    return {
+        node.func.id
+        for node in ast.walk(module)
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+    }
+
+
+def function_named(module: ast.Module, name: str) -> ast.FunctionDef:
+    return next(
+        node
+        for node in module.body
+        if isinstance(node, ast.FunctionDef) and node.name == name
+    )
+
+
+class TestPeepholeOptimizer(unittest.TestCase):
+    def assert_same_behavior(self, source: str) -> ast.Module:
+        expected = run(transpile_ast(parse(source)))
+        optimized = optimize(transpile_ast(parse(source)))
+        self.assertEqual(expected, run(optimized))
+        return optimized
+
+    def test_shuffle_words_are_inlined(self) -> None:
+        module = self.assert_same_behavior(
+            '1 2 3 dup drop swap over nip 4 5 swap\n'
+        )
+        self.assertTrue(
+            called_names(module).isdisjoint(
+                {'dup', 'drop', 'swap', 'over', 'nip', 'push'}
+            )
+        )
+
+    def test_immediately_called_lambdas_are_inlined(self) -> None:
+        module = self.assert_same_behavior("'abc' $.upper\n")
+        self.assertFalse(
+            any(isinstance(node, ast.Lambda) for node in ast.walk(module))
+        )
+
+    def test_rebound_words_are_not_inlined(self) -> None:
+        module = self.assert_same_behavior(
+            'def dup(x:int -- y:int z:int): 1\n1 dup\n'
+        )
+        self.assertIn('dup', called_names(module))
+
+    def test_constant_closures_are_hoisted_out_of_functions(self) -> None:
+        module = optimize(
+            transpile_ast(parse("def f(--): $(1 'a' 1 drop drop drop) drop\n"))
+        )
+        function = next(
+            node for node in module.body if isinstance(node, ast.FunctionDef)
+        )
+        self.assertNotIn('push', called_names(ast.Module(function.body, [])))
+        assignments = [
+            node for node in module.body if isinstance(node, ast.Assign)
+        ]
+        self.assertEqual(2, len(assignments))
+
+    def test_equal_constants_of_different_types_are_not_shared(self) -> None:
+        module = optimize(
+            transpile_ast(parse('def f(--): $(1 1.0 True drop) drop\n'))
+        )
+        assignments = [
+            node for node in module.body if isinstance(node, ast.Assign)
+        ]
+        self.assertEqual(2, len(assignments))
+
+
+class TestStraightLineFunctions(unittest.TestCase):
+    def assert_same_behavior(self, source: str) -> ast.Module:
+        expected = run(transpile_ast(parse(source)))
+        optimized = optimize(transpile_ast(parse(source)), straight_line=True)
+        self.assertEqual(expected, run(optimized))
+        return optimized
+
+    def test_arithmetic_uses_locals(self) -> None:
+        module = self.assert_same_behavior(
+            'def f(x:int -- y:int): dup 1 + swap drop 2 - dup +\n3 f\n'
+        )
+        body = function_named(module, 'f').body
+        stack_operations = [
+            node
+            for node in ast.walk(ast.Module(body, []))
+            if isinstance(node, ast.Attribute)
+            and node.attr in ('pop', 'append')
+        ]
+        self.assertEqual(2, len(stack_operations))
+
+    def test_values_are_spilled_before_unknown_words(self) -> None:
+        self.assert_same_behavior(
+            'def g(x:int -- y:int): 1 +\n'
+            'def f(x:int -- y:int z:int): 1 swap g 2 over nip\n'
+            '3 f\n'
+        )
+
+    def test_pushed_attributes(self) -> None:
+        self.assert_same_behavior(
+            "def f(-- x:int y:str): 1 'abc' $.join drop 'b' 'a' < drop 'c'\n"
+            'f\n'
+        )
+
+    def test_body_without_effect(self) -> None:
+        module = self.assert_same_behavior('def f(--): 1 drop\nf\n')
+        self.assertIsInstance(function_named(module, 'f').body[0], ast.Pass)
+
+
+class TestQuotationCompiler(unittest.TestCase):
+    def compile(self, source: str) -> ast.Module:
+        return optimize(transpile_ast(parse(source)), compile_quotations=True)
+
+    def test_same_behavior(self) -> None:
+        source = (
+            'def f(x:int -- y:int):\n'
+            '  True $(1 + dup drop) $(2 +) choose (1 + $(3 drop) drop)\n'
+            '0 f f\n'
+        )
+        expected = run(transpile_ast(parse(source)))
+        self.assertEqual(expected, run(self.compile(source)))
+
+    def test_each_evaluation_creates_a_quotation(self) -> None:
+        module = self.compile('def f(--): $(1 dup)\nf f\n')
+        first, second = run(module)
+        self.assertIsInstance(first, concat.stdlib.types.CompiledQuotation)
+        self.assertIsNot(first, second)
+        first.clear()  # type: ignore
+        self.assertEqual(2, len(second))  # type: ignore
+        self.assertIs(first._function, None)  # type: ignore
+        self.assertIsNotNone(second._function)  # type: ignore
+
+    def test_quotation_is_still_a_sequence(self) -> None:
+        [quotation] = run(self.compile('def f(--): $(1 dup)\nf\n'))
+        self.assertEqual(2, len(quotation))  # type: ignore
+        stack: list[object] = []
+        for word in quotation:  # type: ignore
+            word(stack, [])
+        self.assertEqual([1, 1], stack)
+
+    def test_called_quotations_call_the_function(self) -> None:
+        module = self.compile('def f(-- x:int): (1 dup drop)\nf\n')
+        self.assertNotIn('Quotation', ast.unparse(function_named(module, 'f')))
+        self.assertEqual([1], run(module))
+
+    def test_quotations_of_local_names_are_not_compiled(self) -> None:
+        module = self.compile('def f(--):\n  def g(--): ()\n  $(g) drop\n')
+        self.assertIn('Quotation([g])', ast.unparse(module))
+
+    def test_quotations_of_rebound_names_are_not_compiled(self) -> None:
+        module = self.compile(
+            'def g(--): ()\ndef f(--): $(g) drop\ndef g(--): ()\n'
+        )
+        self.assertIn('Quotation([g])', ast.unparse(module))
+
+    def test_quotations_of_defined_names_are_compiled(self) -> None:
+        module = self.compile('def g(--): ()\ndef f(--): $(g) drop\n')
+        self.assertNotIn('Quotation([g])', ast.unparse(module))
@@ -33,3 +33,11 @@ class TestInsertionOrderedSet(unittest.TestCase):
         insertion_order_set = insertion_order_set | insertion_order_to_add
         actual_order = list(insertion_order_set)
         self.assertListEqual(expected_order, actual_order)
+
+    @given(st.sets(st.integers()), st.integers())
+    def test_membership(self, elements: Set[int], x: int) -> None:
+        insertion_order_set = InsertionOrderedSet(list(elements))
+        self.assertEqual(x in elements, x in insertion_order_set)
+
+    def test_membership_of_unorderable_element(self) -> None:
+        self.assertNotIn('a', InsertionOrderedSet([1, 2, 3]))
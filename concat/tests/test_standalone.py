@@ -0,0 +1,66 @@
+import contextlib
+import io
+import pathlib
+import tempfile
+import unittest
+
+import concat.standalone
+
+
+class TestStandalone(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.dir = pathlib.Path(temp_dir.name)
+        self.source = self.dir / 'program.cat'
+        self.output = self.dir / 'program.py'
+
+    def compile(self, program: str, *options: str) -> int:
+        self.source.write_text(program)
+        self.messages = io.StringIO()
+        with contextlib.redirect_stdout(self.messages):
+            return concat.standalone.main(
+                [*options, str(self.source), '-o', str(self.output)]
+            )
+
+    def run_output(self) -> list[object]:
+        namespace: dict[str, object] = {}
+        exec(self.output.read_text(), namespace)
+        return list(namespace['stack'])  # type: ignore
+
+    def test_output_runs_without_compiler(self) -> None:
+        program = 'def f(x:int -- y:int): 1 +\n1 f 2 + True None $(3) drop\n'
+        for options in [[], ['-O'], ['-OO']]:
+            with self.subTest(options=options):
+                self.assertEqual(0, self.compile(program, *options))
+                output = self.output.read_text()
+                self.assertNotIn('concat.transpile', output)
+                self.assertEqual([4, True, None], self.run_output())
+
+    def test_output_has_only_python_identifiers(self) -> None:
+        self.compile('1 2 + $(1 dup) drop\n', '-OO')
+        self.assertNotIn('@@', self.output.read_text())
+
+    def test_unknown_names_are_left_unbound(self) -> None:
+        self.compile('def f(--): 1 1 == drop\n1\n')
+        self.assertEqual([1], self.run_output())
+
+    def test_type_errors_are_reported(self) -> None:
+        self.assertEqual(1, self.compile('1 $.upper\n'))
+        self.assertFalse(self.output.exists())
+
+    def test_parse_errors_are_reported(self) -> None:
+        self.assertEqual(1, self.compile('1 $\n'))
+        self.assertIn('Parse Error:', self.messages.getvalue())
+        self.assertFalse(self.output.exists())
+
+    def test_lexical_errors_are_reported(self) -> None:
+        self.assertEqual(1, self.compile('def f(:\n1\n'))
+        self.assertIn('Lexical error:', self.messages.getvalue())
+        self.assertFalse(self.output.exists())
+
+    def test_default_output_is_next_to_source(self) -> None:
+        self.source.write_text('1\n')
+        with contextlib.redirect_stdout(io.StringIO()):
+            concat.standalone.main([str(self.source)])
+        self.assertTrue(self.output.exists())
@@ -205,3 +205,54 @@ class TestSubVisitors(unittest.TestCase):
                 astunparse.unparse(py_node),
                 msg='keyword arguments were not transpiled',
             )
+
+    def test_import_statement_makes_every_component_self_pushing(
+        self,
+    ) -> None:
+        node = concat.parse.ImportStatementNode('a.b.c', (0, 0), (0, 0))
+
+        for py_node in self._test_visitors(
+            node, {'import-statement', 'statement'}, ast.stmt
+        ):
+            source = astunparse.unparse(py_node)
+            for target in ['a', 'a.b', 'a.b.c']:
+                self.assertIn(
+                    f'{target}.__class__ = concat.stdlib.importlib.Module',
+                    source,
+                )
+
+    def test_quote_constructor_can_be_changed(self) -> None:
+        visitors = concat.visitors.VisitorDict[concat.parse.Node, ast.AST]()
+        visitors.extend_with(concat.transpile.extension)
+        visitors.data['quote-constructor-string'] = 'my.Quotation'
+        node = concat.parse.QuoteWordNode([], (0, 0), (0, 0))
+
+        py_node = visitors['quote-word'].visit(node)
+
+        self.assertEqual(
+            astunparse.unparse(py_node).strip(), 'my.Quotation([])'
+        )
+
+
+class TestSharedTranspiler(unittest.TestCase):
+    def test_transpiler_is_built_once(self) -> None:
+        self.assertIs(
+            concat.transpile.transpiler(), concat.transpile.transpiler()
+        )
+
+    def test_reuse_gives_the_same_result(self) -> None:
+        tokens = [
+            r.token
+            for r in concat.lex.tokenize('$(1 $.real) drop\nimport a.b\n')
+            if r.type == 'token'
+        ]
+        concat_ast = concat.transpile.parse(tokens)
+
+        first = concat.transpile.transpile_ast(concat_ast)
+        second = concat.transpile.transpile_ast(concat_ast)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(
+            ast.dump(first, include_attributes=True),
+            ast.dump(second, include_attributes=True),
+        )
@@ -1,3 +1,4 @@
+import sys
 import unittest
 from textwrap import dedent
 from typing import Dict, List, cast
@@ -270,6 +271,20 @@ class TestTypeChecker(unittest.TestCase):
             )
         )
 
+    def test_deeply_nested_quotations(self) -> None:
+        [number] = [t for t in lex_string('1') if t.type == 'NUMBER']
+        quotation: concat.parse.WordNode = concat.parse.NumberWordNode(number)
+        for _ in range(sys.getrecursionlimit()):
+            quotation = concat.parse.QuoteWordNode([quotation], (1, 0), (1, 0))
+        ty, _ = context.infer(default_env, [quotation], is_top_level=True)
+        self.assertEqual(1, len(ty.output.as_sequence()))
+
+    def test_nested_type_error_has_location(self) -> None:
+        tree = parse('(1 (1 "a" +))\n')
+        with self.assertRaises(ConcatTypeError) as cm:
+            context.infer(default_env, tree.children, is_top_level=True)
+        self.assertEqual((1, 10), cm.exception.location)
+
 
 class TestStackEffectParser(unittest.TestCase):
     _a_bar = concat.typecheck.SequenceVariable()
@@ -0,0 +1,75 @@
+import unittest
+
+from concat.visitors import (
+    FunctionalVisitor,
+    VisitFailureException,
+    VisitorDict,
+    alt,
+    assert_annotated_type,
+    fail,
+)
+
+
+class TestTypeDispatch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.visited: list[str] = []
+        self.visitors = VisitorDict[object, str](dispatch_on_type=True)
+        self.visitors.extend_with(self.extension)
+
+    def extension(self, visitors: VisitorDict[object, str]) -> None:
+        visitors['top-level'] = fail
+
+        @visitors.add_alternative_to('top-level', 'int')
+        @assert_annotated_type
+        def int_visitor(node: int) -> str:
+            self.visited.append('int')
+            return 'int'
+
+        @visitors.add_alternative_to('top-level', 'str')
+        @assert_annotated_type
+        def str_visitor(node: str) -> str:
+            self.visited.append('str')
+            return 'str'
+
+    def test_only_alternatives_for_the_type_are_tried(self) -> None:
+        @FunctionalVisitor
+        def untyped(node: object) -> str:
+            self.visited.append('untyped')
+            raise VisitFailureException(node)
+
+        self.visitors['top-level'] = alt(untyped, self.visitors['top-level'])
+
+        self.assertEqual(self.visitors.visit('a'), 'str')
+        self.assertEqual(self.visited, ['untyped', 'str'])
+
+    def test_subclasses_are_accepted(self) -> None:
+        self.assertEqual(self.visitors.visit(True), 'int')
+
+    def test_untyped_alternatives_are_tried_in_order(self) -> None:
+        self.visitors.add_alternative_to(
+            'top-level', 'any', FunctionalVisitor(lambda node: 'any')
+        )
+
+        self.assertEqual(self.visitors.visit(1), 'int')
+        self.assertEqual(self.visitors.visit(1.0), 'any')
+
+    def test_no_alternative_fails(self) -> None:
+        with self.assertRaises(VisitFailureException):
+            self.visitors.visit(1.0)
+
+    def test_changes_are_seen(self) -> None:
+        self.visitors.visit(1)
+        self.visitors['int'] = assert_annotated_type(self.negative)
+
+        self.assertEqual(self.visitors.visit(1), 'negative')
+
+    def test_same_result_without_dispatch(self) -> None:
+        visitors = VisitorDict[object, str]()
+        visitors.extend_with(self.extension)
+
+        for node in [1, 'a', True]:
+            self.assertEqual(visitors.visit(node), self.visitors.visit(node))
+
+    @staticmethod
+    def negative(node: int) -> str:
+        return 'negative'
@@ -0,0 +1,67 @@
+import unittest
+
+from concat.typecheck import TypeChecker
+from concat.typecheck.context import change_context
+from concat.typecheck.env import Environment
+from concat.typecheck.substitutions import Substitutions
+from concat.typecheck.types import ItemKind, ItemVariable, ObjectType
+
+context = TypeChecker()
+context.load_builtins_and_preamble()
+closed_type = ObjectType({})
+
+
+def setUpModule() -> None:
+    unittest.enterModuleContext(change_context(context))
+
+
+class TestFreeTypeVariables(unittest.TestCase):
+    def test_union(self) -> None:
+        a, b = ItemVariable(ItemKind), ItemVariable(ItemKind)
+        env = Environment({'x': a, 'y': closed_type})
+        self.assertEqual({a}, set(env.free_type_variables(context)))
+        env |= {'z': ObjectType({'attr': b})}
+        self.assertEqual({a, b}, set(env.free_type_variables(context)))
+
+    def test_overridden_entry(self) -> None:
+        a = ItemVariable(ItemKind)
+        env = Environment({'x': a})
+        env.free_type_variables(context)
+        env |= {'x': closed_type}
+        self.assertFalse(env.free_type_variables(context))
+
+    def test_bound_variable(self) -> None:
+        a = ItemVariable(ItemKind)
+        env = Environment({'x': a})
+        env.free_type_variables(context)
+        with context.substitutions.push():
+            a.constrain_and_bind_variables(context, closed_type, set(), [])
+            self.assertFalse(env.free_type_variables(context))
+        self.assertEqual({a}, set(env.free_type_variables(context)))
+
+    def test_variable_bound_in_undone_frame(self) -> None:
+        a = ItemVariable(ItemKind)
+        env = Environment({'x': a})
+        with context.substitutions.push():
+            a.constrain_and_bind_variables(context, closed_type, set(), [])
+            self.assertFalse(env.free_type_variables(context))
+        self.assertEqual({a}, set(env.free_type_variables(context)))
+
+    def test_with_mutuals(self) -> None:
+        a = ItemVariable(ItemKind)
+        env = Environment({'x': a}).with_mutuals('x', lambda _, t: t)
+        self.assertEqual({a}, set(env.free_type_variables(context)))
+
+
+class TestApplySubstitution(unittest.TestCase):
+    def test_no_free_variables_substituted(self) -> None:
+        env = Environment({'x': closed_type})
+        sub = Substitutions([(ItemVariable(ItemKind), closed_type)])
+        self.assertIs(env, env.apply_substitution(context, sub))
+
+    def test_substitution(self) -> None:
+        a, b = ItemVariable(ItemKind), ItemVariable(ItemKind)
+        env = Environment({'x': a, 'y': closed_type})
+        env = env.apply_substitution(context, Substitutions([(a, b)]))
+        self.assertEqual({b}, set(env.free_type_variables(context)))
+        self.assertIs(closed_type, env['y'])
@@ -0,0 +1,69 @@
+import unittest
+
+import concat.lex
+from concat.transpile import parse
+from concat.typecheck.errors import TypeError as ConcatTypeError
+from concat.typecheck.incremental import IncrementalTypeChecker
+
+program = """def f(x:int -- y:int): 1 +
+def g(x:int -- y:int): f f
+def h(-- s:str): 'a'
+"""
+
+
+def check(type_checker: IncrementalTypeChecker, source: str) -> None:
+    tokens = [
+        r.token for r in concat.lex.tokenize(source) if r.type == 'token'
+    ]
+    type_checker.check(source, parse(tokens))
+
+
+class TestIncrementalTypeChecker(unittest.TestCase):
+    def setUp(self) -> None:
+        self.type_checker = IncrementalTypeChecker()
+        check(self.type_checker, program)
+
+    def test_first_check_checks_everything(self) -> None:
+        self.assertEqual(
+            ['f', 'g', 'h'], self.type_checker.rechecked_definitions
+        )
+
+    def test_unchanged_program(self) -> None:
+        check(self.type_checker, program)
+        self.assertEqual([], self.type_checker.rechecked_definitions)
+
+    def test_changed_independent_definition(self) -> None:
+        check(self.type_checker, program.replace("'a'", "'b'"))
+        self.assertEqual(['h'], self.type_checker.rechecked_definitions)
+
+    def test_changed_body_with_same_type(self) -> None:
+        check(self.type_checker, program.replace('1 +', '2 +'))
+        self.assertEqual(['f'], self.type_checker.rechecked_definitions)
+
+    def test_changed_type_rechecks_dependents(self) -> None:
+        new_program = program.replace(
+            'def f(x:int -- y:int): 1 +', "def f(x:int -- y:str): drop 'c'"
+        ).replace(': f f', ': f drop 0')
+        check(self.type_checker, new_program)
+        self.assertEqual(['f', 'g'], self.type_checker.rechecked_definitions)
+
+    def test_errors_in_dependents_are_found(self) -> None:
+        new_program = program.replace(
+            'def f(x:int -- y:int): 1 +', "def f(x:int -- y:str): drop 'c'"
+        )
+        with self.assertRaises(ConcatTypeError):
+            check(self.type_checker, new_program)
+
+    def test_moved_definition_is_not_rechecked(self) -> None:
+        check(self.type_checker, '\n\n' + program)
+        self.assertEqual([], self.type_checker.rechecked_definitions)
+
+    def test_restart_checks_everything(self) -> None:
+        self.type_checker.restart_interval = 2
+        check(self.type_checker, program)
+        context = self.type_checker.context
+        check(self.type_checker, program)
+        self.assertIsNot(context, self.type_checker.context)
+        self.assertEqual(
+            ['f', 'g', 'h'], self.type_checker.rechecked_definitions
+        )
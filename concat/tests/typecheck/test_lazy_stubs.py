@@ -0,0 +1,70 @@
+import pathlib
+import tempfile
+import unittest
+
+import concat.lex
+from concat.transpile import parse
+from concat.typecheck import StaticAnalysisError, TypeChecker
+
+stub = """class Box:
+  def get(--) @cast (py_function[(), Item]):
+    ()
+
+class Item:
+  ()
+
+def make_box(-- b:Box):
+  ()
+"""
+broken_definition = """
+def broken(-- x:not_a_type):
+  ()
+"""
+
+
+class TestLazyStubs(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.source_dir = pathlib.Path(temp_dir.name).resolve()
+        self.stub_path = self.source_dir / 'big.cati'
+        (self.source_dir / 'big.py').touch()
+        self.stub_path.write_text(stub + broken_definition)
+        self.context = TypeChecker()
+        self.env = self.context.load_builtins_and_preamble()
+
+    def check(self, source: str) -> None:
+        tokens = [
+            r.token for r in concat.lex.tokenize(source) if r.type == 'token'
+        ]
+        self.context.check(
+            self.env, parse(tokens).children, str(self.source_dir)
+        )
+
+    def test_unused_definitions_are_not_checked(self) -> None:
+        self.check('from big import make_box\nmake_box drop\n')
+
+    def test_used_definition_is_checked(self) -> None:
+        with self.assertRaises(StaticAnalysisError) as cm:
+            self.check('from big import broken\n')
+        self.assertEqual(self.stub_path, cm.exception.path)
+
+    def test_whole_module_is_checked_for_plain_import(self) -> None:
+        with self.assertRaises(StaticAnalysisError):
+            self.check('import big\n')
+
+    def test_imports_share_types(self) -> None:
+        self.check(
+            'from big import make_box\nfrom big import Box\n'
+            'def f(b:Box --): drop\n'
+            'make_box f\n'
+        )
+
+    def test_whole_module_reuses_checked_definitions(self) -> None:
+        self.stub_path.write_text(stub)
+        self.check('from big import Box\n')
+        box = self.context._import_from_stub(self.stub_path, 'Box')
+        self.check('import big\n')
+        self.assertIs(
+            box, self.context._module_namespaces[self.stub_path]['Box']
+        )
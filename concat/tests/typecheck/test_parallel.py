@@ -0,0 +1,110 @@
+import multiprocessing
+import re
+import unittest
+from unittest.mock import patch
+
+import concat.lex
+import concat.typecheck.parallel
+from concat.transpile import parse
+from concat.typecheck import StaticAnalysisError, TypeChecker
+from concat.typecheck.env import Environment
+
+
+def check(source: str, workers: int) -> Environment:
+    tokens = [
+        r.token for r in concat.lex.tokenize(source) if r.type == 'token'
+    ]
+    context = TypeChecker()
+    env = context.load_builtins_and_preamble()
+    return context.check(env, parse(tokens).children, workers=workers)
+
+
+def without_ids(message: str) -> str:
+    """Replace the object IDs in the representations of types."""
+    return re.sub(r'\b(0x[0-9a-f]+|[0-9]{6,})\b', '<id>', message)
+
+
+@unittest.skipUnless(
+    'fork' in multiprocessing.get_all_start_methods(),
+    'worker processes are forked',
+)
+@patch.object(concat.typecheck.parallel, 'min_parallel_bodies', 1)
+class TestParallelBodies(unittest.TestCase):
+    def test_well_typed_program(self) -> None:
+        source = """def f(x:int -- y:int): 1 +
+def g(x:int -- y:int): f f
+"""
+        env = check(source, workers=2)
+        self.assertIn('g', env)
+
+    def test_body_error_location(self) -> None:
+        source = """def f(x:int -- y:int): 1 +
+def g(x:int -- y:str): f
+def h(x:int -- y:str): f
+"""
+        with self.assertRaises(StaticAnalysisError) as sequential:
+            check(source, workers=1)
+        with self.assertRaises(StaticAnalysisError) as parallel:
+            check(source, workers=2)
+        self.assertEqual(
+            sequential.exception.location, parallel.exception.location
+        )
+        self.assertEqual((2, 0), parallel.exception.location)
+
+    def test_body_error_before_top_level_error(self) -> None:
+        source = """def f(x:int -- y:str): 1 +
+undefined_name
+"""
+        with self.assertRaises(StaticAnalysisError) as cm:
+            check(source, workers=2)
+        self.assertEqual((1, 0), cm.exception.location)
+
+    def test_specialized_declared_type_falls_back(self) -> None:
+        source = """def f(-- x:`t): 1
+def g(-- y:str): f
+"""
+        with self.assertRaises(StaticAnalysisError):
+            check(source, workers=1)
+        with self.assertRaises(StaticAnalysisError):
+            check(source, workers=2)
+
+    def test_body_errors_are_the_same_as_sequential_errors(self) -> None:
+        sources = {
+            'name error': 'def f(x:int -- y:int): undefined_name\n',
+            'attribute error': 'def f(x:int -- y:int): $.undefined\n',
+            'incompatible declared type': 'def f(x:int -- y:int): drop\n',
+        }
+        for kind, source in sources.items():
+            with self.subTest(error=kind):
+                with self.assertRaises(StaticAnalysisError) as sequential:
+                    check(source, workers=1)
+                with self.assertRaises(StaticAnalysisError) as parallel:
+                    check(source, workers=2)
+                self.assertIs(
+                    type(sequential.exception), type(parallel.exception)
+                )
+                self.assertEqual(
+                    without_ids(str(sequential.exception)),
+                    without_ids(str(parallel.exception)),
+                )
+                self.assertIs(
+                    type(sequential.exception.__cause__),
+                    type(parallel.exception.__cause__),
+                )
+
+    def test_fallback_starts_from_a_clean_type_checker(self) -> None:
+        source = """def f(-- x:`t): 1
+def g(-- y:int): f
+"""
+        binding_counts = []
+        for workers in [1, 2]:
+            tokens = [
+                r.token
+                for r in concat.lex.tokenize(source)
+                if r.type == 'token'
+            ]
+            context = TypeChecker()
+            env = context.load_builtins_and_preamble()
+            context.check(env, parse(tokens).children, workers=workers)
+            binding_counts.append(len(context.substitutions))
+        self.assertEqual(binding_counts[0], binding_counts[1])
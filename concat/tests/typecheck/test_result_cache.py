@@ -0,0 +1,80 @@
+import pathlib
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import concat.fingerprint
+import concat.lex
+from concat.transpile import parse, typecheck
+from concat.typecheck.result_cache import TypeCheckResultCache
+from concat.typecheck.stubs import StubResolver
+
+program = 'from helper import value\nvalue drop\n'
+
+
+class TestTypeCheckResultCache(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        root = pathlib.Path(temp_dir.name).resolve()
+        self.source_dir = root / 'src'
+        self.source_dir.mkdir()
+        (self.source_dir / 'helper.py').touch()
+        self.stub_path = self.source_dir / 'helper.cati'
+        self.stub_path.write_text('def value(-- x:int):\n  ()\n')
+        self.cache = TypeCheckResultCache(root / 'cache')
+        patcher = mock.patch.object(sys, 'dont_write_bytecode', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def check_and_record(self, source: str) -> None:
+        tokens = [
+            r.token for r in concat.lex.tokenize(source) if r.type == 'token'
+        ]
+        context = typecheck(parse(tokens), str(self.source_dir))
+        self.cache.record(source, self.source_dir, context)
+
+    def is_checked(self, source: str) -> bool:
+        return self.cache.is_checked(source, self.source_dir, StubResolver())
+
+    def test_unchecked_program_misses(self) -> None:
+        self.assertFalse(self.is_checked(program))
+
+    def test_checked_program_hits(self) -> None:
+        self.check_and_record(program)
+        self.assertTrue(self.is_checked(program))
+
+    def test_changed_source_misses(self) -> None:
+        self.check_and_record(program)
+        self.assertFalse(self.is_checked(program + 'value drop\n'))
+
+    def test_changed_stub_misses(self) -> None:
+        self.check_and_record(program)
+        self.stub_path.write_text('def value(-- x:str):\n  ()\n')
+        self.assertFalse(self.is_checked(program))
+
+    def test_missing_stub_misses(self) -> None:
+        self.check_and_record(program)
+        self.stub_path.unlink()
+        self.assertFalse(self.is_checked(program))
+
+    def test_corrupt_entry_misses(self) -> None:
+        self.check_and_record(program)
+        for entry in self.cache.directory.iterdir():
+            entry.write_text('{')
+        self.assertFalse(self.is_checked(program))
+
+    def test_changed_compiler_misses(self) -> None:
+        self.check_and_record(program)
+        with mock.patch.object(
+            concat.fingerprint,
+            'compiler_fingerprint',
+            return_value=b'another compiler',
+        ):
+            self.assertFalse(self.is_checked(program))
+
+    def test_dont_write_bytecode_is_respected(self) -> None:
+        with mock.patch.object(sys, 'dont_write_bytecode', True):
+            self.check_and_record(program)
+        self.assertFalse(self.is_checked(program))
@@ -0,0 +1,97 @@
+import pathlib
+import tempfile
+import unittest
+
+import concat.lex
+from concat.transpile import parse
+from concat.typecheck import TypeChecker
+from concat.typecheck.errors import TypeError as ConcatTypeError
+from concat.typecheck.statistics import CONSTRAIN, TypeCheckStatistics
+
+program = """def f(x:int -- y:int): 1 +
+def g(x:int -- y:int): f f
+def h(-- s:str): 'a'
+3 f
+"""
+
+
+def check(
+    statistics: TypeCheckStatistics,
+    source: str,
+    source_dir: pathlib.Path = pathlib.Path('.'),
+) -> None:
+    tokens = [
+        r.token for r in concat.lex.tokenize(source) if r.type == 'token'
+    ]
+    context = TypeChecker()
+    env = context.load_builtins_and_preamble()
+    context.statistics = statistics
+    context.check(env, parse(tokens).children, str(source_dir))
+
+
+class TestTypeCheckStatistics(unittest.TestCase):
+    statistics: TypeCheckStatistics
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.statistics = TypeCheckStatistics()
+        check(cls.statistics, program)
+
+    def test_definitions(self) -> None:
+        self.assertEqual(
+            ['f', 'g', 'h', '<top level>'], list(self.statistics.definitions)
+        )
+        self.assertEqual(2, self.statistics.definitions['<top level>'].nodes)
+
+    def test_node_kinds(self) -> None:
+        node_kinds = self.statistics.node_kinds
+        self.assertEqual(3, node_kinds['FuncdefStatementNode'].nodes)
+        # + in f, f f in g and f at the top level.
+        self.assertEqual(4, node_kinds['NameWordNode'].nodes)
+
+    def test_node_kind_times_add_up_to_total(self) -> None:
+        total_time = sum(
+            stats.time for stats in self.statistics.node_kinds.values()
+        )
+        self.assertAlmostEqual(self.statistics.total.time, total_time)
+
+    def test_events_are_attributed_to_definitions(self) -> None:
+        total = self.statistics.total.events[CONSTRAIN]
+        per_definition = sum(
+            stats.events[CONSTRAIN]
+            for stats in self.statistics.definitions.values()
+        )
+        self.assertGreater(total, 0)
+        self.assertEqual(total, per_definition)
+
+    def test_to_json(self) -> None:
+        json = self.statistics.to_json()
+        self.assertEqual(
+            self.statistics.definitions['f'].nodes,
+            json['definitions']['f']['nodes'],
+        )
+        self.assertIn(CONSTRAIN, json['total'])
+
+    def test_failed_check_still_balances_nodes(self) -> None:
+        statistics = TypeCheckStatistics()
+        with self.assertRaises(ConcatTypeError):
+            check(statistics, "def f(x:int -- y:int): drop 'a'\n")
+        self.assertEqual(1, statistics.definitions['f'].nodes)
+        self.assertFalse(statistics._node_stack)
+
+    def test_stub_definitions_are_not_counted_as_definitions(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            source_dir = pathlib.Path(directory)
+            (source_dir / 'helper.py').touch()
+            (source_dir / 'helper.cati').write_text(
+                'def value(-- x:int):\n  ()\n'
+            )
+            statistics = TypeCheckStatistics()
+            check(
+                statistics,
+                'from helper import value\nimport helper\n'
+                'def f(-- x:int): value\n',
+                source_dir,
+            )
+        self.assertEqual(['<top level>', 'f'], list(statistics.definitions))
+        self.assertEqual(2, statistics.definitions['<top level>'].nodes)
@@ -0,0 +1,81 @@
+import json
+import pathlib
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from concat.typecheck.errors import TypeError as ConcatTypeError
+from concat.typecheck.stubs import StubIndex, StubResolver, builtin_stubs_dir
+
+fixtures_dir = (pathlib.Path(__file__) / '../../fixtures').resolve()
+
+
+class TestStubResolver(unittest.TestCase):
+    def test_finds_stubs_next_to_module(self) -> None:
+        self.assertEqual(
+            fixtures_dir / 'imported_module.cati',
+            StubResolver().resolve('imported_module', fixtures_dir),
+        )
+
+    def test_builtin_module(self) -> None:
+        self.assertEqual(
+            (builtin_stubs_dir / 'itertools.cati').resolve(),
+            StubResolver().resolve('itertools', fixtures_dir),
+        )
+
+    def test_repeated_imports_do_not_search_again(self) -> None:
+        resolver = StubResolver()
+        resolver.resolve('imported_module', fixtures_dir)
+        with patch('sys.meta_path', []):
+            self.assertEqual(
+                fixtures_dir / 'imported_module.cati',
+                resolver.resolve('imported_module', fixtures_dir),
+            )
+
+    def test_missing_module(self) -> None:
+        with self.assertRaises(ConcatTypeError):
+            StubResolver().resolve('not_a_real_module', fixtures_dir)
+
+    def test_index_is_used_before_finders(self) -> None:
+        stub_path = pathlib.Path('/site-packages/fake.cati')
+        resolver = StubResolver(StubIndex({'fake': stub_path}))
+        with patch('sys.meta_path', []):
+            self.assertEqual(stub_path, resolver.resolve('fake', fixtures_dir))
+
+
+class TestStubIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = pathlib.Path(temp_dir.name).resolve()
+        (self.root / 'package/sub').mkdir(parents=True)
+        for path in [
+            'top.cati',
+            'package/__init__.cati',
+            'package/sub/module.cati',
+            'package/sub/module.py',
+        ]:
+            (self.root / path).touch()
+
+    def test_build(self) -> None:
+        index = StubIndex.build(self.root)
+        self.assertEqual(3, len(index))
+        self.assertEqual(self.root / 'top.cati', index.get('top'))
+        self.assertEqual(
+            self.root / 'package/__init__.cati', index.get('package')
+        )
+        self.assertEqual(
+            self.root / 'package/sub/module.cati',
+            index.get('package.sub.module'),
+        )
+
+    def test_save_and_load(self) -> None:
+        index_path = self.root / 'index.json'
+        StubIndex.build(self.root).save(index_path, self.root)
+        modules = json.loads(index_path.read_text())['modules']
+        self.assertEqual(
+            pathlib.Path('package/sub/module.cati'),
+            pathlib.Path(modules['package.sub.module']),
+        )
+        index = StubIndex.load(index_path)
+        self.assertEqual(self.root / 'top.cati', index.get('top'))
@@ -1,24 +1,45 @@
+import pickle
+import sys
 import unittest
 
 from concat.typecheck import (
     TypeChecker,
 )
 from concat.typecheck.context import change_context
+from concat.typecheck.errors import StackMismatchError
 from concat.typecheck.errors import TypeError as ConcatTypeError
+from concat.typecheck.statistics import (
+    OVERLOAD_SELECTION_HIT,
+    OVERLOAD_SKIP,
+    TypeCheckStatistics,
+)
 from concat.typecheck.substitutions import Substitutions
 from concat.typecheck.types import (
     BoundVariable,
+    Brand,
+    DelayedSubstitution,
     Fix,
     GenericType,
+    GenericTypeKind,
     IndividualKind,
     ItemKind,
     ItemVariable,
+    NominalType,
     ObjectType,
+    PythonFunctionType,
+    PythonOverloadedType,
+    SequenceKind,
     SequenceVariable,
     StackEffect,
+    SubtypingCache,
     TupleKind,
+    Type,
+    TypeInterner,
     TypeSequence,
     TypeTuple,
+    Variable,
+    VariableArgumentKind,
+    VariableArgumentPack,
 )
 
 context = TypeChecker()
@@ -184,6 +205,137 @@ class TestTypeSequence(unittest.TestCase):
             )
         )
 
+    def test_deeper_than_recursion_limit(self) -> None:
+        depth = sys.getrecursionlimit() * 2
+        rest = SequenceVariable()
+        items = [ItemVariable(ItemKind) for _ in range(depth)]
+        variables = [ItemVariable(ItemKind) for _ in range(depth)]
+        subtype = TypeSequence(context, items)
+        supertype = TypeSequence(context, [rest, *variables])
+        with context.substitutions.push():
+            subtype.constrain_and_bind_variables(context, supertype, set(), [])
+            self.assertTrue(items[0].equals(context, variables[0]))
+            self.assertTrue(rest.equals(context, TypeSequence(context, [])))
+
+    def test_mismatch_reports_whole_sequences(self) -> None:
+        subtype = TypeSequence(context, [context.int_type] * 3)
+        supertype = TypeSequence(context, [context.int_type] * 4)
+        with self.assertRaises(StackMismatchError) as cm:
+            subtype.constrain_and_bind_variables(context, supertype, set(), [])
+        self.assertIs(cm.exception._actual, subtype)
+        self.assertIs(cm.exception._expected, supertype)
+
+
+class TestSubtypingCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self._old_cache = context.subtyping_cache
+        context.subtyping_cache = SubtypingCache()
+        self.addCleanup(setattr, context, 'subtyping_cache', self._old_cache)
+
+    def test_positive_result_is_reused(self) -> None:
+        ty, object_type = context.int_type, context.object_type
+        ty.constrain_and_bind_variables(context, object_type, set(), [])
+        ty.constrain_and_bind_variables(context, object_type, set(), [])
+        self.assertEqual(context.subtyping_cache.hits, 1)
+
+    def test_negative_result_is_reused(self) -> None:
+        sub, sup = context.object_type, context.int_type
+        with self.assertRaises(ConcatTypeError) as first:
+            sub.constrain_and_bind_variables(context, sup, set(), [])
+        first.exception.set_location_if_missing((1, 0))
+        with self.assertRaises(ConcatTypeError) as second:
+            sub.constrain_and_bind_variables(context, sup, set(), [])
+        self.assertEqual(context.subtyping_cache.hits, 1)
+        self.assertIsNone(second.exception.location)
+
+    def test_types_with_free_variables_are_not_cached(self) -> None:
+        ty = ObjectType({'__add__': ItemVariable(IndividualKind)})
+        context.int_type.constrain_and_bind_variables(context, ty, set(), [])
+        self.assertEqual(context.subtyping_cache.hits, 0)
+        self.assertEqual(context.subtyping_cache.misses, 0)
+
+
+class TestTypeInterner(unittest.TestCase):
+    def setUp(self) -> None:
+        self.interner = TypeInterner()
+
+    def _effect(self, *inputs: Type) -> StackEffect:
+        return StackEffect(
+            TypeSequence(context, inputs), TypeSequence(context, [])
+        )
+
+    def test_identical_closed_types_share_an_object(self) -> None:
+        first = self._effect(ObjectType({}))
+        second = self._effect(ObjectType({}))
+        self.assertIs(self.interner.intern(context, first), first)
+        self.assertIs(self.interner.intern(context, second), first)
+        self.assertEqual(self.interner.hits, 1)
+
+    def test_different_types_are_kept_apart(self) -> None:
+        first = self._effect(ObjectType({}))
+        second = self._effect(ObjectType({}), ObjectType({}))
+        self.interner.intern(context, first)
+        self.assertIs(self.interner.intern(context, second), second)
+
+    def test_types_with_free_variables_are_not_interned(self) -> None:
+        first = ObjectType({'x': ItemVariable(ItemKind)})
+        second = ObjectType({'x': first.attributes(context)['x']})
+        self.interner.intern(context, first)
+        self.assertIs(self.interner.intern(context, second), second)
+        self.assertEqual(self.interner.size, 0)
+
+    def test_named_types_are_not_merged(self) -> None:
+        first, second = ObjectType({}), ObjectType({})
+        second.set_internal_name('named')
+        self.interner.intern(context, first)
+        self.assertIs(self.interner.intern(context, second), second)
+
+    def test_identical_types_share_subtyping_judgements(self) -> None:
+        old_cache = context.subtyping_cache
+        old_interner = context.type_interner
+        self.addCleanup(setattr, context, 'subtyping_cache', old_cache)
+        self.addCleanup(setattr, context, 'type_interner', old_interner)
+        context.subtyping_cache = SubtypingCache()
+        context.type_interner = self.interner
+        judgements = []
+        for _ in range(2):
+            self._effect(ObjectType({})).constrain_and_bind_variables(
+                context, self._effect(ObjectType({})), set(), []
+            )
+            cache = context.subtyping_cache
+            judgements.append((cache.hits, cache.misses))
+        (first_hits, first_misses), (second_hits, second_misses) = judgements
+        self.assertGreater(second_hits, first_hits)
+        self.assertEqual(second_misses, first_misses)
+
+
+class TestDelayedSubstitution(unittest.TestCase):
+    def test_nested_substitutions_are_composed(self) -> None:
+        a, b, c = (ItemVariable(ItemKind) for _ in range(3))
+        unrelated = ItemVariable(ItemKind)
+        ty = ObjectType({'x': a})
+        inner_bindings: dict[Variable, Type] = {a: b}
+        inner = DelayedSubstitution(context, Substitutions(inner_bindings), ty)
+        outer_bindings: dict[Variable, Type] = {
+            b: c,
+            unrelated: ObjectType({}),
+        }
+        outer = DelayedSubstitution(
+            context, Substitutions(outer_bindings), inner
+        )
+        self.assertIs(outer._ty, ty)
+        self.assertEqual([a], list(outer._sub))
+        self.assertIs(c, outer._sub[a])
+
+    def test_provenance_is_not_tracked_by_default(self) -> None:
+        a = ItemVariable(ItemKind)
+        bindings: dict[Variable, Type] = {a: ObjectType({})}
+        sub = Substitutions(bindings)
+        sub.add_subtyping_provenance((ObjectType({}), ObjectType({})))
+        composed = sub.apply_substitution(context, Substitutions())
+        self.assertEqual([], sub.subtyping_provenance)
+        self.assertEqual([], composed.subtyping_provenance)
+
 
 class TestGeneric(unittest.TestCase):
     def test_generalize(self) -> None:
@@ -264,3 +416,85 @@ class TestOverloadedFunctions(unittest.TestCase):
         self.assertFalse(t.free_type_variables(context))
         context.object_type.constrain_and_bind_variables(context, t, set(), [])
         self.assertTrue(context.object_type.equals(context, t))
+
+
+class TestOverloadResolution(unittest.TestCase):
+    def setUp(self) -> None:
+        self.a, self.b = (
+            NominalType(Brand(name, IndividualKind, []), ObjectType({}))
+            for name in 'ab'
+        )
+        self.overloaded = PythonOverloadedType(
+            VariableArgumentPack(
+                [
+                    self._function([self.a], self.a),
+                    self._function([self.a, self.b], self.a),
+                    self._function([self.b], self.b),
+                ]
+            )
+        )
+        self.statistics = TypeCheckStatistics()
+        context.statistics = self.statistics
+        self.addCleanup(setattr, context, 'statistics', None)
+
+    def _function(self, inputs: list[Type], output: Type) -> Type:
+        return PythonFunctionType(
+            context, TypeSequence(context, inputs), output
+        )
+
+    def _call(self, *arguments: Type) -> Type:
+        result = ItemVariable(IndividualKind)
+        self.overloaded.constrain_and_bind_variables(
+            context, self._function(list(arguments), result), set(), []
+        )
+        return result
+
+    def test_mismatched_overloads_are_skipped(self) -> None:
+        result = self._call(self.b)
+        self.assertTrue(result.equals(context, self.b))
+        self.assertEqual(2, self.statistics.total.events[OVERLOAD_SKIP])
+
+    def test_selection_is_reused(self) -> None:
+        self._call(self.a, self.b)
+        self.assertEqual(
+            0, self.statistics.total.events[OVERLOAD_SELECTION_HIT]
+        )
+        result = self._call(self.a, self.b)
+        self.assertTrue(result.equals(context, self.a))
+        self.assertEqual(
+            1, self.statistics.total.events[OVERLOAD_SELECTION_HIT]
+        )
+
+    def test_error_covers_every_overload(self) -> None:
+        with self.assertRaises(ConcatTypeError) as cm:
+            self._call(ObjectType({}))
+        cause = cm.exception.__cause__
+        assert isinstance(cause, ExceptionGroup)
+        self.assertEqual(3, len(cause.exceptions))
+
+
+class TestKinds(unittest.TestCase):
+    def test_equal_kinds_are_identical(self) -> None:
+        self.assertIs(
+            GenericTypeKind([TupleKind([ItemKind])], IndividualKind),
+            GenericTypeKind([TupleKind([ItemKind])], IndividualKind),
+        )
+        self.assertIs(
+            VariableArgumentKind(ItemKind), VariableArgumentKind(ItemKind)
+        )
+
+    def test_subkinding(self) -> None:
+        generic = GenericTypeKind([IndividualKind], IndividualKind)
+        self.assertLessEqual(generic, ItemKind)
+        self.assertLessEqual(IndividualKind, ItemKind)
+        self.assertFalse(ItemKind <= generic)
+        self.assertFalse(SequenceKind <= ItemKind)
+        self.assertLessEqual(
+            TupleKind([IndividualKind, generic]),
+            TupleKind([ItemKind, ItemKind]),
+        )
+
+    def test_pickled_kinds_stay_interned(self) -> None:
+        kind = GenericTypeKind([ItemKind], VariableArgumentKind(ItemKind))
+        self.assertIs(kind, pickle.loads(pickle.dumps(kind)))
+        self.assertIs(ItemKind, pickle.loads(pickle.dumps(ItemKind)))
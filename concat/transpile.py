@@ -10,11 +10,13 @@ Visser (2001): ACM SIGPLAN Notices 36(11):270-282 November 2001 DOI:
 10.1145/504311.504302"""
 
 import ast
-import astunparse  # type: ignore
+import functools
 from typing import Sequence, Type, cast
 from concat.lex import Token, tokenize
 import concat.parse
 import concat.typecheck
+from concat.typecheck.statistics import TypeCheckStatistics
+from concat.typecheck.stubs import StubIndex
 from concat.visitors import (
     All,
     Choice,
@@ -34,6 +36,7 @@ from concat.astutils import (
     assign_self_pushing_module_type_to_all_components,
     count_leading_dots,
     pack_expressions,
+    parse_py_qualified_name,
     pop_stack,
     remove_leading_dots,
     statementfy,
@@ -49,11 +52,20 @@ def parse(tokens: Sequence[Token]) -> concat.parse.TopLevelNode:
     return parser.parse(tokens)
 
 
-def typecheck(concat_ast: concat.parse.TopLevelNode, source_dir: str) -> None:
+def typecheck(
+    concat_ast: concat.parse.TopLevelNode,
+    source_dir: str,
+    workers: int = 1,
+    statistics: TypeCheckStatistics | None = None,
+    stub_index: StubIndex | None = None,
+) -> concat.typecheck.TypeChecker:
     tc_context = concat.typecheck.TypeChecker()
+    tc_context.stub_resolver.index = stub_index
     # FIXME: Consider the type of everything entered interactively beforehand.
     env = tc_context.load_builtins_and_preamble()
-    tc_context.check(env, concat_ast.children, source_dir)
+    tc_context.statistics = statistics
+    tc_context.check(env, concat_ast.children, source_dir, workers=workers)
+    return tc_context
 
 
 def transpile(code: str, source_dir: str = '.') -> ast.Module:
@@ -64,9 +76,33 @@ def transpile(code: str, source_dir: str = '.') -> ast.Module:
 
 
 def transpile_ast(concat_ast: concat.parse.TopLevelNode) -> ast.Module:
-    transpiler = VisitorDict[concat.parse.Node, ast.AST]()
-    transpiler.extend_with(extension)
-    return cast(ast.Module, transpiler.visit(concat_ast))
+    return cast(ast.Module, transpiler().visit(concat_ast))
+
+
+@functools.cache
+def transpiler() -> VisitorDict[concat.parse.Node, ast.AST]:
+    """Return the transpiler shared by everything in this process.
+
+    Building a transpiler creates every visitor in the extension, so it is
+    only done once. The visitors don't keep any state between nodes, so the
+    transpiler can be reused. Don't extend or modify it, though: make a new
+    VisitorDict for that."""
+    visitors = VisitorDict[concat.parse.Node, ast.AST](dispatch_on_type=True)
+    visitors.extend_with(extension)
+    return visitors
+
+
+def write_python_source(module: ast.Module, path: str) -> None:
+    """Write the Python equivalent of a transpiled module, for debugging."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(ast.unparse(module))
+
+
+def write_ast_dump(module: ast.Module, path: str) -> None:
+    """Write a dump of a transpiled module's AST, for debugging."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('------------ AST DUMP ------------\n')
+        f.write(ast.dump(module, include_attributes=True, indent='\t'))
 
 
 def extension(visitors: VisitorDict['concat.parse.Node', ast.AST]) -> None:
@@ -83,15 +119,6 @@ def extension(visitors: VisitorDict['concat.parse.Node', ast.AST]) -> None:
         module = ast.Module(body=statements, type_ignores=[])
         concat.astutils.copy_location(module, node)
         ast.fix_missing_locations(module)
-        # debugging output
-        try:
-            with open('debug.py', 'w') as f:
-                f.write(ast.unparse(module))
-            with open('ast.out', 'w') as f:
-                f.write('------------ AST DUMP ------------\n')
-                f.write(ast.dump(module, include_attributes=True, indent='\t'))
-        except UnicodeEncodeError:
-            pass
         return module
 
     visitors['top-level'] = cast(
@@ -137,11 +164,7 @@ def extension(visitors: VisitorDict['concat.parse.Node', ast.AST]) -> None:
             attr='__class__',
             ctx=ast.Store(),
         )
-        module_type = cast(
-            ast.Expression,
-            ast.parse('concat.stdlib.importlib.Module', mode='eval'),
-        ).body
-        concat.astutils.clear_locations(module_type)
+        module_type = parse_py_qualified_name('concat.stdlib.importlib.Module')
         assign = ast.Assign(targets=[class_store], value=module_type)
         import_node.lineno, import_node.col_offset = node.location
         assign.lineno, assign.col_offset = node.location
@@ -155,10 +178,8 @@ def extension(visitors: VisitorDict['concat.parse.Node', ast.AST]) -> None:
     ) -> ast.If:
         if_statement = cast(ast.If, core_import_statement_visitor.visit(node))
         cast(ast.Import, if_statement.body[0]).names[0].asname = node.asname
-        targets = cast(ast.Assign, if_statement.body[1]).targets
-        qualified_name = astunparse.unparse(targets[0])
         if_statement.body[1:] = (
-            assign_self_pushing_module_type_to_all_components(qualified_name)
+            assign_self_pushing_module_type_to_all_components(node.value)
         )
         concat.astutils.copy_location(if_statement, node)
         return if_statement
@@ -202,11 +223,9 @@ def extension(visitors: VisitorDict['concat.parse.Node', ast.AST]) -> None:
         This Python expression will be both a sequence and callable."""
         children = list(All(visitors.ref_visitor('word')).visit(node))
         lst = ast.List(elts=children, ctx=ast.Load())
-        quote_constructor = cast(
-            ast.Expression,
-            ast.parse(visitors.data['quote-constructor-string'], mode='eval'),
-        ).body
-        concat.astutils.clear_locations(quote_constructor)
+        quote_constructor = parse_py_qualified_name(
+            visitors.data['quote-constructor-string']
+        )
         py_node = ast.Call(func=quote_constructor, args=[lst], keywords=[])
         concat.astutils.copy_location(py_node, node)
         return py_node
@@ -217,8 +236,9 @@ def extension(visitors: VisitorDict['concat.parse.Node', ast.AST]) -> None:
     def pushed_attribute_visitor(
         node: concat.parse.AttributeWordNode,
     ) -> ast.expr:
-        top = cast(ast.Expression, ast.parse('stack.pop()', mode='eval')).body
-        concat.astutils.clear_locations(top)
+        top = ast.Call(
+            func=parse_py_qualified_name('stack.pop'), args=[], keywords=[]
+        )
         load = ast.Load()
         attribute = ast.Attribute(value=top, attr=node.value, ctx=load)
         concat.astutils.copy_location(attribute, node)
@@ -233,9 +253,13 @@ def extension(visitors: VisitorDict['concat.parse.Node', ast.AST]) -> None:
         pushed_node = node.children[0]
         if isinstance(pushed_node, concat.parse.FreezeWordNode):
             pushed_node = pushed_node.word
-        child = Choice(
-            visitors['pushed-word-special-case'], visitors['word']
-        ).visit(pushed_node)
+        child = cast(
+            ast.expr,
+            Choice(
+                visitors.ref_visitor('pushed-word-special-case'),
+                visitors.ref_visitor('word'),
+            ).visit(pushed_node),
+        )
         args = ast.arguments(
             args=[ast.arg('stack', None), ast.arg('stash', None)],
             posonlyargs=[],
@@ -245,11 +269,7 @@ def extension(visitors: VisitorDict['concat.parse.Node', ast.AST]) -> None:
             kwarg=None,
             defaults=[],
         )
-        stack_append = cast(
-            ast.Expression, ast.parse('stack.append', mode='eval')
-        ).body
-        concat.astutils.clear_locations(stack_append)
-        body = ast.Call(stack_append, [child], [])
+        body = append_to_stack(child)
         py_node = ast.Lambda(args, body)
         concat.astutils.copy_location(py_node, node)
         return py_node
@@ -383,7 +403,9 @@ def extension(visitors: VisitorDict['concat.parse.Node', ast.AST]) -> None:
         """This transpiles a FuncdefStatementNode to a Python statement.
 
         The statement takes the form of '@... def # name: ...'."""
-        word_or_statement = alt(visitors['word'], visitors['statement'])
+        word_or_statement = alt(
+            visitors.ref_visitor('word'), visitors.ref_visitor('statement')
+        )
         py_body = [
             statementfy(word_or_statement.visit(node)) for node in node.body
         ]
@@ -432,7 +454,10 @@ def extension(visitors: VisitorDict['concat.parse.Node', ast.AST]) -> None:
         py_body = [
             statementfy(node)
             for node in All(
-                alt(visitors['word'], visitors['statement'])
+                alt(
+                    visitors.ref_visitor('word'),
+                    visitors.ref_visitor('statement'),
+                )
             ).visit(node)
         ]
         py_decorators = [
@@ -446,7 +471,7 @@ def extension(visitors: VisitorDict['concat.parse.Node', ast.AST]) -> None:
             py_bases.append(py_base)
         py_keywords = []
         for keyword_arg in node.keyword_args:
-            py_word = visitors['word'].visit(keyword_arg[1])
+            py_word = visitors.ref_visitor('word').visit(keyword_arg[1])
             stack = concat.astutils.python_safe_name(
                 id='stack', ctx=ast.Load()
             )
@@ -2,14 +2,18 @@ from concat.visitors import Visitor, FunctionalVisitor
 import concat.astutils
 import concat.parse
 import ast
+import copy
 from typing import cast
 
 
 def node_to_py_string(string: str) -> Visitor[concat.parse.WordNode, ast.expr]:
+    # Parse once, and give each node its own copy to put its location on.
+    parsed = cast(ast.Expression, ast.parse(string, mode='eval')).body
+    concat.astutils.clear_locations(parsed)
+
     @FunctionalVisitor
     def visitor(node: concat.parse.Node) -> ast.expr:
-        py_node = cast(ast.Expression, ast.parse(string, mode='eval')).body
-        concat.astutils.clear_locations(py_node)
+        py_node = copy.deepcopy(parsed)
         concat.astutils.copy_location(py_node, node)
         return py_node
 
@@ -7,16 +7,17 @@ The type inference algorithm was originally based on the one described in
 from __future__ import annotations
 
 import abc
-import itertools
+import contextlib
 import pathlib
-import sys
-from collections.abc import Generator
+from collections.abc import Generator, Iterator
 from typing import (
+    TYPE_CHECKING,
     Any,
     Callable,
     Dict,
     Iterable,
     List,
+    NamedTuple,
     Optional,
     Sequence,
     Tuple,
@@ -45,8 +46,6 @@ from concat.typecheck.errors import (
     StaticAnalysisError,
     TypeError,
     UnhandledNodeTypeError,
-    format_cannot_find_module_from_source_dir_error,
-    format_cannot_find_module_path_error,
     format_expected_item_kinded_variable_error,
     format_item_type_expected_in_type_sequence_error,
     format_name_reassigned_in_type_sequence_error,
@@ -54,6 +53,13 @@ from concat.typecheck.errors import (
     format_not_generic_type_error,
     format_too_many_params_for_variadic_type_error,
 )
+from concat.typecheck.parallel import (
+    DeferredBody,
+    can_check_bodies_in_parallel,
+    check_bodies_in_parallel,
+)
+from concat.typecheck.statistics import TypeCheckStatistics
+from concat.typecheck.stubs import StubResolver
 from concat.typecheck.substitutions import MutableSubstitutions
 from concat.typecheck.types import (
     BoundVariable,
@@ -74,8 +80,10 @@ from concat.typecheck.types import (
     QuotationType,
     SequenceVariable,
     StackEffect,
+    SubtypingCache,
     TupleKind,
     Type,
+    TypeInterner,
     TypeSequence,
     TypeTuple,
     Variable,
@@ -83,14 +91,48 @@ from concat.typecheck.types import (
     VariableArgumentPack,
 )
 
+if TYPE_CHECKING:
+    from concat.typecheck.incremental import DefinitionCache
+    from concat.typecheck.lazy_stubs import LazyStubModule
+
 _builtins_stub_path = pathlib.Path(__file__) / '../builtin_stubs/builtins.cati'
 
 
+class _Inference(NamedTuple):
+    """The arguments of an inference nested in another one."""
+
+    gamma: Environment
+    e: Sequence[concat.parse.Node]
+    extensions: Optional[Sequence[Callable]] = None
+    is_top_level: bool = False
+    source_dir: str = '.'
+    initial_stack: Optional[Type] = None
+    check_bodies: bool = True
+
+
 class TypeChecker:
     def __init__(self) -> None:
         self._module_namespaces: dict[pathlib.Path, Environment] = {}
+        self._builtins_and_preamble: Environment | None = None
+        self._lazy_stubs: dict[pathlib.Path, LazyStubModule] = {}
+        self.stub_resolver = StubResolver()
+        self.stubs_read: set[pathlib.Path] = set()
         self._is_in_forward_references_phase = False
         self.substitutions = MutableSubstitutions()
+        self.subtyping_cache = SubtypingCache()
+        self.type_interner = TypeInterner()
+        # (overloaded type, argument types) -> index of the first overload
+        # that accepts the arguments
+        self.overload_selections: dict[tuple[int, int], int] = {}
+        # (type, substitution) -> the type with the substitution applied. Each
+        # type has one apply_substitution method, so one map is enough.
+        self.substitution_results: dict[tuple[int, int], Type] = {}
+        self._statistics: TypeCheckStatistics | None = None
+        # Statistics are only kept per definition of the program, not of the
+        # stubs it imports.
+        self._is_checking_stub = False
+        self.definition_cache: DefinitionCache | None = None
+        self._deferred_bodies: list[DeferredBody] | None = None
 
         with change_context(self):
             _invert_result_var = ItemVariable(ItemKind)
@@ -254,6 +296,11 @@ class TypeChecker:
         )
 
     def load_builtins_and_preamble(self) -> Environment:
+        if self._builtins_and_preamble is None:
+            self._builtins_and_preamble = self._load_builtins_and_preamble()
+        return self._builtins_and_preamble
+
+    def _load_builtins_and_preamble(self) -> Environment:
         env = self._check_stub(
             pathlib.Path(__file__).with_name('preamble0.cati'),
         )
@@ -283,6 +330,52 @@ class TypeChecker:
     ) -> 'Environment':
         if path in self._module_namespaces:
             return self._module_namespaces[path]
+        if path in self._lazy_stubs:
+            env = self._lazy_stubs[path].check_all()
+            del self._lazy_stubs[path]
+            self._module_namespaces[path] = env
+            return env
+        env = initial_env or Environment()
+        concat_ast = self._parse_stub(path)
+        if concat_ast is not None:
+            env = self._check_stub_nodes(path, env, concat_ast.children)
+        self._module_namespaces[path] = env
+        return env
+
+    def _import_from_stub(
+        self, path: pathlib.Path, name: str
+    ) -> Optional[Type]:
+        """Return the type of one name defined in a stub module.
+
+        Only the definitions the name depends on are checked, if possible."""
+        from concat.typecheck.lazy_stubs import LazyStubModule
+
+        if path in self._module_namespaces:
+            return self._module_namespaces[path].get(name)
+        if path not in self._lazy_stubs:
+            env = self.load_builtins_and_preamble()
+            concat_ast = self._parse_stub(path)
+            if concat_ast is None or not LazyStubModule.can_load_lazily(
+                concat_ast.children
+            ):
+                if concat_ast is not None:
+                    env = self._check_stub_nodes(
+                        path, env, concat_ast.children
+                    )
+                self._module_namespaces[path] = env
+                return env.get(name)
+            self._lazy_stubs[path] = LazyStubModule(
+                self, path, env, concat_ast.children
+            )
+        return self._lazy_stubs[path].get(name)
+
+    def _parse_stub(
+        self, path: pathlib.Path
+    ) -> Optional[concat.parse.TopLevelNode]:
+        """Parse a stub module, printing any errors.
+
+        Returns None if the stub can't be parsed at all."""
+        self.stubs_read.add(path)
         try:
             source = path.read_text()
         except FileNotFoundError as e:
@@ -319,7 +412,6 @@ class TypeChecker:
                     )
                 else:
                     assert_never(r)
-        env = initial_env or Environment()
         from concat.transpile import parse
 
         try:
@@ -332,25 +424,41 @@ class TypeChecker:
                         file, tokens, e.args[0].failures
                     )
                 )
-            self._module_namespaces[path] = env
-            return env
+            return None
         recovered_parsing_failures = concat_ast.parsing_failures
         with path.open() as file:
             for failure in recovered_parsing_failures:
                 print('Parse Error:')
                 print(create_parsing_failure_message(file, tokens, failure))
+        return concat_ast
+
+    def _check_stub_nodes(
+        self,
+        path: pathlib.Path,
+        env: Environment,
+        nodes: Sequence[concat.parse.Node],
+    ) -> Environment:
         try:
-            env = self.check(
-                env,
-                concat_ast.children,
-                str(path.parent),
-                _should_check_bodies=False,
-            )
+            with self.checking_stub():
+                return self.check(
+                    env,
+                    nodes,
+                    str(path.parent),
+                    _should_check_bodies=False,
+                )
         except StaticAnalysisError as e:
             e.set_path_if_missing(path)
             raise
-        self._module_namespaces[path] = env
-        return env
+
+    @contextlib.contextmanager
+    def checking_stub(self) -> Iterator[None]:
+        """Check the definitions of a stub instead of the program."""
+        was_checking_stub = self._is_checking_stub
+        self._is_checking_stub = True
+        try:
+            yield
+        finally:
+            self._is_checking_stub = was_checking_stub
 
     # FIXME: I'm really passing around a bunch of state here. I could create an
     # object to store it, or turn this algorithm into an object.
@@ -364,7 +472,69 @@ class TypeChecker:
         initial_stack: Optional[Type] = None,
         check_bodies: bool = True,
     ) -> Tuple[StackEffect, Environment]:
-        """The infer function described by Kleffner."""
+        """The infer function described by Kleffner.
+
+        The word sequences nested in e (quotations, list and tuple items, and
+        decorators) are inferred using an explicit stack of suspended
+        inferences instead of recursion, so deeply nested code doesn't reach
+        the recursion limit. See _infer_steps."""
+        suspended = [
+            self._infer_steps(
+                gamma,
+                e,
+                extensions,
+                is_top_level,
+                source_dir,
+                initial_stack,
+                check_bodies,
+            )
+        ]
+        result: Tuple[StackEffect, Environment] | None = None
+        error: BaseException | None = None
+        while True:
+            try:
+                if error is not None:
+                    request = suspended[-1].throw(error)
+                elif result is None:
+                    # The inference hasn't started yet.
+                    request = next(suspended[-1])
+                else:
+                    request = suspended[-1].send(result)
+            except StopIteration as stop:
+                suspended.pop()
+                result, error = stop.value, None
+            except BaseException as exception:
+                # Let the inference that asked for this one handle the error.
+                suspended.pop()
+                result, error = None, exception
+            else:
+                suspended.append(self._infer_steps(*request))
+                result, error = None, None
+                continue
+            if not suspended:
+                if error is not None:
+                    raise error
+                assert result is not None
+                return result
+
+    def _infer_steps(
+        self,
+        gamma: Environment,
+        e: Sequence[concat.parse.Node],
+        extensions: Optional[Sequence[Callable]],
+        is_top_level: bool,
+        source_dir: str,
+        initial_stack: Optional[Type],
+        check_bodies: bool,
+    ) -> Generator[
+        _Inference,
+        Tuple[StackEffect, Environment],
+        Tuple[StackEffect, Environment],
+    ]:
+        """Infer the type of e, yielding the nested inferences it needs.
+
+        Each yielded _Inference is run by infer, and the result is sent
+        back."""
         e = list(e)
         if initial_stack is None:
             initial_stack = TypeSequence(
@@ -373,76 +543,22 @@ class TypeChecker:
         current_effect = StackEffect(initial_stack, initial_stack)
 
         # Prepare for forward references.
-        # TODO: Do this in a more principled way with scope graphs.
-        self._is_in_forward_references_phase = True
-        ids_to_defs: dict[int, concat.parse.ClassdefStatementNode] = {}
-        names_to_defs: dict[str, int] = {}
-        ref_edges: list[tuple[int, int]] = []
-        next_id = 0
-        try:
-            for node in e:
-                if isinstance(node, concat.parse.ClassdefStatementNode):
-                    ids_to_defs[next_id] = node
-                    names_to_defs[node.class_name] = next_id
-                    next_id += 1
-            for def_id, node in ids_to_defs.items():
-                free_names = node.free_type_level_names
-                for name in free_names:
-                    if name in names_to_defs:
-                        ref_edges.append((def_id, names_to_defs[name]))
-            graph = concat.graph.graph_from_edges(ref_edges)
-            sccs = concat.graph.cycles(graph)
-            for scc in sccs:
-                kinds = []
-                for def_id in scc:
-                    kind: Kind = IndividualKind
-                    type_parameters = self._get_class_params(
-                        ids_to_defs[def_id], gamma
-                    )[0]
-                    if type_parameters:
-                        kind = GenericTypeKind(
-                            [v.kind for v in type_parameters], IndividualKind
-                        )
-                    kinds.append(kind)
-                ty_vars = [ItemVariable(k) for k in kinds]
-                fix_var = BoundVariable(TupleKind(kinds))
-                gamma |= Environment(
-                    {
-                        ids_to_defs[def_id].class_name: ty_vars[i]
-                        for i, def_id in enumerate(scc)
-                    }
-                )
-                for i, def_id in enumerate(scc):
-
-                    def fix_former(
-                        env: Environment,
-                        ty: Type,
-                        # skipcq: PYL-W0102
-                        ids_to_defs: dict[
-                            int, concat.parse.ClassdefStatementNode
-                        ] = ids_to_defs,
-                        def_id: int = def_id,
-                        scc: Sequence[int] = scc,
-                        i: int = i,
-                        fix_var: Variable = fix_var,
-                    ) -> Type:
-                        tys = [
-                            env[ids_to_defs[def_id].class_name]
-                            for def_id in scc
-                        ]
-                        tys[i] = ty
-                        # I don't think reusing the fix_var is necessary since
-                        # it won't be free in the other types, but I might as
-                        # well since I've written that already.
-                        return Fix(fix_var, TypeTuple(tys)).project(self, i)
-
-                    gamma = gamma.with_mutuals(
-                        ids_to_defs[def_id].class_name, fix_former
-                    )
-        finally:
-            self._is_in_forward_references_phase = False
+        if any(
+            isinstance(node, concat.parse.ClassdefStatementNode) for node in e
+        ):
+            gamma = self._bind_forward_references(gamma, e)
 
+        definition_cache = self.definition_cache if is_top_level else None
+        is_definition = is_top_level and not self._is_checking_stub
         for node in e:
+            if definition_cache is not None:
+                reused_types = definition_cache.lookup(node, gamma)
+                if reused_types is not None:
+                    gamma |= reused_types
+                    continue
+                gamma_before_node = gamma
+            if self._statistics is not None:
+                self._statistics.enter_node(node, is_definition)
             try:
                 if isinstance(node, concat.parse.PragmaNode):
                     namespace = 'concat.typecheck.'
@@ -531,7 +647,7 @@ class TypeChecker:
                             input_stack = TypeSequence(
                                 self, [SequenceVariable()]
                             )
-                        fun_type, _ = self.infer(
+                        fun_type, _ = yield _Inference(
                             gamma,
                             child.children,
                             extensions=extensions,
@@ -559,7 +675,7 @@ class TypeChecker:
                     collected_type = current_effect.output
                     element_type: 'Type' = self.object_type
                     for item in node.list_children:
-                        fun_type, _ = self.infer(
+                        fun_type, _ = yield _Inference(
                             gamma,
                             item,
                             extensions=extensions,
@@ -602,7 +718,7 @@ class TypeChecker:
                     collected_type = current_effect.output
                     element_types: List[Type] = []
                     for item in node.tuple_children:
-                        fun_type, _ = self.infer(
+                        fun_type, _ = yield _Inference(
                             gamma,
                             item,
                             extensions=extensions,
@@ -637,42 +753,12 @@ class TypeChecker:
                     )
                 elif isinstance(node, concat.parse.FromImportStatementNode):
                     imported_name = node.asname or node.imported_name
-                    module_parts = node.value.split('.')
-                    module_spec = None
-                    path = None
-                    if module_parts[0] in sys.builtin_module_names:
-                        stub_path = pathlib.Path(__file__) / '../builtin_stubs'
-                        for part in module_parts:
-                            stub_path = stub_path / part
-                    else:
-                        for module_prefix in itertools.accumulate(
-                            module_parts, lambda a, b: f'{a}.{b}'
-                        ):
-                            for finder in sys.meta_path:
-                                module_spec = finder.find_spec(
-                                    module_prefix, path
-                                )
-                                if module_spec is not None:
-                                    path = (
-                                        module_spec.submodule_search_locations
-                                    )
-                                    break
-                        assert module_spec is not None
-                        module_path = module_spec.origin
-                        if module_path is None:
-                            raise TypeError(
-                                f'Cannot find path of module {node.value}',
-                                is_occurs_check_fail=None,
-                                rigid_variables=None,
-                            )
-                        # For now, assume the module's written in Python.
-                        stub_path = pathlib.Path(module_path)
-                    stub_path = stub_path.with_suffix('.cati')
-                    stub_env = self._check_stub(
-                        stub_path,
-                        initial_env=self.load_builtins_and_preamble(),
+                    stub_path = self.stub_resolver.resolve(
+                        node.value, pathlib.Path(source_dir)
+                    )
+                    imported_type = self._import_from_stub(
+                        stub_path, node.imported_name
                     )
-                    imported_type = stub_env.get(node.imported_name)
                     if imported_type is None:
                         raise TypeError(
                             f'Cannot find {
@@ -716,43 +802,23 @@ class TypeChecker:
                     recursion_env = gamma | {
                         name: declared_type.generalized_wrt(self, gamma)
                     }
-                    if check_bodies:
-                        inferred_type, _ = self.infer(
-                            recursion_env,
-                            node.body,
-                            is_top_level=False,
-                            extensions=extensions,
-                            initial_stack=declared_type.input,
-                            check_bodies=check_bodies,
+                    if (
+                        check_bodies
+                        and is_top_level
+                        and self._deferred_bodies is not None
+                    ):
+                        self._deferred_bodies.append(
+                            DeferredBody(
+                                node, recursion_env, declared_type, extensions
+                            )
                         )
-                        # We want to check that the inferred outputs are
-                        # subtypes of the declared outputs. Thus,
-                        # inferred_type.output should be a subtype
-                        # declared_type.output.
-                        rigid_variables = recursion_env.free_type_variables(
-                            self
+                    elif check_bodies:
+                        self._check_funcdef_body(
+                            node, recursion_env, declared_type, extensions
                         )
-                        try:
-                            inferred_type.output.constrain_and_bind_variables(
-                                self,
-                                declared_type.output,
-                                rigid_variables,
-                                [],
-                            )
-                        except TypeError as error:
-                            message = (
-                                f'declared function type {declared_type} is '
-                                'not compatible with inferred type '
-                                f'{inferred_type}'
-                            )
-                            raise TypeError(
-                                message,
-                                is_occurs_check_fail=error.is_occurs_check_fail,
-                                rigid_variables=rigid_variables,
-                            ) from error
                     effect = declared_type
                     # type check decorators
-                    final_type_stack, _ = self.infer(
+                    final_type_stack, _ = yield _Inference(
                         gamma,
                         list(node.decorators),
                         is_top_level=False,
@@ -832,7 +898,7 @@ class TypeChecker:
                         )
                     else:
                         quotation_input_stack = current_effect.output
-                    effect1, _ = self.infer(
+                    effect1, _ = yield _Inference(
                         gamma,
                         [*quotation.children],
                         extensions=extensions,
@@ -912,8 +978,134 @@ class TypeChecker:
             except TypeError as error:
                 error.set_location_if_missing(node.location)
                 raise
+            finally:
+                if self._statistics is not None:
+                    self._statistics.exit_node(is_definition)
+            if definition_cache is not None:
+                gamma = definition_cache.record(
+                    self, node, gamma_before_node, gamma
+                )
         return current_effect, gamma
 
+    def _bind_forward_references(
+        self, gamma: Environment, e: Sequence[concat.parse.Node]
+    ) -> Environment:
+        """Bind the classes defined in e so they can refer to each other."""
+        # TODO: Do this in a more principled way with scope graphs.
+        self._is_in_forward_references_phase = True
+        ids_to_defs: dict[int, concat.parse.ClassdefStatementNode] = {}
+        names_to_defs: dict[str, int] = {}
+        ref_edges: list[tuple[int, int]] = []
+        next_id = 0
+        try:
+            for node in e:
+                if isinstance(node, concat.parse.ClassdefStatementNode):
+                    ids_to_defs[next_id] = node
+                    names_to_defs[node.class_name] = next_id
+                    next_id += 1
+            for def_id, node in ids_to_defs.items():
+                free_names = node.free_type_level_names
+                for name in free_names:
+                    if name in names_to_defs:
+                        ref_edges.append((def_id, names_to_defs[name]))
+            graph = concat.graph.graph_from_edges(ref_edges)
+            sccs = concat.graph.cycles(graph)
+            for scc in sccs:
+                kinds = []
+                for def_id in scc:
+                    kind: Kind = IndividualKind
+                    type_parameters = self._get_class_params(
+                        ids_to_defs[def_id], gamma
+                    )[0]
+                    if type_parameters:
+                        kind = GenericTypeKind(
+                            [v.kind for v in type_parameters], IndividualKind
+                        )
+                    kinds.append(kind)
+                ty_vars = [ItemVariable(k) for k in kinds]
+                fix_var = BoundVariable(TupleKind(kinds))
+                gamma |= Environment(
+                    {
+                        ids_to_defs[def_id].class_name: ty_vars[i]
+                        for i, def_id in enumerate(scc)
+                    }
+                )
+                for i, def_id in enumerate(scc):
+
+                    def fix_former(
+                        env: Environment,
+                        ty: Type,
+                        # skipcq: PYL-W0102
+                        ids_to_defs: dict[
+                            int, concat.parse.ClassdefStatementNode
+                        ] = ids_to_defs,
+                        def_id: int = def_id,
+                        scc: Sequence[int] = scc,
+                        i: int = i,
+                        fix_var: Variable = fix_var,
+                    ) -> Type:
+                        tys = [
+                            env[ids_to_defs[def_id].class_name]
+                            for def_id in scc
+                        ]
+                        tys[i] = ty
+                        # I don't think reusing the fix_var is necessary since
+                        # it won't be free in the other types, but I might as
+                        # well since I've written that already.
+                        return Fix(fix_var, TypeTuple(tys)).project(self, i)
+
+                    gamma = gamma.with_mutuals(
+                        ids_to_defs[def_id].class_name, fix_former
+                    )
+        finally:
+            self._is_in_forward_references_phase = False
+        return gamma
+
+    def _check_funcdef_body(
+        self,
+        node: concat.parse.FuncdefStatementNode,
+        recursion_env: Environment,
+        declared_type: StackEffect,
+        extensions: Optional[Sequence[Callable]],
+    ) -> bool:
+        """Check the body of a function against its declared type.
+
+        Returns whether checking the body bound any of the type variables of
+        the declared type, i.e. whether the declared type was specialized."""
+        declared_variables = declared_type.free_type_variables(self)
+        inferred_type, _ = self.infer(
+            recursion_env,
+            node.body,
+            is_top_level=False,
+            extensions=extensions,
+            initial_stack=declared_type.input,
+        )
+        # We want to check that the inferred outputs are subtypes of the
+        # declared outputs. Thus, inferred_type.output should be a subtype
+        # declared_type.output.
+        rigid_variables = recursion_env.free_type_variables(self)
+        try:
+            inferred_type.output.constrain_and_bind_variables(
+                self,
+                declared_type.output,
+                rigid_variables,
+                [],
+            )
+        except TypeError as error:
+            message = (
+                f'declared function type {declared_type} is not compatible '
+                f'with inferred type {inferred_type}'
+            )
+            raise TypeError(
+                message,
+                is_occurs_check_fail=error.is_occurs_check_fail,
+                rigid_variables=rigid_variables,
+            ) from error
+        return any(
+            v not in rigid_variables and v in self.substitutions
+            for v in declared_variables
+        )
+
     @staticmethod
     def _get_class_params(
         node: concat.parse.ClassdefStatementNode, gamma: Environment
@@ -988,6 +1180,16 @@ class TypeChecker:
         gamma |= Environment({node.class_name: ty})
         return gamma
 
+    @property
+    def statistics(self) -> TypeCheckStatistics | None:
+        """Where to report the work done while type checking, if anywhere."""
+        return self._statistics
+
+    @statistics.setter
+    def statistics(self, statistics: TypeCheckStatistics | None) -> None:
+        self._statistics = statistics
+        self.substitutions.statistics = statistics
+
     _object_type: SetOnce[Type] = SetOnce()
 
     @property
@@ -1037,16 +1239,25 @@ class TypeChecker:
         program: Sequence[concat.parse.Node],
         source_dir: str = '.',
         _should_check_bodies: bool = True,
+        workers: int = 1,
     ) -> Environment:
-        with change_context(self):
-            environment = Environment(
-                {
-                    **concat.typecheck.preamble_types.types(self),
-                    **environment,
-                }
+        """Type check a program.
+
+        If workers is greater than one, the bodies of the top-level functions
+        of large programs are checked in that many processes."""
+        if (
+            _should_check_bodies
+            and self.definition_cache is None
+            and can_check_bodies_in_parallel(program, workers)
+        ):
+            env = self._check_with_parallel_bodies(
+                environment, program, source_dir, workers
             )
+            if env is not None:
+                return env
+        with change_context(self):
             res = self.infer(
-                environment,
+                self._add_preamble_types(environment),
                 program,
                 None,
                 True,
@@ -1056,12 +1267,64 @@ class TypeChecker:
 
         return res[1]
 
+    def _check_with_parallel_bodies(
+        self,
+        environment: Environment,
+        program: Sequence[concat.parse.Node],
+        source_dir: str,
+        workers: int,
+    ) -> Environment | None:
+        """Check a program, deferring function bodies to worker processes.
+
+        Returns None if the program has to be checked sequentially instead
+        because a function body specialized its declared type. The type
+        checker is then back in the state it was in before."""
+        substitutions_mark = self.substitutions.mark()
+        module_namespaces = dict(self._module_namespaces)
+        lazy_stubs = dict(self._lazy_stubs)
+        deferred_bodies = list[DeferredBody]()
+        old_deferred_bodies = self._deferred_bodies
+        self._deferred_bodies = deferred_bodies
+        top_level_error: StaticAnalysisError | None = None
+        try:
+            with change_context(self):
+                _, env = self.infer(
+                    self._add_preamble_types(environment),
+                    program,
+                    None,
+                    True,
+                    source_dir,
+                )
+        except StaticAnalysisError as e:
+            # The deferred bodies come before the error in the program, so
+            # their errors take precedence.
+            top_level_error = e
+        finally:
+            self._deferred_bodies = old_deferred_bodies
+        if not check_bodies_in_parallel(self, deferred_bodies, workers):
+            # Stubs checked since then depend on the undone bindings.
+            self.substitutions.undo_to(substitutions_mark)
+            self._module_namespaces = module_namespaces
+            self._lazy_stubs = lazy_stubs
+            return None
+        if top_level_error is not None:
+            raise top_level_error
+        return env
+
+    def _add_preamble_types(self, environment: Environment) -> Environment:
+        return Environment(
+            {
+                **concat.typecheck.preamble_types.types(self),
+                **environment,
+            }
+        )
+
     def _generate_type_of_innermost_module(
         self, qualified_name: str, source_dir: pathlib.Path
     ) -> StackEffect:
-        stub_path = _find_stub_path(qualified_name.split('.'), source_dir)
+        stub_path = self.stub_resolver.resolve(qualified_name, source_dir)
         init_env = self.load_builtins_and_preamble()
-        module_attributes = self._check_stub(stub_path, init_env)
+        module_attributes = self._check_stub_resolved_path(stub_path, init_env)
         module_type_brand = self._module_type.brand(self)
         brand = Brand(
             f'type({qualified_name})', IndividualKind, [module_type_brand]
@@ -1106,48 +1369,6 @@ class TypeChecker:
         return GenericType([_seq_var], innermost_type)
 
 
-def _find_stub_path(
-    module_parts: Sequence[str], source_dir: pathlib.Path
-) -> pathlib.Path:
-    if module_parts[0] in sys.builtin_module_names:
-        stub_path = pathlib.Path(__file__) / '../builtin_stubs'
-        for part in module_parts:
-            stub_path = stub_path / part
-    else:
-        module_spec = None
-        path: Optional[List[str]]
-        path = [str(source_dir)] + sys.path
-
-        for module_prefix in itertools.accumulate(
-            module_parts, lambda a, b: f'{a}.{b}'
-        ):
-            for finder in sys.meta_path:
-                module_spec = finder.find_spec(module_prefix, path)
-                if module_spec is not None:
-                    path = module_spec.submodule_search_locations
-                    break
-        if module_spec is None:
-            raise TypeError(
-                format_cannot_find_module_from_source_dir_error(
-                    '.'.join(module_parts),
-                    source_dir,
-                ),
-                is_occurs_check_fail=None,
-                rigid_variables=None,
-            )
-        module_path = module_spec.origin
-        if module_path is None:
-            raise TypeError(
-                format_cannot_find_module_path_error('.'.join(module_parts)),
-                is_occurs_check_fail=None,
-                rigid_variables=None,
-            )
-        # For now, assume the module's written in Python.
-        stub_path = pathlib.Path(module_path)
-    stub_path = stub_path.with_suffix('.cati')
-    return stub_path
-
-
 # Parsing type annotations
 
 
@@ -0,0 +1,34 @@
+"""Build an index of the type stubs under a directory.
+
+Usage: python -m concat.typecheck.build_stub_index SITE_PACKAGES INDEX_FILE
+
+The index can be passed to `python -m concat --stub-index INDEX_FILE`.
+"""
+
+import argparse
+import pathlib
+from collections.abc import Sequence
+
+from concat.typecheck.stubs import StubIndex
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    arg_parser = argparse.ArgumentParser(
+        description='Build an index of the type stubs under a directory.'
+    )
+    arg_parser.add_argument(
+        'root',
+        type=pathlib.Path,
+        help='directory to index, e.g. site-packages',
+    )
+    arg_parser.add_argument(
+        'index', type=pathlib.Path, help='file to write the index to'
+    )
+    args = arg_parser.parse_args(argv)
+    index = StubIndex.build(args.root)
+    index.save(args.index, args.root)
+    print(f'Indexed {len(index)} modules')
+
+
+if __name__ == '__main__':
+    main()
@@ -28,6 +28,11 @@ class Environment(Mapping[str, 'Type']):
         self._env = env or {}
         self._mutuals: dict[str, _FixFormer] = {}
         self._sub_cache = dict[int, Environment]()
+        # Types whose variables are all bound by settled substitutions never
+        # gain free type variables, so only the other entries are kept for
+        # computing the free type variables of the environment.
+        self._open_entries: dict[str, Type] = {}
+        self._unclassified_entries: Mapping[str, Type] = self._env
 
     def apply_substitution(
         self, context: TypeChecker, sub: 'Substitutions'
@@ -36,27 +41,46 @@ class Environment(Mapping[str, 'Type']):
         if sub.id not in self._sub_cache:
             if not (set(sub) & self.free_type_variables(context)):
                 self._sub_cache[sub.id] = self
-            self._sub_cache[sub.id] = Environment(
-                {
-                    name: t.apply_substitution(context, sub)
-                    for name, t in self.items()
-                }
-            )
-            self._sub_cache[sub.id]._mutuals = {
+                return self
+            # Only the open entries can be changed by the substitution.
+            substituted_entries = {
+                name: t.apply_substitution(context, sub)
+                for name, t in self._open_entries.items()
+            }
+            env = Environment({**self._env, **substituted_entries})
+            env._open_entries = substituted_entries
+            env._unclassified_entries = {}
+            env._mutuals = {
                 n: lambda e, t, f=f: f(e, t).apply_substitution(context, sub)
                 for n, f in self._mutuals.items()
             }
+            self._sub_cache[sub.id] = env
         return self._sub_cache[sub.id]
 
     def free_type_variables(
         self, context: TypeChecker
     ) -> 'InsertionOrderedSet[Variable]':
+        self._classify_entries(context)
         return reduce(
             or_,
-            map(lambda t: t.free_type_variables(context), self.values()),
+            map(
+                lambda t: t.free_type_variables(context),
+                self._open_entries.values(),
+            ),
             InsertionOrderedSet([]),
         )
 
+    def _classify_entries(self, context: TypeChecker) -> None:
+        # Free type variables are found through every binding, so a type
+        # without any might only be closed until a frame of bindings is
+        # undone. It's only known to be closed for good when all the
+        # bindings are settled.
+        can_close = not context.substitutions.has_unsettled_bindings()
+        for name, t in self._unclassified_entries.items():
+            if not can_close or t.free_type_variables(context):
+                self._open_entries[name] = t
+        self._unclassified_entries = {}
+
     def __getitem__(self, name: str) -> Type:
         return self._env[name]
 
@@ -71,6 +95,19 @@ class Environment(Mapping[str, 'Type']):
         env._mutuals = {**self._mutuals}
         if isinstance(other, Environment):
             env._mutuals |= other._mutuals
+        env._open_entries = {
+            name: t
+            for name, t in self._open_entries.items()
+            if name not in other
+        }
+        env._unclassified_entries = {
+            **{
+                name: t
+                for name, t in self._unclassified_entries.items()
+                if name not in other
+            },
+            **other,
+        }
         return env
 
     def with_mutuals(
@@ -83,6 +120,9 @@ class Environment(Mapping[str, 'Type']):
     def copy(self) -> Environment:
         env = Environment(self._env)
         env._mutuals = {**self._mutuals}
+        # The entries are the same, so the classification can be shared.
+        env._open_entries = self._open_entries
+        env._unclassified_entries = self._unclassified_entries
         return env
 
     def get_mutuals(self, referer: str) -> _FixFormer:
@@ -0,0 +1,228 @@
+"""Incremental type checking of top-level definitions.
+
+For each top-level function or class definition, the type checker can record
+the names the definition reads from the environment and the types it
+produces. When the program is checked again, a definition whose source text is
+unchanged and whose dependencies still have the same types is not checked
+again: the types it produced last time are reused.
+
+A definition that is re-checked but produces a type equal to the one it
+produced before keeps the old type object, so the definitions that depend on
+it don't need to be re-checked either.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Iterator, Mapping, Sequence
+from typing import TYPE_CHECKING, TypeGuard
+
+import concat.parse
+from concat.typecheck import NamedTypeNode, TypeChecker
+from concat.typecheck.env import Environment
+
+if TYPE_CHECKING:
+    from concat.typecheck.types import Type
+
+
+type _DefinitionNode = (
+    concat.parse.FuncdefStatementNode | concat.parse.ClassdefStatementNode
+)
+type _DefinitionKey = tuple[str, int]
+
+
+@dataclasses.dataclass
+class _DefinitionRecord:
+    source: str
+    reads: Mapping[str, Type | None]
+    produces: Mapping[str, Type]
+
+
+class DefinitionCache:
+    """Remembers the result of checking each top-level definition."""
+
+    def __init__(self) -> None:
+        self._records: dict[_DefinitionKey, _DefinitionRecord] = {}
+        self._keys: dict[int, _DefinitionKey] = {}
+        self._source_lines: list[str] = []
+        self.rechecked_definitions: list[str] = []
+
+    def start(self, source: str, program: Sequence[concat.parse.Node]) -> None:
+        """Track the top-level definitions of a new version of a program."""
+        self._source_lines = source.splitlines(keepends=True)
+        self._keys = {}
+        self.rechecked_definitions = []
+        occurrences: dict[str, int] = {}
+        for node in program:
+            if _is_definition(node):
+                name = _defined_name(node)
+                occurrence = occurrences.get(name, 0)
+                occurrences[name] = occurrence + 1
+                self._keys[id(node)] = (name, occurrence)
+
+    def finish(self) -> None:
+        """Forget definitions that are no longer in the program."""
+        live_keys = set(self._keys.values())
+        for key in list(self._records):
+            if key not in live_keys:
+                del self._records[key]
+
+    def lookup(
+        self, node: concat.parse.Node, gamma: Environment
+    ) -> Mapping[str, Type] | None:
+        """Return the types a definition produced when it was last checked.
+
+        None is returned if node isn't a tracked definition, or if it has to
+        be checked again."""
+        key = self._keys.get(id(node))
+        if key is None:
+            return None
+        record = self._records.get(key)
+        if record is None or record.source != self._source_of(node):
+            return None
+        for name, ty in record.reads.items():
+            if gamma.get(name) is not ty:
+                return None
+        return record.produces
+
+    def record(
+        self,
+        context: TypeChecker,
+        node: concat.parse.Node,
+        gamma_before: Environment,
+        gamma_after: Environment,
+    ) -> Environment:
+        """Remember the result of checking a definition.
+
+        Returns the environment to continue checking with, which reuses the
+        previously produced types if they haven't changed."""
+        key = self._keys.get(id(node))
+        if key is None:
+            return gamma_after
+        assert _is_definition(node)
+        self.rechecked_definitions.append(key[0])
+        produces = {key[0]: gamma_after[key[0]]}
+        old_record = self._records.get(key)
+        if old_record is not None and _all_equal(
+            context, old_record.produces, produces
+        ):
+            produces = dict(old_record.produces)
+            gamma_after = gamma_after | produces
+        self._records[key] = _DefinitionRecord(
+            self._source_of(node),
+            {name: gamma_before.get(name) for name in read_names(node)},
+            produces,
+        )
+        return gamma_after
+
+    def _source_of(self, node: concat.parse.Node) -> str:
+        # Whole lines are used because end locations can be imprecise. Taking
+        # more text than the definition only causes extra re-checks.
+        (start_line, start_column), (end_line, _) = (
+            node.location,
+            node.end_location,
+        )
+        lines = self._source_lines[start_line - 1 : end_line]
+        if lines:
+            lines[0] = lines[0][start_column:]
+        return ''.join(lines)
+
+
+class IncrementalTypeChecker:
+    """Type checks successive versions of one program.
+
+    Only the definitions that changed, and the ones that depend on their
+    types, are checked again.
+
+    Most of the types in the type checker's caches come from definitions
+    that are checked again, so the caches are cleared before each check.
+    Bindings of type variables and instantiations of the preamble's generic
+    types still build up, so after every restart_interval checks, the
+    program is checked from scratch with a new type checker."""
+
+    def __init__(self, restart_interval: int = 50) -> None:
+        self.restart_interval = restart_interval
+        self.context: TypeChecker
+        self._definition_cache: DefinitionCache
+        self._preamble: Environment | None
+        self._checks: int
+        self._restart()
+
+    def check(
+        self,
+        source: str,
+        program: concat.parse.TopLevelNode,
+        source_dir: str = '.',
+    ) -> Environment:
+        if self._checks == self.restart_interval:
+            self._restart()
+        self._checks += 1
+        if self._preamble is None:
+            self._preamble = self.context.load_builtins_and_preamble()
+        self.context.subtyping_cache.clear()
+        self.context.type_interner.clear()
+        self.context.overload_selections.clear()
+        self._definition_cache.start(source, program.children)
+        env = self.context.check(self._preamble, program.children, source_dir)
+        self._definition_cache.finish()
+        return env
+
+    def _restart(self) -> None:
+        self.context = TypeChecker()
+        self._definition_cache = DefinitionCache()
+        self.context.definition_cache = self._definition_cache
+        self._preamble = None
+        self._checks = 0
+
+    @property
+    def rechecked_definitions(self) -> Sequence[str]:
+        """Names of the definitions checked during the last call to check."""
+        return self._definition_cache.rechecked_definitions
+
+
+def _is_definition(node: concat.parse.Node) -> TypeGuard[_DefinitionNode]:
+    return isinstance(
+        node,
+        (
+            concat.parse.FuncdefStatementNode,
+            concat.parse.ClassdefStatementNode,
+        ),
+    )
+
+
+def _defined_name(node: _DefinitionNode) -> str:
+    if isinstance(node, concat.parse.FuncdefStatementNode):
+        return node.name
+    return node.class_name
+
+
+def read_names(node: concat.parse.Node) -> set[str]:
+    """Return the names a node might look up in its environment."""
+    names = set(node.free_type_level_names)
+    for descendant in _descendants(node):
+        if isinstance(descendant, concat.parse.NameWordNode):
+            names.add(descendant.value)
+        elif isinstance(descendant, NamedTypeNode):
+            names.add(descendant.name)
+    return names
+
+
+def _descendants(node: concat.parse.Node) -> Iterator[concat.parse.Node]:
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.children)
+        if (
+            isinstance(node, concat.parse.QuoteWordNode)
+            and node.input_stack_type is not None
+        ):
+            stack.append(node.input_stack_type)
+
+
+def _all_equal(
+    context: TypeChecker, old: Mapping[str, Type], new: Mapping[str, Type]
+) -> bool:
+    return old.keys() == new.keys() and all(
+        old[name].equals(context, new[name]) for name in old
+    )
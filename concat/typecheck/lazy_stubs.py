@@ -0,0 +1,105 @@
+"""Type checking stub modules one definition at a time.
+
+`from module import name` only needs the type of one name, but checking a
+whole stub module can take a long time when the stubs are large, e.g. when
+they are generated from a Python library. A LazyStubModule indexes the
+top-level definitions of a stub by the names they define, and checks a
+definition only when one of its names is first looked up. The definitions it
+depends on are checked first, transitively.
+"""
+
+from __future__ import annotations
+
+import pathlib
+from collections.abc import Sequence
+
+import concat.parse
+from concat.typecheck import StaticAnalysisError, TypeChecker
+from concat.typecheck.env import Environment
+from concat.typecheck.incremental import read_names
+from concat.typecheck.types import Type
+
+
+class LazyStubModule:
+    """A stub module whose definitions are checked on demand.
+
+    Definitions are always checked in the order they appear in the stub,
+    with the types of the definitions checked before them in scope, so each
+    name gets the same type it would get if the whole stub were checked."""
+
+    def __init__(
+        self,
+        context: TypeChecker,
+        path: pathlib.Path,
+        initial_env: Environment,
+        nodes: Sequence[concat.parse.Node],
+    ) -> None:
+        self._context = context
+        self._path = path
+        self._env = initial_env
+        self._nodes = nodes
+        self._definers: dict[str, list[int]] = {}
+        for index, node in enumerate(nodes):
+            for name in _defined_names(node):
+                self._definers.setdefault(name, []).append(index)
+        self._checked: set[int] = set()
+
+    @staticmethod
+    def can_load_lazily(nodes: Sequence[concat.parse.Node]) -> bool:
+        """Whether every top-level node of a stub is a definition.
+
+        Other statements (e.g. pragmas) can affect the checking of everything
+        after them, so stubs with them are checked all at once."""
+        return all(_defined_names(node) for node in nodes)
+
+    def get(self, name: str) -> Type | None:
+        """Return the type of a name in the scope of the stub, or None."""
+        if name in self._definers:
+            self._check(self._dependencies_of(name))
+        return self._env.get(name)
+
+    def check_all(self) -> Environment:
+        """Check the rest of the stub and return the resulting environment."""
+        self._check(set(range(len(self._nodes))))
+        return self._env
+
+    def _dependencies_of(self, name: str) -> set[int]:
+        dependencies = set[int]()
+        pending = [name]
+        while pending:
+            for index in self._definers.get(pending.pop(), []):
+                if index in dependencies or index in self._checked:
+                    continue
+                dependencies.add(index)
+                pending.extend(read_names(self._nodes[index]))
+        return dependencies
+
+    def _check(self, indices: set[int]) -> None:
+        indices -= self._checked
+        if not indices:
+            return
+        nodes = [self._nodes[index] for index in sorted(indices)]
+        try:
+            with self._context.checking_stub():
+                self._env = self._context.check(
+                    self._env,
+                    nodes,
+                    str(self._path.parent),
+                    _should_check_bodies=False,
+                )
+        except StaticAnalysisError as e:
+            e.set_path_if_missing(self._path)
+            raise
+        self._checked |= indices
+
+
+def _defined_names(node: concat.parse.Node) -> list[str]:
+    if isinstance(node, concat.parse.FuncdefStatementNode):
+        return [node.name]
+    if isinstance(node, concat.parse.ClassdefStatementNode):
+        return [node.class_name]
+    if isinstance(node, concat.parse.FromImportStatementNode):
+        return [node.asname or node.imported_name]
+    if isinstance(node, concat.parse.ImportStatementNode):
+        return [node.asname or node.value.split('.')[0]]
+    return []
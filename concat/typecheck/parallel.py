@@ -0,0 +1,137 @@
+"""Checking the bodies of top-level functions in parallel.
+
+Once the declared types of the top-level functions of a program are in the
+environment, their bodies can be checked independently of each other. The
+bodies are collected while the rest of the program is checked, and then
+checked by a pool of worker processes. The workers are forked, so each one
+starts with a snapshot of the type checker and the environments of the
+bodies.
+
+Checking a body can specialize the declared type of its function by binding
+its type variables. Those bindings would be lost in a worker, so if any body
+does that, the whole program is checked sequentially instead.
+
+Errors found by the workers refer to types that only exist in the worker, so
+a worker only reports that a body failed. The first failing body is then
+checked again in the main process, whose type checker is in the same state
+the workers were forked from, to raise the error itself.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import dataclasses
+import enum
+import multiprocessing
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING
+
+import concat.parse
+from concat.typecheck.context import change_context
+from concat.typecheck.errors import StaticAnalysisError, TypeError
+
+if TYPE_CHECKING:
+    from concat.typecheck import TypeChecker
+    from concat.typecheck.env import Environment
+    from concat.typecheck.types import StackEffect
+
+# Below this many functions, starting the workers costs more than it saves.
+min_parallel_bodies = 32
+
+
+@dataclasses.dataclass
+class DeferredBody:
+    node: concat.parse.FuncdefStatementNode
+    environment: Environment
+    declared_type: StackEffect
+    extensions: Sequence[Callable] | None
+
+
+class _BodyCheckResult(enum.Enum):
+    CHECKED = enum.auto()
+    SPECIALIZED = enum.auto()
+    FAILED = enum.auto()
+
+
+def can_check_bodies_in_parallel(
+    program: Sequence[concat.parse.Node], workers: int
+) -> bool:
+    return (
+        workers > 1
+        and 'fork' in multiprocessing.get_all_start_methods()
+        and sum(
+            isinstance(node, concat.parse.FuncdefStatementNode)
+            for node in program
+        )
+        >= min_parallel_bodies
+    )
+
+
+# The state inherited by the forked workers.
+_snapshot: tuple[TypeChecker, Sequence[DeferredBody]] | None = None
+
+
+def check_bodies_in_parallel(
+    context: TypeChecker, bodies: Sequence[DeferredBody], workers: int
+) -> bool:
+    """Check the bodies, raising the error that comes first in the program.
+
+    Returns False if the program has to be checked sequentially instead."""
+    global _snapshot
+
+    if not bodies:
+        return True
+    _snapshot = (context, bodies)
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context('fork')
+        ) as executor:
+            results = list(
+                executor.map(
+                    _check_body,
+                    range(len(bodies)),
+                    chunksize=max(1, len(bodies) // (workers * 4)),
+                )
+            )
+    finally:
+        _snapshot = None
+    if _BodyCheckResult.SPECIALIZED in results:
+        return False
+    for body, result in zip(bodies, results):
+        if result is _BodyCheckResult.FAILED:
+            # Raises the error found by the worker.
+            _check_body_in(context, body)
+            # The error must have depended on the bodies the worker checked
+            # before this one.
+            return False
+    return True
+
+
+def _check_body(index: int) -> _BodyCheckResult:
+    """Check one body in a worker."""
+    assert _snapshot is not None
+    context, bodies = _snapshot
+    try:
+        specialized = _check_body_in(context, bodies[index])
+    except StaticAnalysisError:
+        return _BodyCheckResult.FAILED
+    if specialized:
+        return _BodyCheckResult.SPECIALIZED
+    return _BodyCheckResult.CHECKED
+
+
+def _check_body_in(context: TypeChecker, body: DeferredBody) -> bool:
+    """Check a body like a sequential check would.
+
+    Returns whether the declared type was specialized."""
+    with change_context(context):
+        try:
+            return context._check_funcdef_body(
+                body.node,
+                body.environment,
+                body.declared_type,
+                body.extensions,
+            )
+        except TypeError as error:
+            error.set_location_if_missing(body.node.location)
+            raise
@@ -0,0 +1,108 @@
+"""An on-disk cache of programs that type checked successfully.
+
+Running the same program again shouldn't mean type checking it again. After
+a successful check, the cache records a hash of the program's source along
+with every stub file the type checker read and the stub path each imported
+module resolved to. On the next run, the program is not checked if its source
+is the same, each module still resolves to the same stub, and every stub
+still has the same contents.
+
+Entries are keyed on a fingerprint of the compiler too (see
+concat.fingerprint), so changing Concat doesn't reuse results from the old
+type checker. Failed checks are never cached, and nothing is written when
+sys.dont_write_bytecode is set.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pathlib
+import sys
+import tempfile
+from typing import TYPE_CHECKING
+
+import concat.fingerprint
+
+if TYPE_CHECKING:
+    from concat.typecheck import TypeChecker
+    from concat.typecheck.stubs import StubResolver
+
+
+def default_cache_dir() -> pathlib.Path:
+    cache_home = os.environ.get('XDG_CACHE_HOME')
+    if cache_home:
+        base = pathlib.Path(cache_home)
+    else:
+        base = pathlib.Path.home() / '.cache'
+    return base / 'concat' / 'typecheck'
+
+
+class TypeCheckResultCache:
+    def __init__(self, directory: pathlib.Path) -> None:
+        self.directory = directory
+
+    def is_checked(
+        self, source: str, source_dir: pathlib.Path, resolver: StubResolver
+    ) -> bool:
+        """Return whether the program is known to type check."""
+        try:
+            with self._entry_path(source, source_dir).open() as file:
+                entry = json.load(file)
+            for module_name, module_source_dir, stub_path in entry['modules']:
+                resolved = resolver.resolve(
+                    module_name, pathlib.Path(module_source_dir)
+                )
+                if os.fspath(resolved) != stub_path:
+                    return False
+            return all(
+                _hash_file(pathlib.Path(stub_path)) == stub_hash
+                for stub_path, stub_hash in entry['stubs'].items()
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing or corrupt entries, missing stubs, and modules that
+            # can't be found anymore (a Concat TypeError) are all misses.
+            return False
+
+    def record(
+        self, source: str, source_dir: pathlib.Path, context: TypeChecker
+    ) -> None:
+        """Remember that the program type checked with context."""
+        if sys.dont_write_bytecode:
+            return
+        modules = [
+            [module_name, os.fspath(module_source_dir), os.fspath(stub_path)]
+            for (module_name, module_source_dir), stub_path in sorted(
+                context.stub_resolver.resolutions.items()
+            )
+        ]
+        try:
+            stubs = {
+                os.fspath(path): _hash_file(path)
+                for path in sorted(context.stubs_read)
+            }
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write atomically so that concurrent runs never see a partial
+            # entry.
+            with tempfile.NamedTemporaryFile(
+                'w', dir=self.directory, suffix='.tmp', delete=False
+            ) as file:
+                json.dump({'modules': modules, 'stubs': stubs}, file)
+            os.replace(file.name, self._entry_path(source, source_dir))
+        except OSError:
+            # The cache is only an optimization.
+            pass
+
+    def _entry_path(
+        self, source: str, source_dir: pathlib.Path
+    ) -> pathlib.Path:
+        key = hashlib.sha256(concat.fingerprint.compiler_fingerprint())
+        for part in [os.fspath(source_dir), source]:
+            key.update(part.encode())
+            key.update(b'\0')
+        return self.directory / f'{key.hexdigest()}.json'
+
+
+def _hash_file(path: pathlib.Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
@@ -0,0 +1,122 @@
+"""Statistics about where type checking spends its time.
+
+When a TypeCheckStatistics is given to a type checker, the type checker
+reports each node it handles in infer, and the type representation counts
+events like constrain_and_bind_variables calls against the node being
+checked. The result is summarized per top-level definition and per node
+kind.
+"""
+
+from __future__ import annotations
+
+import collections
+import dataclasses
+import time
+from typing import Any
+
+import concat.parse
+
+type StatisticsJSON = dict[str, Any]
+
+# Event names
+CONSTRAIN = 'constrain_and_bind_variables'
+SUBSTITUTION_PUSH = 'substitution_push'
+SUBSTITUTION_COMMIT = 'substitution_commit'
+DELAYED_SUBSTITUTION_FORCE = 'delayed_substitution_force'
+GENERIC_APPLY_HIT = 'generic_apply_hit'
+GENERIC_APPLY_MISS = 'generic_apply_miss'
+OVERLOAD_SKIP = 'overload_skip'
+OVERLOAD_SELECTION_HIT = 'overload_selection_hit'
+
+_top_level_statements = '<top level>'
+
+
+@dataclasses.dataclass
+class PhaseStatistics:
+    time: float = 0.0
+    nodes: int = 0
+    events: collections.Counter[str] = dataclasses.field(
+        default_factory=collections.Counter
+    )
+
+    def to_json(self) -> StatisticsJSON:
+        return {'time': self.time, 'nodes': self.nodes, **self.events}
+
+
+class TypeCheckStatistics:
+    """Time and event counts of one or more type checks.
+
+    Time per node kind excludes the time spent in nested nodes, so the times
+    of all node kinds add up to the total. Time per definition includes
+    everything checked while checking the definition, like the modules it
+    imports. Top-level statements that aren't definitions are grouped
+    together."""
+
+    def __init__(self) -> None:
+        self.total = PhaseStatistics()
+        self.definitions: dict[str, PhaseStatistics] = {}
+        self.node_kinds: dict[str, PhaseStatistics] = {}
+        self._definition_stack: list[tuple[PhaseStatistics, float]] = []
+        # Each entry is the statistics of a node kind and when the time of
+        # that node last started counting.
+        self._node_stack: list[tuple[PhaseStatistics, float]] = []
+
+    def count(self, event: str) -> None:
+        self.total.events[event] += 1
+        if self._definition_stack:
+            self._definition_stack[-1][0].events[event] += 1
+        if self._node_stack:
+            self._node_stack[-1][0].events[event] += 1
+
+    def enter_node(self, node: concat.parse.Node, is_definition: bool) -> None:
+        now = time.perf_counter()
+        if self._node_stack:
+            self._stop_counting_time(now)
+        kind = self.node_kinds.setdefault(
+            type(node).__name__, PhaseStatistics()
+        )
+        kind.nodes += 1
+        self.total.nodes += 1
+        self._node_stack.append((kind, now))
+        if is_definition:
+            definition = self.definitions.setdefault(
+                _definition_name(node), PhaseStatistics()
+            )
+            definition.nodes += 1
+            self._definition_stack.append((definition, now))
+
+    def exit_node(self, is_definition: bool) -> None:
+        now = time.perf_counter()
+        self._stop_counting_time(now)
+        self._node_stack.pop()
+        if self._node_stack:
+            self._node_stack[-1] = (self._node_stack[-1][0], now)
+        if is_definition:
+            definition, started = self._definition_stack.pop()
+            definition.time += now - started
+
+    def _stop_counting_time(self, now: float) -> None:
+        kind, started = self._node_stack[-1]
+        kind.time += now - started
+        self.total.time += now - started
+
+    def to_json(self) -> StatisticsJSON:
+        return {
+            'total': self.total.to_json(),
+            'definitions': {
+                name: stats.to_json()
+                for name, stats in self.definitions.items()
+            },
+            'node_kinds': {
+                name: stats.to_json()
+                for name, stats in self.node_kinds.items()
+            },
+        }
+
+
+def _definition_name(node: concat.parse.Node) -> str:
+    if isinstance(node, concat.parse.FuncdefStatementNode):
+        return node.name
+    if isinstance(node, concat.parse.ClassdefStatementNode):
+        return node.class_name
+    return _top_level_statements
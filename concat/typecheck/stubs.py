@@ -0,0 +1,161 @@
+"""Finding the type stubs (.cati files) of imported modules.
+
+A StubResolver remembers where the stubs of each module were found for the
+rest of a type checking session, so importing a module again is only a
+dictionary lookup. It can also be given a StubIndex, which maps module names
+to stubs ahead of time. Building an index of a site-packages tree saves
+asking every finder on sys.meta_path about every prefix of the module name.
+
+An index is built with:
+
+    python -m concat.typecheck.build_stub_index SITE_PACKAGES INDEX_FILE
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import os
+import pathlib
+import sys
+from collections.abc import Mapping, Sequence
+from typing import Optional
+
+import concat.importer
+from concat.typecheck.errors import TypeError as ConcatTypeError
+from concat.typecheck.errors import (
+    format_cannot_find_module_from_source_dir_error,
+    format_cannot_find_module_path_error,
+)
+
+builtin_stubs_dir = pathlib.Path(__file__).with_name('builtin_stubs')
+
+
+class StubIndex:
+    """A prebuilt mapping from qualified module names to stub paths."""
+
+    def __init__(self, paths: Mapping[str, pathlib.Path]) -> None:
+        self._paths = dict(paths)
+
+    @staticmethod
+    def build(root: pathlib.Path) -> StubIndex:
+        """Index every stub under root, naming modules relative to root."""
+        root = root.resolve()
+        paths = {}
+        for stub_path in sorted(root.rglob('*.cati')):
+            parts = stub_path.relative_to(root).with_suffix('').parts
+            if parts[-1] == '__init__':
+                parts = parts[:-1]
+            if parts:
+                paths['.'.join(parts)] = stub_path
+        return StubIndex(paths)
+
+    @staticmethod
+    def load(index_path: pathlib.Path) -> StubIndex:
+        with index_path.open() as file:
+            index = json.load(file)
+        root = pathlib.Path(index['root'])
+        return StubIndex(
+            {name: root / path for name, path in index['modules'].items()}
+        )
+
+    def save(self, index_path: pathlib.Path, root: pathlib.Path) -> None:
+        root = root.resolve()
+        modules = {
+            name: os.fspath(path.relative_to(root))
+            for name, path in self._paths.items()
+        }
+        with index_path.open('w') as file:
+            json.dump({'root': os.fspath(root), 'modules': modules}, file)
+
+    def get(self, module_name: str) -> pathlib.Path | None:
+        return self._paths.get(module_name)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+
+class StubResolver:
+    """Finds and remembers the stub paths of modules.
+
+    Modules in the index, if there is one, are resolved without looking at
+    sys.meta_path. Resolutions are remembered per source directory, since a
+    module can mean something different in each one. Changes to sys.path
+    after a module is resolved are not noticed."""
+
+    def __init__(self, index: StubIndex | None = None) -> None:
+        self.index = index
+        self._paths: dict[tuple[str, pathlib.Path], pathlib.Path] = {}
+
+    def resolve(
+        self, module_name: str, source_dir: pathlib.Path
+    ) -> pathlib.Path:
+        """Return the resolved path of the stubs of a module.
+
+        source_dir is searched for the module before sys.path."""
+        key = (module_name, source_dir)
+        if key not in self._paths:
+            self._paths[key] = self._find(module_name, source_dir)
+        return self._paths[key]
+
+    @property
+    def resolutions(
+        self,
+    ) -> Mapping[tuple[str, pathlib.Path], pathlib.Path]:
+        """The stub path of each (module name, source directory) resolved."""
+        return self._paths
+
+    def _find(
+        self, module_name: str, source_dir: pathlib.Path
+    ) -> pathlib.Path:
+        module_parts = module_name.split('.')
+        if module_parts[0] in sys.builtin_module_names:
+            stub_path = builtin_stubs_dir.joinpath(*module_parts)
+            return stub_path.with_suffix('.cati').resolve()
+        if self.index is not None:
+            indexed_path = self.index.get(module_name)
+            if indexed_path is not None:
+                return indexed_path
+        return _find_stub_path_with_finders(module_parts, source_dir)
+
+
+def _find_stub_path_with_finders(
+    module_parts: Sequence[str], source_dir: pathlib.Path
+) -> pathlib.Path:
+    module_spec = None
+    path: Optional[list[str]]
+    path = [str(source_dir)] + sys.path
+    # Concat modules can be imported even before the path hook is installed
+    # for them.
+    finders = concat.importer.meta_path()
+
+    for module_prefix in itertools.accumulate(
+        module_parts, lambda a, b: f'{a}.{b}'
+    ):
+        for finder in finders:
+            module_spec = finder.find_spec(module_prefix, path)
+            if module_spec is not None:
+                path = module_spec.submodule_search_locations
+                break
+    if module_spec is None:
+        raise ConcatTypeError(
+            format_cannot_find_module_from_source_dir_error(
+                '.'.join(module_parts),
+                source_dir,
+            ),
+            is_occurs_check_fail=None,
+            rigid_variables=None,
+        )
+    origin = module_spec.origin
+    if origin is None:
+        raise ConcatTypeError(
+            format_cannot_find_module_path_error('.'.join(module_parts)),
+            is_occurs_check_fail=None,
+            rigid_variables=None,
+        )
+    module_path = pathlib.Path(origin)
+    # Concat modules are their own stubs. For now, assume any other module is
+    # written in Python.
+    if module_path.suffix == concat.importer.source_suffix:
+        return module_path.resolve()
+    return module_path.with_suffix('.cati').resolve()
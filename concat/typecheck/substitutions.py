@@ -5,7 +5,9 @@ from __future__ import annotations
 from contextlib import contextmanager
 from typing import (
     TYPE_CHECKING,
+    AbstractSet,
     Any,
+    ClassVar,
     Iterable,
     Iterator,
     List,
@@ -16,6 +18,11 @@ from typing import (
 )
 
 from concat.typecheck.errors import format_substitution_kind_error
+from concat.typecheck.statistics import (
+    SUBSTITUTION_COMMIT,
+    SUBSTITUTION_PUSH,
+    TypeCheckStatistics,
+)
 
 # circular imports
 if TYPE_CHECKING:
@@ -50,9 +57,12 @@ class MutableSubstitutions(Mapping['Variable', 'Type']):
     ) -> None:
         self._subs = [{} if sub is None else dict(sub)]
         self._commit_flags: list[bool] = []
+        self.statistics: TypeCheckStatistics | None = None
 
     @contextmanager
     def push(self) -> Iterator[Mapping[Variable, Type]]:
+        if self.statistics is not None:
+            self.statistics.count(SUBSTITUTION_PUSH)
         sub: dict[Variable, Type] = {}
         self._subs.append(sub)
         self._commit_flags.append(False)
@@ -61,8 +71,32 @@ class MutableSubstitutions(Mapping['Variable', 'Type']):
             self._subs.pop()
 
     def commit(self) -> None:
+        if self.statistics is not None:
+            self.statistics.count(SUBSTITUTION_COMMIT)
         self._commit_flags[-1] = True
 
+    def is_settled(self, k: Variable) -> bool:
+        """Return whether k is bound outside of any undoable frame."""
+        return k in self._subs[0]
+
+    def has_unsettled_bindings(self) -> bool:
+        """Return whether any variable is bound in an undoable frame."""
+        return any(self._subs[1:])
+
+    def mark(self) -> tuple[int, int]:
+        """Return a marker of the bindings made so far, for undo_to."""
+        # Bindings are only added to the last frame and never removed from
+        # it while it's the last.
+        return len(self._subs), len(self._subs[-1])
+
+    def undo_to(self, mark: tuple[int, int]) -> None:
+        """Undo every binding made since mark was returned."""
+        frame_count, binding_count = mark
+        del self._subs[frame_count:]
+        last_sub = self._subs[-1]
+        for k in list(last_sub)[binding_count:]:
+            del last_sub[k]
+
     def __getitem__(self, k: Variable) -> Type:
         for sub in self._subs:
             if k in sub:
@@ -82,9 +116,14 @@ class MutableSubstitutions(Mapping['Variable', 'Type']):
 
 
 class Substitutions(Mapping['Variable', 'Type']):
-    """Substitutions of type variables with types."""
+    """Substitutions of type variables with types.
+
+    Recording where substitutions came from (subtyping_provenance) builds a
+    nested list every time substitutions are composed, so it is only done
+    when track_provenance is set, which is useful for debugging."""
 
     __next_id = 0
+    track_provenance: ClassVar[bool] = False
 
     def __init__(
         self,
@@ -108,11 +147,15 @@ class Substitutions(Mapping['Variable', 'Type']):
     def add_subtyping_provenance(
         self, subtyping_query: Tuple['Type', 'Type']
     ) -> None:
-        self.subtyping_provenance.append(subtyping_query)
+        if Substitutions.track_provenance:
+            self.subtyping_provenance.append(subtyping_query)
 
     def __getitem__(self, var: 'Variable') -> 'Type':
         return self._sub[var]
 
+    def __contains__(self, var: object) -> bool:
+        return var in self._sub
+
     def __iter__(self) -> Iterator['Variable']:
         return iter(self._sub)
 
@@ -125,6 +168,16 @@ class Substitutions(Mapping['Variable', 'Type']):
     def _dom(self) -> Set['Variable']:
         return {*self}
 
+    def restrict(self, variables: AbstractSet[Variable]) -> Substitutions:
+        """Return the substitutions of only the given variables."""
+        if len(self._sub) <= len(variables):
+            return Substitutions(
+                {v: t for v, t in self._sub.items() if v in variables}
+            )
+        return Substitutions(
+            {v: self._sub[v] for v in variables if v in self._sub}
+        )
+
     def __str__(self) -> str:
         return (
             f'{{{', '.join(map(lambda i: f'{i[0]}: {i[1]}', self.items()))}}}'
@@ -144,13 +197,14 @@ class Substitutions(Mapping['Variable', 'Type']):
                 **{
                     a: i.apply_substitution(context, sub)
                     for a, i in self.items()
-                    if a not in sub._dom()
+                    if a not in sub
                 },
             }
         )
-        new_sub.subtyping_provenance = [
-            (self.subtyping_provenance, sub.subtyping_provenance)
-        ]
+        if Substitutions.track_provenance:
+            new_sub.subtyping_provenance = [
+                (self.subtyping_provenance, sub.subtyping_provenance)
+            ]
         return new_sub
 
     def __hash__(self) -> int:
@@ -5,7 +5,7 @@ import functools
 import logging
 import operator
 from collections import defaultdict
-from collections.abc import Callable
+from collections.abc import Callable, Hashable
 from typing import (
     TYPE_CHECKING,
     AbstractSet,
@@ -18,6 +18,7 @@ from typing import (
     Mapping,
     NoReturn,
     Optional,
+    Self,
     Sequence,
     Tuple,
     TypeVar,
@@ -55,6 +56,14 @@ from concat.typecheck.errors import (
     format_wrong_arg_kind_error,
     format_wrong_number_of_type_arguments_error,
 )
+from concat.typecheck.statistics import (
+    CONSTRAIN,
+    DELAYED_SUBSTITUTION_FORCE,
+    GENERIC_APPLY_HIT,
+    GENERIC_APPLY_MISS,
+    OVERLOAD_SELECTION_HIT,
+    OVERLOAD_SKIP,
+)
 from concat.typecheck.substitutions import Substitutions
 
 if TYPE_CHECKING:
@@ -65,21 +74,25 @@ if TYPE_CHECKING:
 _logger = ConcatLogger(logging.getLogger())
 
 
-def _sub_cache[T: Type, R](
+def _sub_cache[T: Type, R: Type](
     f: Callable[[T, TypeChecker, Substitutions], R],
 ) -> Callable[[T, TypeChecker, Substitutions], T | R]:
-    _sub_cache = dict[tuple[int, int], T | R]()
-
     @functools.wraps(f)
     def apply_substitution(
         self: T, context: TypeChecker, sub: Substitutions
     ) -> T | R:
-        if (self._type_id, sub.id) not in _sub_cache:
-            if not (set(sub) & self.free_type_variables(context)):
-                _sub_cache[self._type_id, sub.id] = self
+        results = cast(
+            dict[tuple[int, int], T | R], context.substitution_results
+        )
+        if (self._type_id, sub.id) not in results:
+            if sub.keys().isdisjoint(self.free_type_variables(context)):
+                results[self._type_id, sub.id] = self
             else:
-                _sub_cache[self._type_id, sub.id] = f(self, context, sub)
-        return _sub_cache[self._type_id, sub.id]
+                result = f(self, context, sub)
+                results[self._type_id, sub.id] = context.type_interner.intern(
+                    context, result
+                )
+        return results[self._type_id, sub.id]
 
     return apply_substitution
 
@@ -108,17 +121,217 @@ def _constrain_on_whnf[T: Type](f: _ConstrainFn[T]) -> _ConstrainFn[T]:
                 rigid_variables,
                 subtyping_assumptions,
             )
-        return f(
-            self,
-            context,
-            supertype,
-            rigid_variables,
-            subtyping_assumptions,
-        )
+        if context.statistics is not None:
+            context.statistics.count(CONSTRAIN)
+        cache = context.subtyping_cache
+        if subtyping_assumptions or not cache.can_cache(
+            context, self, supertype
+        ):
+            return f(
+                self,
+                context,
+                supertype,
+                rigid_variables,
+                subtyping_assumptions,
+            )
+        # Structurally identical types share a judgement.
+        subtype_key = context.type_interner.intern(context, self)
+        supertype_key = context.type_interner.intern(context, supertype)
+        if cache.lookup(subtype_key, supertype_key):
+            return
+        try:
+            f(self, context, supertype, rigid_variables, subtyping_assumptions)
+        except ConcatTypeError as e:
+            cache.record_failure(subtype_key, supertype_key, e)
+            raise
+        cache.record_success(subtype_key, supertype_key)
 
     return constrain_and_bind_variables
 
 
+class SubtypingCache:
+    """Memoized subtyping judgements between closed types.
+
+    Types without free type variables cannot bind anything when they are
+    constrained, so whether one is a subtype of the other is the same every
+    time it is asked. Both positive and negative results are remembered,
+    keyed on the type ids of the subtype and the supertype.
+
+    A variable that is permanently bound doesn't count as free, since the
+    binding can't be backtracked."""
+
+    def __init__(self, enabled: bool = True) -> None:
+        self._results: dict[tuple[int, int], ConcatTypeError | None] = {}
+        self._closed_type_ids: set[int] = set()
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def can_cache(
+        self, context: TypeChecker, subtype: Type, supertype: Type
+    ) -> bool:
+        return (
+            self.enabled
+            and self._is_closed(context, subtype)
+            and self._is_closed(context, supertype)
+        )
+
+    def _is_closed(self, context: TypeChecker, ty: Type) -> bool:
+        if ty._type_id in self._closed_type_ids:
+            return True
+        if not _is_closed(context, ty):
+            return False
+        self._closed_type_ids.add(ty._type_id)
+        return True
+
+    def lookup(self, subtype: Type, supertype: Type) -> bool:
+        """Return True if subtype is known to be a subtype of supertype.
+
+        Raises the remembered error if it is known not to be, and returns
+        False if the judgement has not been made yet."""
+        key = (subtype._type_id, supertype._type_id)
+        if key not in self._results:
+            self.misses += 1
+            return False
+        self.hits += 1
+        error = self._results[key]
+        if error is not None:
+            raise _copy_error(error)
+        return True
+
+    def record_success(self, subtype: Type, supertype: Type) -> None:
+        self._results[subtype._type_id, supertype._type_id] = None
+
+    def record_failure(
+        self, subtype: Type, supertype: Type, error: ConcatTypeError
+    ) -> None:
+        self._results[subtype._type_id, supertype._type_id] = _copy_error(
+            error
+        )
+
+    def clear(self) -> None:
+        self._results.clear()
+        self._closed_type_ids.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+class TypeInterner:
+    """Hash consing of closed types.
+
+    Structurally identical closed types are replaced by one canonical object,
+    so they also share a type id. This lets the caches keyed on type ids
+    (substitution results, generic instantiations and subtyping judgements)
+    hit across types that were built separately.
+
+    Types are compared by their constructor and their parts. Types that
+    don't expose their parts (e.g. nominal types and variables) are compared
+    by identity, as are types with an internal name, since the name is only
+    for display and shouldn't move to a different object."""
+
+    def __init__(self, enabled: bool = True) -> None:
+        self._canonical: dict[Hashable, Type] = {}
+        self._keys: dict[int, Hashable | None] = {}
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size(self) -> int:
+        """The number of canonical types."""
+        return len(self._canonical)
+
+    def intern[T: Type](self, context: TypeChecker, ty: T) -> T:
+        """Return the canonical type structurally identical to ty.
+
+        ty becomes canonical if there isn't one yet. Types that aren't closed
+        are returned unchanged."""
+        if not self.enabled:
+            return ty
+        key = self._key(context, ty)
+        if key is None:
+            return ty
+        canonical = self._canonical.get(key)
+        if canonical is None:
+            self.misses += 1
+            self._canonical[key] = ty
+            return ty
+        self.hits += 1
+        return cast(T, canonical)
+
+    def _key(self, context: TypeChecker, ty: Type) -> Hashable | None:
+        if ty._type_id in self._keys:
+            return self._keys[ty._type_id]
+        # Keys are computed without forcing types, since forcing (recursive)
+        # types can be arbitrarily expensive.
+        key: Hashable | None = None
+        parts = ty._structural_parts()
+        if isinstance(ty, DelayedSubstitution):
+            if ty._forced is None:
+                # The key might be known once the substitution is forced.
+                return None
+            key = self._key(context, ty._forced)
+        elif parts is None or ty._internal_name is not None:
+            if _is_known_to_be_closed(context, ty):
+                key = ty._type_id
+        else:
+            part_keys = [
+                self._key(context, part) if isinstance(part, Type) else part
+                for part in parts
+            ]
+            if None not in part_keys:
+                key = (type(ty), *part_keys)
+        self._keys[ty._type_id] = key
+        return key
+
+    def clear(self) -> None:
+        self._canonical.clear()
+        self._keys.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def _is_closed(context: TypeChecker, ty: Type) -> bool:
+    return _are_settled(context, ty.free_type_variables(context))
+
+
+def _is_known_to_be_closed(context: TypeChecker, ty: Type) -> bool:
+    if isinstance(ty, Variable):
+        return _are_settled(context, [ty])
+    ftv = ty._free_type_variables_cached
+    return ftv is not None and _are_settled(context, ftv)
+
+
+def _are_settled(context: TypeChecker, variables: Iterable[Variable]) -> bool:
+    seen = set[Variable]()
+    pending = list(variables)
+    while pending:
+        variable = pending.pop()
+        if variable in seen:
+            continue
+        seen.add(variable)
+        if not context.substitutions.is_settled(variable):
+            return False
+        pending.extend(
+            context.substitutions[variable].free_type_variables(context)
+        )
+    return True
+
+
+def _copy_error(error: ConcatTypeError) -> ConcatTypeError:
+    # Errors are mutated by their handlers (e.g. to add locations), so each
+    # raise of a remembered failure gets its own copy. copy.copy doesn't work
+    # because the error constructors don't take their args positionally.
+    copied = type(error).__new__(type(error), *error.args)
+    copied.__dict__.update(error.__dict__)
+    return copied
+
+
 def _whnf_self[T: Type, **K, R](
     f: Callable[Concatenate[T, TypeChecker, K], R],
 ) -> Callable[Concatenate[T, TypeChecker, K], R]:
@@ -186,9 +399,9 @@ class Type(abc.ABC):
         return not any(v in ftv for v in new_subs)
 
     # NOTE: Avoid hashing types. I'm having correctness issues related to
-    # hashing that I'd rather avoid entirely. Maybe one day I'll introduce hash
-    # consing, but that would only reflect syntactic eequality, and I've been
-    # using hashing for type equality.
+    # hashing that I'd rather avoid entirely. Hash consing of closed types
+    # (TypeInterner) only reflects syntactic equality, so it's done on
+    # structural keys instead of through __hash__.
 
     def get_type_of_attribute(self, context: TypeChecker, name: str) -> 'Type':
         attributes = self.attributes(context)
@@ -213,6 +426,13 @@ class Type(abc.ABC):
     ) -> InsertionOrderedSet['Variable']:
         pass
 
+    def _structural_parts(self) -> Sequence[Hashable] | None:
+        """The parts that make up this type, if it is compared structurally.
+
+        Used for hash consing. None means the type is only identical to
+        itself."""
+        return None
+
     @_whnf_self
     def free_type_variables(
         self, context: TypeChecker
@@ -760,6 +980,9 @@ class TypeApplication(Type):
             f'{[a.force_repr(context) for a in self._args]})'
         )
 
+    def _structural_parts(self) -> Sequence[Hashable]:
+        return (self._head, *self._args)
+
     def _free_type_variables(
         self, context: TypeChecker
     ) -> InsertionOrderedSet['Variable']:
@@ -1503,9 +1726,16 @@ class GenericType(Type):
     def apply(
         self, context: TypeChecker, type_arguments: 'TypeArguments'
     ) -> 'Type':
+        type_arguments = [
+            context.type_interner.intern(context, t) for t in type_arguments
+        ]
         type_argument_ids = tuple(t._type_id for t in type_arguments)
         if type_argument_ids in self._instantiations:
+            if context.statistics is not None:
+                context.statistics.count(GENERIC_APPLY_HIT)
             return self._instantiations[type_argument_ids]
+        if context.statistics is not None:
+            context.statistics.count(GENERIC_APPLY_MISS)
         expected_kinds = [var.kind for var in self._type_parameters]
         if self.is_variadic:
             type_arguments = [
@@ -1534,13 +1764,15 @@ class GenericType(Type):
                 )
         sub = Substitutions(zip(self._type_parameters, type_arguments))
         instance = self._body.apply_substitution(context, sub)
-        self._instantiations[type_argument_ids] = instance
         if self._internal_name is not None:
             instance_internal_name = self._internal_name
             instance_internal_name += (
                 '[' + ', '.join(map(str, type_arguments)) + ']'
             )
             instance.set_internal_name(instance_internal_name)
+        else:
+            instance = context.type_interner.intern(context, instance)
+        self._instantiations[type_argument_ids] = instance
         return instance
 
     @property
@@ -1752,6 +1984,56 @@ class TypeSequence(Type):
         rigid_variables: AbstractSet[Variable],
         subtyping_assumptions: Sequence[tuple[Type, Type]],
     ) -> None:
+        # `t_n <: `s_m  *a? `t... <: *b? `s...
+        #   ---
+        # *a? `t... `t_n <: *b? `s... `s_m
+        #
+        # Applied right-to-left to every pair of individual types in one pass
+        # so that deep stacks don't cost a new sequence and a Python frame for
+        # each item.
+        pair_count = min(
+            len(subtype._individual_types), len(self._individual_types)
+        )
+        if not pair_count:
+            return self._constrain_rest_as_supertype_of_type_sequence(
+                context, subtype, rigid_variables, subtyping_assumptions
+            )
+        for i in range(1, pair_count + 1):
+            subtype._individual_types[-i].constrain_and_bind_variables(
+                context,
+                self._individual_types[-i],
+                rigid_variables,
+                subtyping_assumptions,
+            )
+        subtype_rest = TypeSequence(
+            context, subtype.as_sequence()[:-pair_count]
+        )
+        supertype_rest = TypeSequence(
+            context, self.as_sequence()[:-pair_count]
+        )
+        try:
+            subtype_rest.constrain_and_bind_variables(
+                context,
+                supertype_rest,
+                rigid_variables,
+                subtyping_assumptions,
+            )
+        except StackMismatchError as e:
+            raise StackMismatchError(
+                subtype,
+                self,
+                e.is_occurs_check_fail,
+                rigid_variables,
+            )
+
+    def _constrain_rest_as_supertype_of_type_sequence(
+        self,
+        context: TypeChecker,
+        subtype: TypeSequence,
+        rigid_variables: AbstractSet[Variable],
+        subtyping_assumptions: Sequence[tuple[Type, Type]],
+    ) -> None:
+        """Handle the cases where one of the sequences has no items."""
         if subtype._is_empty():
             # [] <: []
             if self._is_empty():
@@ -1833,31 +2115,9 @@ class TypeSequence(Type):
                 subtyping_assumptions,
             )
             return
-        # `t_n <: `s_m  *a? `t... <: *b? `s...
-        #   ---
-        # *a? `t... `t_n <: *b? `s... `s_m
-        elif self._individual_types:
-            subtype._individual_types[-1].constrain_and_bind_variables(
-                context,
-                self._individual_types[-1],
-                rigid_variables,
-                subtyping_assumptions,
-            )
-            try:
-                subtype.index(context, slice(-1)).constrain_and_bind_variables(
-                    context,
-                    self.index(context, slice(-1)),
-                    rigid_variables,
-                    subtyping_assumptions,
-                )
-                return
-            except StackMismatchError as e:
-                raise StackMismatchError(
-                    subtype,
-                    self,
-                    e.is_occurs_check_fail,
-                    rigid_variables,
-                )
+        # *a <: *b? `s... `s_m, or the sequence variables are rigid or occur
+        # on the other side
+        # error
         else:
             raise StackMismatchError(
                 subtype,
@@ -1866,13 +2126,18 @@ class TypeSequence(Type):
                 rigid_variables=rigid_variables,
             )
 
+    def _structural_parts(self) -> Sequence[Hashable]:
+        return self.as_sequence()
+
     def _free_type_variables(
         self, context: TypeChecker
     ) -> InsertionOrderedSet['Variable']:
-        ftv: InsertionOrderedSet[Variable] = InsertionOrderedSet([])
+        # Collect into a dict first: unioning the sets one at a time is
+        # quadratic in the length of the sequence.
+        ftv = dict[Variable, None]()
         for t in self.to_iterator(context):
-            ftv |= t.free_type_variables(context)
-        return ftv
+            ftv.update(dict.fromkeys(t.free_type_variables(context)))
+        return InsertionOrderedSet(list(ftv))
 
     @property
     def attributes(self) -> NoReturn:
@@ -2051,6 +2316,9 @@ class StackEffect(IndividualType):
         __constrain_raise_subtyping_error
     )
 
+    def _structural_parts(self) -> Sequence[Hashable]:
+        return (self.input, self.output)
+
     def _free_type_variables(
         self, context: TypeChecker
     ) -> InsertionOrderedSet['Variable']:
@@ -2442,6 +2710,13 @@ class ObjectType(IndividualType):
         )
         return f'{type(self).__qualname__}(attributes={attributes})'
 
+    def _structural_parts(self) -> Sequence[Hashable]:
+        return [
+            part
+            for name, ty in sorted(self._attributes.items())
+            for part in (name, ty)
+        ]
+
     def _free_type_variables(
         self, context: TypeChecker
     ) -> InsertionOrderedSet[Variable]:
@@ -2494,6 +2769,9 @@ class TypeTuple(Type):
                 subtyping_assumptions,
             )
 
+    def _structural_parts(self) -> Sequence[Hashable]:
+        return self._types
+
     def _free_type_variables(
         self, context: TypeChecker
     ) -> InsertionOrderedSet[Variable]:
@@ -2545,15 +2823,24 @@ class DelayedSubstitution(Type):
         self._sub: Substitutions
         self._ty: Type
         if isinstance(ty, DelayedSubstitution):
-            sub = ty._sub.apply_substitution(context, sub)
-            ty = ty._ty
-        self._sub = Substitutions(
-            {
-                v: t
-                for v, t in sub.items()
-                if v in ty.free_type_variables(context)
-            }
-        )
+            # Compose with the inner substitution, but only keep what can
+            # affect the type. Composing with all of sub first would make a
+            # chain of delayed substitutions take quadratic time when each
+            # sub is large.
+            inner, ty = ty._sub, ty._ty
+            ftv = ty.free_type_variables(context)
+            self._sub = Substitutions(
+                {
+                    **sub.restrict(ftv),
+                    **{
+                        v: t.apply_substitution(context, sub)
+                        for v, t in inner.items()
+                        if v not in sub and v in ftv
+                    },
+                }
+            )
+        else:
+            self._sub = sub.restrict(ty.free_type_variables(context))
         self._ty = ty
         self._forced: Type | None = None
 
@@ -2626,6 +2913,8 @@ class DelayedSubstitution(Type):
         return self._ty.kind
 
     def force(self, context: TypeChecker) -> Type:
+        if context.statistics is not None:
+            context.statistics.count(DELAYED_SUBSTITUTION_FORCE)
         if not self._forced:
             self._forced = self._ty.force_substitution(
                 context, self._sub
@@ -2741,6 +3030,9 @@ class VariableArgumentPack(Type):
             rigid_variables=rigid_variables,
         )
 
+    def _structural_parts(self) -> Sequence[Hashable]:
+        return self._types
+
     def _free_type_variables(
         self, context: TypeChecker
     ) -> InsertionOrderedSet[Variable]:
@@ -2853,6 +3145,9 @@ class PythonFunctionType(IndividualType):
             )
         self._type_arguments = _type_arguments
 
+    def _structural_parts(self) -> Sequence[Hashable]:
+        return self._type_arguments
+
     def _free_type_variables(
         self, context: TypeChecker | None = None
     ) -> InsertionOrderedSet[Variable]:
@@ -3004,9 +3299,22 @@ class PythonFunctionType(IndividualType):
                 subtyping_assumptions,
             )
 
-        # Support overloading the subtype.
-        exceptions = []
-        for overload in subtype._overloads.arguments:
+        # Support overloading the subtype. Overloads that obviously can't
+        # accept the arguments are skipped, and so are the overloads that
+        # rejected the same closed argument types before. Errors for skipped
+        # overloads are only made if no overload matches.
+        overloads = subtype._overloads.arguments
+        selection_key = self._overload_selection_key(context, subtype)
+        start = 0
+        if selection_key in context.overload_selections:
+            start = context.overload_selections[selection_key]
+            if context.statistics is not None:
+                context.statistics.count(OVERLOAD_SELECTION_HIT)
+        failures: list[tuple[Type, ConcatTypeError | None]] = [
+            (overload, None) for overload in overloads[:start]
+        ]
+        for index in range(start, len(overloads)):
+            overload = overloads[index]
             if isinstance(
                 overload, Variable
             ) and overload.kind <= VariableArgumentKind(TopKind):
@@ -3017,7 +3325,27 @@ class PythonFunctionType(IndividualType):
                     subtyping_assumptions,
                 )
                 return
+            if not _overload_may_accept(
+                context, overload, self, subtyping_assumptions
+            ):
+                if context.statistics is not None:
+                    context.statistics.count(OVERLOAD_SKIP)
+                failures.append((overload, None))
+                continue
             try:
+                if selection_key is not None:
+                    # The arguments and the overload are closed, so checking
+                    # the arguments alone is cached and binds nothing.
+                    assert isinstance(overload, PythonFunctionType)
+                    self.input.constrain_and_bind_variables(
+                        context,
+                        overload.input,
+                        rigid_variables,
+                        subtyping_assumptions,
+                    )
+                    context.overload_selections.setdefault(
+                        selection_key, index
+                    )
                 overload.constrain_and_bind_variables(
                     context,
                     self,
@@ -3026,7 +3354,16 @@ class PythonFunctionType(IndividualType):
                 )
                 return
             except ConcatTypeError as e:
-                exceptions.append(e)
+                failures.append((overload, e))
+        exceptions = [
+            e
+            or ConcatTypeError(
+                format_subtyping_error(context, overload, self),
+                is_occurs_check_fail=None,
+                rigid_variables=rigid_variables,
+            )
+            for overload, e in failures
+        ]
         raise ConcatTypeError(
             f'no overload of {subtype} is a subtype of {self}',
             any(e.is_occurs_check_fail for e in exceptions),
@@ -3035,6 +3372,64 @@ class PythonFunctionType(IndividualType):
             f'{subtype} is not compatible with {self}', exceptions
         )
 
+    def _overload_selection_key(
+        self, context: TypeChecker, subtype: PythonOverloadedType
+    ) -> tuple[int, int] | None:
+        if not (
+            context.subtyping_cache.enabled
+            and all(
+                isinstance(overload, PythonFunctionType)
+                for overload in subtype.overloads
+            )
+            and _is_closed(context, subtype)
+            and _is_closed(context, self.input)
+        ):
+            return None
+        arguments = context.type_interner.intern(context, self.input)
+        return (subtype._type_id, arguments._type_id)
+
+
+def _overload_may_accept(
+    context: TypeChecker,
+    overload: Type,
+    function: PythonFunctionType,
+    subtyping_assumptions: Sequence[tuple[Type, Type]],
+) -> bool:
+    """Cheaply tell whether an overload might be a subtype of function.
+
+    False means that the overload is definitely not a subtype: it takes a
+    different number of arguments, or the top arguments are of unrelated
+    nominal types."""
+    if not isinstance(overload, PythonFunctionType):
+        return True
+    parameters, arguments = overload.input, function.input
+    if not (
+        isinstance(parameters, TypeSequence)
+        and isinstance(arguments, TypeSequence)
+        and parameters._rest is None
+        and arguments._rest is None
+    ):
+        return True
+    parameter_types = parameters._individual_types
+    argument_types = arguments._individual_types
+    if len(parameter_types) != len(argument_types):
+        return False
+    if not parameter_types:
+        return True
+    # Constraining the arguments would force them anyway.
+    parameter = parameter_types[-1].force_if_possible(context)
+    argument = argument_types[-1].force_if_possible(context)
+    if (
+        isinstance(parameter, NominalType)
+        and isinstance(argument, NominalType)
+        and not parameter.is_object_type(context)
+        and not _contains_assumption(
+            subtyping_assumptions, argument, parameter
+        )
+    ):
+        return argument._brand.is_subrand_of(context, parameter._brand)
+    return True
+
 
 class _PythonOverloadedType(IndividualType):
     def __init__(self, overloads: Type) -> None:
@@ -3311,6 +3706,9 @@ class _OptionalType(IndividualType):
     def to_user_string(self, _context: TypeChecker) -> str:
         return f'optional_type[{self._type_argument}]'
 
+    def _structural_parts(self) -> Sequence[Hashable]:
+        return (self._type_argument,)
+
     def _free_type_variables(
         self, context: TypeChecker
     ) -> InsertionOrderedSet[Variable]:
@@ -3456,6 +3854,19 @@ OptionalType = _OptionalType
 
 
 class Kind(abc.ABC):
+    """The kinds of types.
+
+    Kinds are interned: structurally equal kinds are the same object, so
+    they are compared and hashed by identity. The subkind relation is
+    memoized on each kind, so checking it again is a dictionary lookup."""
+
+    _is_subkind_of: dict[Kind, bool]
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> Self:
+        kind = super().__new__(cls)
+        kind._is_subkind_of = {}
+        return kind
+
     @abc.abstractmethod
     def __or__(self, other: Kind) -> Kind:
         pass
@@ -3464,15 +3875,25 @@ class Kind(abc.ABC):
     def __and__(self, other: Kind) -> Kind:
         pass
 
-    @abc.abstractmethod
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Unpickling goes through __new__ so that kinds stay interned.
+        return (type(self), ())
+
     def __eq__(self, other: object) -> bool:
-        pass
+        return self is other
+
+    def __hash__(self) -> int:
+        return id(self)
 
     def __lt__(self, other: Kind) -> bool:
-        return self <= other and self != other
+        return self <= other and self is not other
 
     def __le__(self, other: Kind) -> bool:
-        return self | other == other
+        if self is other:
+            return True
+        if other not in self._is_subkind_of:
+            self._is_subkind_of[other] = self | other is other
+        return self._is_subkind_of[other]
 
     def __ge__(self, other: Kind) -> bool:
         return other <= self
@@ -3485,19 +3906,23 @@ class Kind(abc.ABC):
 class VariableArgumentKind(Kind):
     """The kind of type-level variable arguments."""
 
-    def __init__(self, argument_kind: Kind) -> None:
-        self._argument_kind = argument_kind
+    __instances: dict[Kind, VariableArgumentKind] = {}
+    _argument_kind: Kind
+
+    def __new__(cls, argument_kind: Kind) -> VariableArgumentKind:
+        if argument_kind not in cls.__instances:
+            kind = super().__new__(cls)
+            kind._argument_kind = argument_kind
+            cls.__instances[argument_kind] = kind
+        return cls.__instances[argument_kind]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (VariableArgumentKind, (self._argument_kind,))
 
     @property
     def argument_kind(self) -> Kind:
         return self._argument_kind
 
-    def __eq__(self, other: object) -> bool:
-        return (
-            isinstance(other, VariableArgumentKind)
-            and self._argument_kind == other._argument_kind
-        )
-
     def __or__(self, other: Kind) -> Kind:
         if other is BottomKind:
             return self
@@ -3521,13 +3946,19 @@ class VariableArgumentKind(Kind):
 
 
 class TupleKind(Kind):
-    def __init__(self, kinds: Sequence[Kind]) -> None:
-        self._kinds = [*kinds]
+    __instances: dict[tuple[Kind, ...], TupleKind] = {}
+    _kinds: Sequence[Kind]
 
-    def __eq__(self, other) -> bool:
-        if not isinstance(other, Kind):
-            return NotImplemented
-        return isinstance(other, TupleKind) and self._kinds == other._kinds
+    def __new__(cls, kinds: Sequence[Kind]) -> TupleKind:
+        key = tuple(kinds)
+        if key not in cls.__instances:
+            kind = super().__new__(cls)
+            kind._kinds = key
+            cls.__instances[key] = kind
+        return cls.__instances[key]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (TupleKind, (self._kinds,))
 
     def __or__(self, other: Kind) -> Kind:
         if other is BottomKind:
@@ -3555,7 +3986,7 @@ class TupleKind(Kind):
         return f'Tuple[{', '.join(str(k) for k in self._kinds)}]'
 
     def __repr__(self) -> str:
-        return f'TupleKind({self._kinds!r})'
+        return f'TupleKind({[*self._kinds]!r})'
 
     @property
     def element_kinds(self) -> Sequence[Kind]:
@@ -3570,9 +4001,6 @@ class _ItemKind(Kind):
             cls.__instance = super().__new__(cls)
         return cls.__instance
 
-    def __eq__(self, other: object) -> bool:
-        return self is other
-
     def __or__(self, other: Kind) -> Kind:
         if (
             other is BottomKind
@@ -3605,9 +4033,6 @@ class _TopKind(Kind):
             cls.__instance = super().__new__(cls)
         return cls.__instance
 
-    def __eq__(self, other: object) -> bool:
-        return self is other
-
     def __or__(self, other: Kind) -> Kind:
         return self
 
@@ -3629,9 +4054,6 @@ class _BottomKind(Kind):
             cls.__instance = super().__new__(cls)
         return cls.__instance
 
-    def __eq__(self, other: object) -> bool:
-        return self is other
-
     def __or__(self, other: Kind) -> Kind:
         return other
 
@@ -3653,9 +4075,6 @@ class _IndividualKind(Kind):
             cls.__instance = super().__new__(cls)
         return cls.__instance
 
-    def __eq__(self, other: object) -> bool:
-        return self is other
-
     def __or__(self, other: Kind) -> Kind:
         if other is self or other is BottomKind:
             return self
@@ -3683,9 +4102,6 @@ class _SequenceKind(Kind):
             cls.__instance = super().__new__(cls)
         return cls.__instance
 
-    def __eq__(self, other: object) -> bool:
-        return self is other
-
     def __or__(self, other: Kind) -> Kind:
         if other is BottomKind or other is self:
             return self
@@ -3704,24 +4120,28 @@ SequenceKind = _SequenceKind()
 
 
 class GenericTypeKind(Kind):
-    def __init__(
-        self, parameter_kinds: Sequence[Kind], result_kind: Kind
-    ) -> None:
+    __instances: dict[tuple[tuple[Kind, ...], Kind], GenericTypeKind] = {}
+    parameter_kinds: Sequence[Kind]
+    result_kind: Kind
+
+    def __new__(
+        cls, parameter_kinds: Sequence[Kind], result_kind: Kind
+    ) -> GenericTypeKind:
         if not parameter_kinds:
             raise ConcatTypeError(
                 'Generic type kinds cannot have empty parameters',
                 is_occurs_check_fail=None,
                 rigid_variables=None,
             )
-        self.parameter_kinds = parameter_kinds
-        self.result_kind = result_kind
+        key = (tuple(parameter_kinds), result_kind)
+        if key not in cls.__instances:
+            kind = super().__new__(cls)
+            kind.parameter_kinds, kind.result_kind = key
+            cls.__instances[key] = kind
+        return cls.__instances[key]
 
-    def __eq__(self, other: object) -> bool:
-        return (
-            isinstance(other, GenericTypeKind)
-            and list(self.parameter_kinds) == list(other.parameter_kinds)
-            and self.result_kind == other.result_kind
-        )
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (GenericTypeKind, (self.parameter_kinds, self.result_kind))
 
     def __or__(self, other: Kind) -> Kind:
         if other is BottomKind:
@@ -3766,7 +4186,8 @@ class GenericTypeKind(Kind):
 
     def __repr__(self) -> str:
         return (
-            f'GenericTypeKind({self.parameter_kinds!r}, {self.result_kind!r})'
+            f'GenericTypeKind({[*self.parameter_kinds]!r}, '
+            f'{self.result_kind!r})'
         )
 
 
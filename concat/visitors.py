@@ -9,6 +9,7 @@ from typing import (
     Tuple,
     Union,
     Dict,
+    List,
     Type,
     overload,
 )
@@ -42,6 +43,10 @@ class VisitFailureException(Exception):
 
 
 class Visitor(abc.ABC, Generic[_NodeType1_contra, _ReturnType1_co]):
+    # The type of node the visitor accepts, if it's known. The visitor fails
+    # on every node that isn't an instance of it.
+    node_type: Optional[Type[object]] = None
+
     @abc.abstractmethod
     def visit(self, node: _NodeType1_contra) -> _ReturnType1_co:
         pass
@@ -53,8 +58,16 @@ class Visitor(abc.ABC, Generic[_NodeType1_contra, _ReturnType1_co]):
         def visitor(node: _NodeType1_contra) -> _ReturnType2:
             return Sequence(self, other).visit(node)[1]
 
+        visitor.node_type = self.node_type
         return visitor
 
+    def alternatives(self) -> List['Visitor[_NodeType1_contra, Any]']:
+        """Return the visitors this one tries, in order.
+
+        Visiting a node with this visitor is the same as visiting it with
+        each of them until one succeeds."""
+        return [self]
+
 
 class FunctionalVisitor(Visitor[_NodeType1, _ReturnType1]):
     """A decorator to create visitors from functions."""
@@ -126,6 +139,9 @@ class Choice(Visitor[_NodeType1, Union[_ReturnType1, _ReturnType2]]):
             print('} end choice')
         return result
 
+    def alternatives(self) -> List[Visitor[_NodeType1, Any]]:
+        return self.__visitor1.alternatives() + self.__visitor2.alternatives()
+
     def __repr__(self) -> str:
         type_name = type(self).__qualname__
         visitor_reprs = repr(self.__visitor1), repr(self.__visitor2)
@@ -199,6 +215,7 @@ def assert_type(type: Type[object]) -> Visitor[object, None]:
         if not isinstance(node, type):
             raise VisitFailureException(node)
 
+    visitor.node_type = type
     return visitor
 
 
@@ -210,31 +227,87 @@ def assert_annotated_type(
     return assert_type(type).then(FunctionalVisitor(fun))
 
 
-@FunctionalVisitor
-def fail(node: object) -> NoReturn:
-    raise VisitFailureException(node)
+class _Fail(Visitor[object, NoReturn]):
+    def visit(self, node: object) -> NoReturn:
+        raise VisitFailureException(node)
+
+    def alternatives(self) -> List[Visitor[object, Any]]:
+        return []
+
+    def __repr__(self) -> str:
+        return 'fail'
+
+
+fail = _Fail()
 
 
 _T = TypeVar('_T')
 
 
 class VisitorDict(Dict[str, Visitor[_NodeType1, _ReturnType1]]):
-    def __init__(self, *args, **kwargs) -> None:
+    """A dictionary of named visitors that can refer to each other.
+
+    With dispatch_on_type, visiting through a reference to a name (see
+    ref_visitor) doesn't try each alternative in turn. Instead, the
+    alternatives that can accept the type of the node are looked up in a
+    table, which is built the first time a node of that type is visited. Only
+    visitors that are known to fail on other types of node (like the ones
+    from assert_annotated_type) are left out. Untyped alternatives are always
+    tried, in their original order. The tables are thrown away whenever the
+    dictionary changes."""
+
+    def __init__(
+        self, *args, dispatch_on_type: bool = False, **kwargs
+    ) -> None:
         super().__init__(*args, **kwargs)
         self.data: Dict = {}
+        self.dispatch_on_type = dispatch_on_type
+        self._dispatch_tables: Dict[
+            str, Dict[Type[object], List[Visitor[_NodeType1, _ReturnType1]]]
+        ] = {}
+
+    def __setitem__(
+        self, name: str, visitor: Visitor[_NodeType1, _ReturnType1]
+    ) -> None:
+        super().__setitem__(name, visitor)
+        self._dispatch_tables.clear()
+
+    def __delitem__(self, name: str) -> None:
+        super().__delitem__(name)
+        self._dispatch_tables.clear()
+
+    def update(self, *args, **kwargs) -> None:
+        super().update(*args, **kwargs)
+        self._dispatch_tables.clear()
 
     def extend_with(self: _T, extension: Callable[[_T], None]) -> None:
         extension(self)
 
     def visit(self, node: _NodeType1) -> _ReturnType1:
-        return self['top-level'].visit(node)
+        return self.ref_visitor('top-level').visit(node)
 
     def ref_visitor(self, name: str) -> Visitor[_NodeType1, _ReturnType1]:
-        @FunctionalVisitor
-        def visit(node: _NodeType1) -> _ReturnType1:
-            return self[name].visit(node)
+        return _Reference(self, name)
 
-        return visit
+    def dispatch(self, name: str, node: _NodeType1) -> _ReturnType1:
+        """Visit node with the alternatives of the named visitor that accept
+        its type."""
+        table = self._dispatch_tables.setdefault(name, {})
+        try:
+            candidates = table[type(node)]
+        except KeyError:
+            candidates = table[type(node)] = [
+                visitor
+                for visitor in self[name].alternatives()
+                if visitor.node_type is None
+                or isinstance(node, visitor.node_type)
+            ]
+        for visitor in candidates:
+            try:
+                return visitor.visit(node)
+            except VisitFailureException:
+                continue
+        raise VisitFailureException(node)
 
     @overload
     def add_alternative_to(
@@ -274,3 +347,25 @@ class VisitorDict(Dict[str, Visitor[_NodeType1, _ReturnType1]]):
             self.update({alternative_name: visitor})
             return None
         return partial
+
+
+class _Reference(Visitor[_NodeType1, _ReturnType1]):
+    """Visits with whatever visitor has a name in a VisitorDict when the
+    visit happens."""
+
+    def __init__(
+        self, visitors: VisitorDict[_NodeType1, _ReturnType1], name: str
+    ) -> None:
+        self.__visitors = visitors
+        self.__name = name
+
+    def visit(self, node: _NodeType1) -> _ReturnType1:
+        if self.__visitors.dispatch_on_type:
+            return self.__visitors.dispatch(self.__name, node)
+        return self.__visitors[self.__name].visit(node)
+
+    def alternatives(self) -> List[Visitor[_NodeType1, Any]]:
+        return self.__visitors[self.__name].alternatives()
+
+    def __repr__(self) -> str:
+        return '{}({!r})'.format(type(self).__qualname__, self.__name)